@@ -0,0 +1,64 @@
+"""Sales daily rollup
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Daily sales fact table, maintained incrementally on every sale write
+    op.create_table(
+        'sales_daily_rollup',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('transaction_date', sa.Date(), nullable=False),
+        sa.Column('panel_id', sa.Integer(), nullable=False),
+        sa.Column('garment_id', sa.Integer(), nullable=False),
+        sa.Column('size', sa.String(20), nullable=False),
+        sa.Column('is_return', sa.Boolean(), nullable=False),
+        sa.Column('transaction_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('quantity', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('gross_amount', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('total_amount', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('discount_amount', sa.Numeric(14, 2), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['panel_id'], ['panels.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['garment_id'], ['garments.id'], ondelete='CASCADE'),
+        sa.UniqueConstraint(
+            'transaction_date', 'panel_id', 'garment_id', 'size', 'is_return',
+            name='uix_sales_daily_rollup_key'
+        )
+    )
+    op.create_index('ix_sales_daily_rollup_transaction_date', 'sales_daily_rollup', ['transaction_date'])
+    op.create_index('ix_sales_daily_rollup_panel_id', 'sales_daily_rollup', ['panel_id'])
+
+    # Backfill from existing sales
+    op.execute("""
+        INSERT INTO sales_daily_rollup (
+            transaction_date, panel_id, garment_id, size, is_return,
+            transaction_count, quantity, gross_amount, total_amount, discount_amount
+        )
+        SELECT
+            transaction_date, panel_id, garment_id, size, is_return,
+            COUNT(id),
+            SUM(quantity),
+            SUM(unit_price * quantity),
+            SUM(total_amount),
+            SUM(unit_price * quantity) - SUM(total_amount)
+        FROM sales
+        GROUP BY transaction_date, panel_id, garment_id, size, is_return
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('sales_daily_rollup')
@@ -0,0 +1,75 @@
+"""Composite, covering and partial indexes for report access paths
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Sales velocity: date range over non-return sales, summed per garment-size.
+    # Partial + INCLUDE lets the grouped subquery run as an index-only scan.
+    op.create_index(
+        'ix_sales_velocity', 'sales', ['transaction_date', 'garment_id', 'size'],
+        postgresql_include=['quantity'],
+        postgresql_where=sa.text('NOT is_return')
+    )
+    # Panel-wise, settlement and inactive-panel reports: panel + date range
+    op.create_index(
+        'ix_sales_panel_date', 'sales', ['panel_id', 'transaction_date'],
+        postgresql_include=['is_return', 'quantity', 'unit_price', 'total_amount']
+    )
+    # Single-SKU daily sales report
+    op.create_index('ix_sales_garment_date', 'sales', ['garment_id', 'transaction_date'])
+    # Superseded by the composite index that leads with panel_id
+    op.drop_index('ix_sales_panel_id', table_name='sales')
+
+    # Paid ad ROI: panel + date range
+    op.create_index('ix_paid_ads_panel_date', 'paid_ads', ['panel_id', 'ad_date'])
+    op.drop_index('ix_paid_ads_panel_id', table_name='paid_ads')
+
+    # Rollup reads filtered by panel over a date range
+    op.create_index(
+        'ix_sales_daily_rollup_panel_date', 'sales_daily_rollup', ['panel_id', 'transaction_date']
+    )
+    op.drop_index('ix_sales_daily_rollup_panel_id', table_name='sales_daily_rollup')
+
+    # Production reports
+    op.create_index(
+        'ix_production_plans_target_date', 'production_plans', ['target_date'],
+        postgresql_include=['status']
+    )
+    op.create_index(
+        'ix_production_activities_production_plan_id', 'production_activities', ['production_plan_id']
+    )
+    op.create_index(
+        'ix_production_activities_activity_date', 'production_activities', ['activity_date']
+    )
+
+    # inventory already carries uix_garment_size (garment_id, size) from 001;
+    # the separate garment_id index is a prefix of it.
+    op.drop_index('ix_inventory_garment_id', table_name='inventory')
+
+
+def downgrade() -> None:
+    op.create_index('ix_inventory_garment_id', 'inventory', ['garment_id'])
+    op.drop_index('ix_production_activities_activity_date', table_name='production_activities')
+    op.drop_index('ix_production_activities_production_plan_id', table_name='production_activities')
+    op.drop_index('ix_production_plans_target_date', table_name='production_plans')
+    op.create_index('ix_sales_daily_rollup_panel_id', 'sales_daily_rollup', ['panel_id'])
+    op.drop_index('ix_sales_daily_rollup_panel_date', table_name='sales_daily_rollup')
+    op.create_index('ix_paid_ads_panel_id', 'paid_ads', ['panel_id'])
+    op.drop_index('ix_paid_ads_panel_date', table_name='paid_ads')
+    op.create_index('ix_sales_panel_id', 'sales', ['panel_id'])
+    op.drop_index('ix_sales_garment_date', table_name='sales')
+    op.drop_index('ix_sales_panel_date', table_name='sales')
+    op.drop_index('ix_sales_velocity', table_name='sales')
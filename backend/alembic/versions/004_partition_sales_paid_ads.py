@@ -0,0 +1,166 @@
+"""Monthly range partitions for sales and paid_ads
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 00:00:00.000000
+
+Rows are moved in the migration transaction. On large tables run
+``alembic -x defer_backfill=true upgrade head`` instead and move them with
+``python -m app.cli partitions-backfill`` afterwards.
+
+The DDL below is the schema of both tables as of revision 003, frozen here:
+later model changes must not change what this revision creates. Months
+after the premade ones are created by the app at startup and by
+``python -m app.cli partitions-ensure``.
+"""
+from datetime import date
+
+import sqlalchemy as sa
+from alembic import context, op
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+LEGACY_SUFFIX = '_unpartitioned'
+PREMAKE_MONTHS = 3
+
+TABLES = {
+    'sales': {
+        'key': 'transaction_date',
+        'foreign_keys': [
+            'FOREIGN KEY (garment_id) REFERENCES garments (id) ON DELETE RESTRICT',
+            'FOREIGN KEY (panel_id) REFERENCES panels (id) ON DELETE RESTRICT',
+        ],
+        'indexes': {
+            'ix_sales_transaction_date': '(transaction_date)',
+            'ix_sales_velocity': '(transaction_date, garment_id, size) INCLUDE (quantity) WHERE NOT is_return',
+            'ix_sales_panel_date': (
+                '(panel_id, transaction_date) INCLUDE (is_return, quantity, unit_price, total_amount)'
+            ),
+            'ix_sales_garment_date': '(garment_id, transaction_date)',
+        },
+    },
+    'paid_ads': {
+        'key': 'ad_date',
+        'foreign_keys': [
+            'FOREIGN KEY (panel_id) REFERENCES panels (id) ON DELETE CASCADE',
+        ],
+        'indexes': {
+            'ix_paid_ads_ad_date': '(ad_date)',
+            'ix_paid_ads_panel_date': '(panel_id, ad_date)',
+        },
+    },
+}
+
+
+def add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def execute(conn, statement: str, params=None):
+    return conn.execute(sa.text(statement), params or {})
+
+
+def columns(conn, table: str) -> str:
+    rows = execute(
+        conn,
+        """
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = :table
+        ORDER BY ordinal_position
+        """,
+        {'table': table}
+    )
+    return ', '.join(row[0] for row in rows)
+
+
+def drop_indexes(conn, table: str) -> None:
+    for name in TABLES[table]['indexes']:
+        execute(conn, f'DROP INDEX IF EXISTS {name}')
+
+
+def create_constraints_and_indexes(conn, table: str, primary_key: str) -> None:
+    execute(conn, f'ALTER TABLE {table} ADD PRIMARY KEY ({primary_key})')
+    for foreign_key in TABLES[table]['foreign_keys']:
+        execute(conn, f'ALTER TABLE {table} ADD {foreign_key}')
+    for name, definition in TABLES[table]['indexes'].items():
+        execute(conn, f'CREATE INDEX {name} ON {table} {definition}')
+
+
+def move_legacy_rows(conn, table: str) -> None:
+    legacy = f'{table}{LEGACY_SUFFIX}'
+    if execute(conn, 'SELECT to_regclass(:name) IS NULL', {'name': legacy}).scalar():
+        return
+    names = columns(conn, legacy)
+    execute(conn, f'INSERT INTO {table} ({names}) SELECT {names} FROM {legacy}')
+    execute(conn, f'DROP TABLE {legacy}')
+
+
+def convert(conn, table: str, backfill: bool = True) -> None:
+    """
+    Replace ``table`` with a partitioned table of the same shape. The old
+    heap is renamed to ``<table>_unpartitioned``; without ``backfill`` its
+    rows stay there for ``partitions-backfill`` to move in batches.
+    """
+    key = TABLES[table]['key']
+    legacy = f'{table}{LEGACY_SUFFIX}'
+    execute(conn, f'ALTER TABLE {table} RENAME TO {legacy}')
+    execute(conn, f'ALTER INDEX {table}_pkey RENAME TO {legacy}_pkey')
+    drop_indexes(conn, table)
+
+    execute(
+        conn,
+        f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY RANGE ({key})'
+    )
+    # PostgreSQL requires the partition key in every unique constraint
+    create_constraints_and_indexes(conn, table, f'id, {key}')
+    # The id sequence would be dropped together with the legacy table
+    execute(conn, f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+    execute(conn, f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    first, last = execute(conn, f'SELECT min({key}), max({key}) FROM {legacy}').one()
+    today = date.today()
+    month = min(first or today, today).replace(day=1)
+    end = add_months(max(last or today, today), PREMAKE_MONTHS)
+    while month <= end:
+        following = add_months(month, 1)
+        execute(
+            conn,
+            f"CREATE TABLE {table}_y{month.year:04d}m{month.month:02d} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+        )
+        month = following
+    if backfill:
+        move_legacy_rows(conn, table)
+
+
+def revert(conn, table: str) -> None:
+    """Turn the partitioned ``table`` back into a plain table (rows of archived months are not restored)."""
+    move_legacy_rows(conn, table)
+    partitioned = f'{table}_partitioned'
+    execute(conn, f'ALTER TABLE {table} RENAME TO {partitioned}')
+    execute(conn, f'ALTER INDEX {table}_pkey RENAME TO {partitioned}_pkey')
+    drop_indexes(conn, table)
+
+    execute(conn, f'CREATE TABLE {table} (LIKE {partitioned} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    create_constraints_and_indexes(conn, table, 'id')
+    names = columns(conn, table)
+    execute(conn, f'INSERT INTO {table} ({names}) SELECT {names} FROM {partitioned}')
+    execute(conn, f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+    execute(conn, f'DROP TABLE {partitioned} CASCADE')
+
+
+def upgrade() -> None:
+    defer_backfill = context.get_x_argument(as_dictionary=True).get('defer_backfill') == 'true'
+    for table in TABLES:
+        convert(op.get_bind(), table, backfill=not defer_backfill)
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        revert(op.get_bind(), table)
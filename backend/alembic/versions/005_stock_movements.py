@@ -0,0 +1,46 @@
+"""Stock movement ledger
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Append-only ledger; inventory levels are the running sum of its deltas
+    op.create_table(
+        'stock_movements',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('inventory_id', sa.Integer(), nullable=False),
+        sa.Column('movement_type', sa.String(20), nullable=False),
+        sa.Column('good_stock_delta', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('virtual_stock_delta', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sale_id', sa.Integer()),
+        sa.Column('reference', sa.String(100)),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['inventory_id'], ['inventory.id'], ondelete='CASCADE')
+    )
+    op.create_index('ix_stock_movements_inventory_id', 'stock_movements', ['inventory_id', 'id'])
+
+    # Opening balances, so rebuilding from the ledger reproduces current levels
+    op.execute("""
+        INSERT INTO stock_movements (inventory_id, movement_type, good_stock_delta, virtual_stock_delta, reference)
+        SELECT id, 'OPENING', good_stock, virtual_stock, 'migration 005'
+        FROM inventory
+        WHERE good_stock <> 0 OR virtual_stock <> 0
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stock_movements_inventory_id', table_name='stock_movements')
+    op.drop_table('stock_movements')
@@ -0,0 +1,45 @@
+"""Demand forecasts and yarn attribution of production plans
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Which yarn a plan's yarn_requirement is for
+    op.add_column('production_plans', sa.Column('yarn_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'production_plans_yarn_id_fkey', 'production_plans', 'yarns', ['yarn_id'], ['id'],
+        ondelete='SET NULL'
+    )
+
+    # Fitted daily demand per garment, written by `python -m app.cli forecast-refresh`
+    op.create_table(
+        'demand_forecasts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('garment_id', sa.Integer(), nullable=False),
+        sa.Column('method', sa.String(30), nullable=False),
+        sa.Column('daily_units', sa.Numeric(12, 4), nullable=False),
+        sa.Column('smoothing_alpha', sa.Numeric(4, 2)),
+        sa.Column('history_days', sa.Integer(), nullable=False),
+        sa.Column('fitted_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['garment_id'], ['garments.id'], ondelete='CASCADE'),
+        sa.UniqueConstraint('garment_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('demand_forecasts')
+    op.drop_constraint('production_plans_yarn_id_fkey', 'production_plans', type_='foreignkey')
+    op.drop_column('production_plans', 'yarn_id')
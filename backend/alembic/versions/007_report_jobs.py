@@ -0,0 +1,47 @@
+"""Background report jobs
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'report_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('report', sa.String(100), nullable=False),
+        sa.Column('params', postgresql.JSONB(), nullable=False),
+        sa.Column('params_hash', sa.String(64), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False),
+        sa.Column('progress', sa.Integer(), nullable=False),
+        sa.Column('result', postgresql.JSONB()),
+        sa.Column('error', sa.Text()),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('started_at', sa.DateTime()),
+        sa.Column('finished_at', sa.DateTime()),
+        sa.Column('expires_at', sa.DateTime()),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_report_jobs_params_hash', 'report_jobs', ['params_hash'])
+    # One queued/running job per report and parameters
+    op.create_index(
+        'uq_report_jobs_active_params_hash', 'report_jobs', ['params_hash'], unique=True,
+        postgresql_where=sa.text("status IN ('QUEUED', 'RUNNING')")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_report_jobs_active_params_hash', table_name='report_jobs')
+    op.drop_index('ix_report_jobs_params_hash', table_name='report_jobs')
+    op.drop_table('report_jobs')
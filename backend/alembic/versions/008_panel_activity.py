@@ -0,0 +1,46 @@
+"""Panel activity summary
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Latest sale/ad date per panel, kept current on every sale and ad write
+    op.create_table(
+        'panel_activity',
+        sa.Column('panel_id', sa.Integer(), nullable=False),
+        sa.Column('last_sale_date', sa.Date()),
+        sa.Column('last_ad_date', sa.Date()),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('panel_id'),
+        sa.ForeignKeyConstraint(['panel_id'], ['panels.id'], ondelete='CASCADE')
+    )
+
+    # Backfill from existing sales and ads
+    op.execute("""
+        INSERT INTO panel_activity (panel_id, last_sale_date, last_ad_date)
+        SELECT panels.id, s.last_sale_date, a.last_ad_date
+        FROM panels
+        LEFT JOIN (
+            SELECT panel_id, MAX(transaction_date) AS last_sale_date FROM sales GROUP BY panel_id
+        ) s ON s.panel_id = panels.id
+        LEFT JOIN (
+            SELECT panel_id, MAX(ad_date) AS last_ad_date FROM paid_ads GROUP BY panel_id
+        ) a ON a.panel_id = panels.id
+        WHERE s.last_sale_date IS NOT NULL OR a.last_ad_date IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('panel_activity')
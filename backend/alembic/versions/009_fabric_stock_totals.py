@@ -0,0 +1,35 @@
+"""Fabric stock totals materialized view
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Stock totals per fabric type, GSM and color, refreshed after fabric writes
+    op.execute("""
+        CREATE MATERIALIZED VIEW fabric_stock_totals AS
+        SELECT fabric_type, gsm, color,
+               COUNT(id) AS fabric_count,
+               SUM(stock_quantity) AS stock_quantity,
+               SUM(stock_quantity * COALESCE(cost_per_unit, 0)) AS stock_value
+        FROM fabrics
+        GROUP BY fabric_type, gsm, color
+    """)
+    # Required by REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index(
+        'uix_fabric_stock_totals_key', 'fabric_stock_totals', ['fabric_type', 'gsm', 'color'], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS fabric_stock_totals")
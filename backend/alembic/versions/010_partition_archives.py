@@ -0,0 +1,31 @@
+"""Partition archive watermark
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # First month still in the database per partitioned table, advanced by
+    # partitions-archive so the rollup is never rebuilt over archived months
+    op.create_table(
+        'partition_archives',
+        sa.Column('table_name', sa.String(length=63), nullable=False),
+        sa.Column('archived_before', sa.Date(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('table_name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('partition_archives')
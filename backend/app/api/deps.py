@@ -0,0 +1,81 @@
+import time
+from typing import Optional
+import redis
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.security import ExpiringLRU, revocation_list, token_hash, verify_token
+from app.db.models import User
+from app.db.session import get_db
+from app.schemas.auth import User as UserSchema
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+# Snapshots of recently authenticated users by id. Entries are dropped when
+# the user row is updated in this process and expire after
+# AUTH_USER_CACHE_TTL_SECONDS, which bounds staleness on other workers.
+user_cache = ExpiringLRU(settings.AUTH_USER_CACHE_SIZE)
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+    db: Session = Depends(get_db)
+) -> UserSchema:
+    """
+    The user an access token belongs to.
+
+    Token claims and users are served from in-process caches, so a steady
+    stream of requests with the same token costs no database round trip;
+    only the Redis revocation check runs every time.
+    """
+    if credentials is None:
+        raise _unauthorized("Not authenticated")
+    claims = verify_token(credentials.credentials)
+    if claims is None or claims.get("type") != "access" or claims.get("sub") is None:
+        raise _unauthorized("Invalid or expired token")
+
+    try:
+        revoked = revocation_list.is_revoked(token_hash(credentials.credentials), claims)
+    except redis.RedisError:
+        # Fail closed: a revoked token must never be accepted
+        raise HTTPException(status_code=503, detail="Token revocation list unavailable")
+    if revoked:
+        raise _unauthorized("Token has been revoked")
+
+    user_id = int(claims["sub"])
+    user = user_cache.get(user_id)
+    if user is None:
+        row = db.get(User, user_id)
+        if row is None:
+            raise _unauthorized("User not found")
+        user = UserSchema.model_validate(row)
+        user_cache.set(user_id, user, time.time() + settings.AUTH_USER_CACHE_TTL_SECONDS)
+
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return user
+
+
+@event.listens_for(User, "after_update")
+def _user_updated(mapper, connection, target):
+    user_cache.delete(target.id)
+    state = inspect(target)
+    deactivated = state.attrs.is_active.history.has_changes() and not target.is_active
+    if deactivated or state.attrs.hashed_password.history.has_changes():
+        revocation_list.revoke_user(target.id)
+
+
+@event.listens_for(User, "after_delete")
+def _user_deleted(mapper, connection, target):
+    user_cache.delete(target.id)
+    revocation_list.revoke_user(target.id)
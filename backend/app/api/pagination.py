@@ -0,0 +1,106 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+from fastapi import HTTPException, Response
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def clamp_limit(limit: int) -> int:
+    """Bound a requested page size to 1..MAX_PAGE_SIZE."""
+    return max(1, min(limit, settings.MAX_PAGE_SIZE))
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort-key values of the last row into an opaque cursor."""
+    payload = json.dumps(
+        [v.isoformat() if isinstance(v, (date, datetime)) else v for v in values]
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[Any]) -> List[Any]:
+    """Decode a cursor back into values typed like the sort-key columns."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match sort keys")
+        decoded = []
+        for key, value in zip(keys, values):
+            python_type = key.type.python_type
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+            elif value is not None:
+                value = python_type(value)
+            decoded.append(value)
+        return decoded
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def _page_statement(query, keys, skip, limit, cursor, descending):
+    """Apply ordering, cursor/offset and the limit+1 probe to a query or select."""
+    query = query.order_by(*[k.desc() if descending else k.asc() for k in keys])
+
+    if cursor:
+        after = tuple_(*decode_cursor(cursor, keys))
+        query = query.filter(tuple_(*keys) < after if descending else tuple_(*keys) > after)
+    elif skip:
+        query = query.offset(skip)
+
+    return query.limit(limit + 1)
+
+
+def _trim_page(rows: List[Any], keys, response: Response, limit: int) -> List[Any]:
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor([getattr(last, k.key) for k in keys])
+    return rows
+
+
+def paginate(
+    query,
+    keys: Sequence[Any],
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    descending: bool = False
+) -> List[Any]:
+    """
+    Page an ORM query by offset or by keyset cursor.
+
+    ``keys`` are the (unique, non-null) sort columns, e.g.
+    ``(Sale.transaction_date, Sale.id)``. With ``cursor`` the page starts
+    strictly after the encoded row, so deep pages cost an index seek instead
+    of scanning skipped rows; ``skip`` is ignored. When more rows follow,
+    the cursor for the next page is returned in the X-Next-Cursor header,
+    which keeps the list response body backward compatible.
+    """
+    limit = clamp_limit(limit)
+    rows = _page_statement(query, keys, skip, limit, cursor, descending).all()
+    return _trim_page(rows, keys, response, limit)
+
+
+async def paginate_async(
+    db: AsyncSession,
+    statement: Select,
+    keys: Sequence[Any],
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    descending: bool = False
+) -> List[Any]:
+    """Async counterpart of ``paginate`` for a ``select()`` of one entity."""
+    limit = clamp_limit(limit)
+    result = await db.scalars(_page_statement(statement, keys, skip, limit, cursor, descending))
+    return _trim_page(list(result), keys, response, limit)
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import date, datetime
 from decimal import Decimal
 from pydantic import BaseModel
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
+from app.api.export import export_format_param, stream_list_export
+from app.api.pagination import paginate_async
+from app.core.cache import report_cache
 from app.db.models import PaidAd, Panel
+from app.services.panel_activity import PanelActivityService
 
 router = APIRouter()
 
@@ -44,31 +50,43 @@ def create_paid_ad(ad: PaidAdCreate, db: Session = Depends(get_db)):
     
     db_ad = PaidAd(**ad.model_dump())
     db.add(db_ad)
+    PanelActivityService(db).record_ads([ad.model_dump()])
     db.commit()
+    report_cache.invalidate("panels")
     db.refresh(db_ad)
     return db_ad
 
 
 @router.get("/", response_model=List[PaidAdSchema])
-def list_paid_ads(
+async def list_paid_ads(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     start_date: date = None,
     end_date: date = None,
     panel_id: int = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    export_format: str = Depends(export_format_param),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all paid ads with optional filtering."""
-    query = db.query(PaidAd)
+    query = select(PaidAd)
     if start_date:
-        query = query.filter(PaidAd.ad_date >= start_date)
+        query = query.where(PaidAd.ad_date >= start_date)
     if end_date:
-        query = query.filter(PaidAd.ad_date <= end_date)
+        query = query.where(PaidAd.ad_date <= end_date)
     if panel_id:
-        query = query.filter(PaidAd.panel_id == panel_id)
+        query = query.where(PaidAd.panel_id == panel_id)
     
-    ads = query.order_by(PaidAd.ad_date.desc()).offset(skip).limit(limit).all()
-    return ads
+    if export_format != "json":
+        return stream_list_export(
+            db, query, PaidAdSchema, (PaidAd.ad_date.desc(), PaidAd.id.desc()),
+            export_format, "paid-ads"
+        )
+    return await paginate_async(
+        db, query, (PaidAd.ad_date, PaidAd.id), response,
+        skip, limit, cursor, descending=True
+    )
 
 
 @router.get("/roi/{panel_id}")
@@ -1,21 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
-from app.db.session import get_db
+from app.api.deps import bearer_scheme, get_current_user
+from app.db.session import get_async_db
 from app.db.models import User
 from app.schemas.auth import UserCreate, UserLogin, User as UserSchema, Token
-from app.core.security import get_password_hash, verify_password, create_access_token, create_refresh_token
+from app.core.security import (
+    PasswordHasherBusy, create_access_token, create_refresh_token, login_throttle, password_hasher,
+    revocation_list
+)
 
 router = APIRouter()
 
 
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many logins in progress, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Register a new user."""
     # Check if user already exists
-    existing_user = db.query(User).filter(
-        (User.email == user.email) | (User.username == user.username)
-    ).first()
+    existing_user = (await db.execute(
+        select(User.id).where((User.email == user.email) | (User.username == user.username))
+    )).first()
     
     if existing_user:
         raise HTTPException(
@@ -23,8 +38,11 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
             detail="Email or username already registered"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(user.password)
+    # Create new user; bcrypt runs on the hashing pool, not the event loop
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     db_user = User(
         email=user.email,
         username=user.username,
@@ -36,25 +54,52 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
 
 @router.post("/login", response_model=Token)
-def login(credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(credentials: UserLogin, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Login and get access token."""
-    user = db.query(User).filter(User.username == credentials.username).first()
+    client_ip = request.client.host if request.client else "unknown"
+    # The throttle talks to Redis synchronously; keep it off the event loop
+    retry_after = await run_in_threadpool(login_throttle.retry_after, credentials.username, client_ip)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+    user = (await db.execute(select(User).where(User.username == credentials.username))).scalars().first()
     
-    if not user or not verify_password(credentials.password, user.hashed_password):
+    verified, new_hash = False, None
+    if user:
+        try:
+            verified, new_hash = await password_hasher.verify_and_update(
+                credentials.password, user.hashed_password
+            )
+        except PasswordHasherBusy:
+            raise _hasher_busy()
+    if not verified:
+        await run_in_threadpool(login_throttle.record_failure, credentials.username, client_ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    await run_in_threadpool(login_throttle.reset, credentials.username)
     
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
+
+    if new_hash:
+        # Cost factor changed: store the upgraded hash. A Core update, so the
+        # User update hook does not treat it as a password change and revoke
+        # the user's tokens.
+        await db.execute(update(User).where(User.id == user.id).values(hashed_password=new_hash))
+        await db.commit()
     
     access_token = create_access_token(data={"sub": str(user.id)})
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
@@ -67,8 +112,15 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserSchema)
-def get_current_user(db: Session = Depends(get_db)):
+def read_current_user(current_user: UserSchema = Depends(get_current_user)):
     """Get current user info."""
-    # This is a simplified version - in production, you'd use proper JWT middleware
-    # For now, return a placeholder
-    raise HTTPException(status_code=501, detail="Authentication middleware not yet implemented")
+    return current_user
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+def logout(
+    current_user: UserSchema = Depends(get_current_user),
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)
+):
+    """Revoke the access token used for this request."""
+    revocation_list.revoke_token(credentials.credentials)
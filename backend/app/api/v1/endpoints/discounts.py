@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import date, datetime
 from decimal import Decimal
 from pydantic import BaseModel
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
+from app.api.pagination import paginate_async
 from app.db.models import Discount
 
 router = APIRouter()
@@ -47,19 +50,20 @@ def create_discount(discount: DiscountCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=List[DiscountSchema])
-def list_discounts(
+async def list_discounts(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     is_active: bool = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all discounts with optional filtering."""
-    query = db.query(Discount)
+    query = select(Discount)
     if is_active is not None:
-        query = query.filter(Discount.is_active == is_active)
+        query = query.where(Discount.is_active == is_active)
     
-    discounts = query.offset(skip).limit(limit).all()
-    return discounts
+    return await paginate_async(db, query, (Discount.id,), response, skip, limit, cursor)
 
 
 @router.get("/{discount_id}", response_model=DiscountSchema)
@@ -1,36 +1,44 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app.db.session import get_db
+from typing import List, Optional
+from app.db.session import get_db, get_read_db
+from app.api.pagination import paginate_async
+from app.core.cache import report_cache
 from app.db.models import Fabric
 from app.schemas.fabric import Fabric as FabricSchema, FabricCreate, FabricUpdate
+from app.services.fabric_summary import refresh_fabric_summary
 
 router = APIRouter()
 
 
 @router.post("/", response_model=FabricSchema, status_code=status.HTTP_201_CREATED)
-def create_fabric(fabric: FabricCreate, db: Session = Depends(get_db)):
+def create_fabric(fabric: FabricCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Create a new fabric entry."""
     db_fabric = Fabric(**fabric.model_dump())
     db.add(db_fabric)
     db.commit()
+    report_cache.invalidate("fabrics")
+    background_tasks.add_task(refresh_fabric_summary, db.get_bind())
     db.refresh(db_fabric)
     return db_fabric
 
 
 @router.get("/", response_model=List[FabricSchema])
-def list_fabrics(
+async def list_fabrics(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     fabric_type: str = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all fabric entries with optional filtering."""
-    query = db.query(Fabric)
+    query = select(Fabric)
     if fabric_type:
-        query = query.filter(Fabric.fabric_type == fabric_type)
-    fabrics = query.offset(skip).limit(limit).all()
-    return fabrics
+        query = query.where(Fabric.fabric_type == fabric_type)
+    return await paginate_async(db, query, (Fabric.id,), response, skip, limit, cursor)
 
 
 @router.get("/{fabric_id}", response_model=FabricSchema)
@@ -43,7 +51,12 @@ def get_fabric(fabric_id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/{fabric_id}", response_model=FabricSchema)
-def update_fabric(fabric_id: int, fabric_update: FabricUpdate, db: Session = Depends(get_db)):
+def update_fabric(
+    fabric_id: int,
+    fabric_update: FabricUpdate,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
     """Update a fabric entry."""
     db_fabric = db.query(Fabric).filter(Fabric.id == fabric_id).first()
     if not db_fabric:
@@ -54,12 +67,14 @@ def update_fabric(fabric_id: int, fabric_update: FabricUpdate, db: Session = Dep
         setattr(db_fabric, field, value)
     
     db.commit()
+    report_cache.invalidate("fabrics")
+    background_tasks.add_task(refresh_fabric_summary, db.get_bind())
     db.refresh(db_fabric)
     return db_fabric
 
 
 @router.delete("/{fabric_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_fabric(fabric_id: int, db: Session = Depends(get_db)):
+def delete_fabric(fabric_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Delete a fabric entry."""
     db_fabric = db.query(Fabric).filter(Fabric.id == fabric_id).first()
     if not db_fabric:
@@ -67,4 +82,6 @@ def delete_fabric(fabric_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_fabric)
     db.commit()
+    report_cache.invalidate("fabrics")
+    background_tasks.add_task(refresh_fabric_summary, db.get_bind())
     return None
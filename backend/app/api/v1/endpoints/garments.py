@@ -1,7 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app.db.session import get_db
+from typing import List, Optional
+from app.db.session import get_db, get_read_db
+from app.api.export import export_format_param, stream_list_export
+from app.api.pagination import paginate_async
+from app.core.cache import report_cache
 from app.db.models import Garment
 from app.schemas.garment import Garment as GarmentSchema, GarmentCreate, GarmentUpdate
 
@@ -19,26 +24,33 @@ def create_garment(garment: GarmentCreate, db: Session = Depends(get_db)):
     db_garment = Garment(**garment.model_dump())
     db.add(db_garment)
     db.commit()
+    report_cache.invalidate("garments")
     db.refresh(db_garment)
     return db_garment
 
 
 @router.get("/", response_model=List[GarmentSchema])
-def list_garments(
+async def list_garments(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     category: str = None,
     is_active: bool = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    export_format: str = Depends(export_format_param),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all garments with optional filtering."""
-    query = db.query(Garment)
+    query = select(Garment)
     if category:
-        query = query.filter(Garment.category == category)
+        query = query.where(Garment.category == category)
     if is_active is not None:
-        query = query.filter(Garment.is_active == is_active)
-    garments = query.offset(skip).limit(limit).all()
-    return garments
+        query = query.where(Garment.is_active == is_active)
+    if export_format != "json":
+        return stream_list_export(
+            db, query, GarmentSchema, (Garment.id,), export_format, "garments"
+        )
+    return await paginate_async(db, query, (Garment.id,), response, skip, limit, cursor)
 
 
 @router.get("/{garment_id}", response_model=GarmentSchema)
@@ -71,6 +83,7 @@ def update_garment(garment_id: int, garment_update: GarmentUpdate, db: Session =
         setattr(db_garment, field, value)
     
     db.commit()
+    report_cache.invalidate("garments")
     db.refresh(db_garment)
     return db_garment
 
@@ -84,4 +97,5 @@ def delete_garment(garment_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_garment)
     db.commit()
+    report_cache.invalidate("garments")
     return None
@@ -1,11 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List
-from datetime import datetime
-from app.db.session import get_db
-from app.db.models import Inventory, Garment
-from app.schemas.garment import Inventory as InventorySchema, InventoryCreate, InventoryUpdate
+from sqlalchemy import func, select
+from typing import List, Optional
+from app.db.session import get_db, get_read_db
+from app.api.export import export_format_param, stream_list_export
+from app.api.pagination import paginate_async
+from app.core.cache import report_cache
+from app.core.config import settings
+from app.db.models import Inventory, Garment, StockMovement
+from app.schemas.garment import (
+    BulkInventoryResult, Inventory as InventorySchema, InventoryCount, InventoryCreate, InventoryUpdate,
+    StockMovement as StockMovementSchema, StockMovementCreate
+)
+from app.services.stock import InsufficientStockError, StockService
 
 router = APIRouter()
 
@@ -28,16 +36,52 @@ def create_inventory(inventory: InventoryCreate, db: Session = Depends(get_db)):
     
     db_inventory = Inventory(**inventory.model_dump())
     db.add(db_inventory)
+    db.flush()
+    StockService(db).open_balance(db_inventory)
     db.commit()
+    report_cache.invalidate("inventory")
     db.refresh(db_inventory)
     return db_inventory
 
 
+@router.post("/bulk", response_model=BulkInventoryResult)
+def bulk_upsert_inventory(
+    counts: List[InventoryCount],
+    reference: str = "cycle count",
+    db: Session = Depends(get_db)
+):
+    """
+    Apply a warehouse cycle count keyed by (garment_id, size) in one
+    transaction. Missing rows are created; changed rows are reported with
+    their previous and counted levels and posted to the stock ledger.
+    """
+    if len(counts) > settings.BULK_INGEST_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {settings.BULK_INGEST_MAX_ROWS} rows")
+    result = StockService(db).apply_counts([count.model_dump() for count in counts], reference)
+    db.commit()
+    if result["created"] or result["updated"]:
+        report_cache.invalidate("inventory")
+    return result
+
+
 @router.get("/", response_model=List[InventorySchema])
-def list_inventory(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def list_inventory(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    export_format: str = Depends(export_format_param),
+    db: AsyncSession = Depends(get_read_db)
+):
     """List all inventory records."""
-    inventory = db.query(Inventory).offset(skip).limit(limit).all()
-    return inventory
+    if export_format != "json":
+        return stream_list_export(
+            db, select(Inventory), InventorySchema, (Inventory.id,),
+            export_format, "inventory"
+        )
+    return await paginate_async(
+        db, select(Inventory), (Inventory.id,), response, skip, limit, cursor
+    )
 
 
 @router.get("/garment/{garment_id}", response_model=List[InventorySchema])
@@ -49,21 +93,67 @@ def get_inventory_by_garment(garment_id: int, db: Session = Depends(get_db)):
 
 @router.put("/{inventory_id}", response_model=InventorySchema)
 def update_inventory(inventory_id: int, inventory_update: InventoryUpdate, db: Session = Depends(get_db)):
-    """Update an inventory record."""
+    """
+    Update an inventory record. Stock counts are absolute (stocktake) and
+    are posted to the ledger as an adjustment.
+    """
     db_inventory = db.query(Inventory).filter(Inventory.id == inventory_id).first()
     if not db_inventory:
         raise HTTPException(status_code=404, detail="Inventory not found")
     
     update_data = inventory_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_inventory, field, value)
-    
-    db_inventory.last_updated = datetime.utcnow()
+    if "warehouse_location" in update_data:
+        db_inventory.warehouse_location = update_data["warehouse_location"]
+        db.flush()
+    StockService(db).set_levels(
+        inventory_id,
+        good_stock=update_data.get("good_stock"),
+        virtual_stock=update_data.get("virtual_stock"),
+        reference="stocktake"
+    )
     db.commit()
+    report_cache.invalidate("inventory")
     db.refresh(db_inventory)
     return db_inventory
 
 
+@router.post("/{inventory_id}/movements", response_model=InventorySchema)
+def create_stock_movement(inventory_id: int, movement: StockMovementCreate, db: Session = Depends(get_db)):
+    """
+    Receive, issue, reserve or release stock. The change is applied as an
+    atomic delta, so concurrent scanners never overwrite each other; 409 if
+    it would take stock below zero.
+    """
+    if db.get(Inventory, inventory_id) is None:
+        raise HTTPException(status_code=404, detail="Inventory not found")
+    try:
+        StockService(db).apply_movement(
+            inventory_id, movement.movement_type, movement.quantity, movement.reference
+        )
+    except InsufficientStockError as exc:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=str(exc))
+    db.commit()
+    report_cache.invalidate("inventory")
+    return db.get(Inventory, inventory_id)
+
+
+@router.get("/{inventory_id}/movements", response_model=List[StockMovementSchema])
+async def list_stock_movements(
+    inventory_id: int,
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Stock ledger of an inventory record, newest first."""
+    query = select(StockMovement).where(StockMovement.inventory_id == inventory_id)
+    return await paginate_async(
+        db, query, (StockMovement.id,), response, skip, limit, cursor, descending=True
+    )
+
+
 @router.get("/low-stock/", response_model=List[InventorySchema])
 def get_low_stock(threshold: int = 10, db: Session = Depends(get_db)):
     """Get inventory items with low stock."""
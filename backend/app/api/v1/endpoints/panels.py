@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
 from pydantic import BaseModel, EmailStr
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
+from app.api.pagination import paginate_async
+from app.core.cache import report_cache
 from app.db.models import Panel
 
 router = APIRouter()
@@ -37,27 +41,29 @@ def create_panel(panel: PanelCreate, db: Session = Depends(get_db)):
     db_panel = Panel(**panel.model_dump())
     db.add(db_panel)
     db.commit()
+    report_cache.invalidate("panels")
     db.refresh(db_panel)
     return db_panel
 
 
 @router.get("/", response_model=List[PanelSchema])
-def list_panels(
+async def list_panels(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     is_active: bool = None,
     panel_type: str = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all panels with optional filtering."""
-    query = db.query(Panel)
+    query = select(Panel)
     if is_active is not None:
-        query = query.filter(Panel.is_active == is_active)
+        query = query.where(Panel.is_active == is_active)
     if panel_type:
-        query = query.filter(Panel.panel_type == panel_type)
+        query = query.where(Panel.panel_type == panel_type)
     
-    panels = query.offset(skip).limit(limit).all()
-    return panels
+    return await paginate_async(db, query, (Panel.id,), response, skip, limit, cursor)
 
 
 @router.get("/{panel_id}", response_model=PanelSchema)
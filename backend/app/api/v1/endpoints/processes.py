@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app.db.session import get_db
+from typing import List, Optional
+from app.db.session import get_db, get_read_db
+from app.api.pagination import paginate_async
 from app.db.models import Process
 from pydantic import BaseModel
 from decimal import Decimal
@@ -44,18 +47,19 @@ def create_process(process: ProcessCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=List[ProcessSchema])
-def list_processes(
+async def list_processes(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     process_type: str = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all process entries with optional filtering."""
-    query = db.query(Process)
+    query = select(Process)
     if process_type:
-        query = query.filter(Process.process_type == process_type)
-    processes = query.offset(skip).limit(limit).all()
-    return processes
+        query = query.where(Process.process_type == process_type)
+    return await paginate_async(db, query, (Process.id,), response, skip, limit, cursor)
 
 
 @router.get("/{process_id}", response_model=ProcessSchema)
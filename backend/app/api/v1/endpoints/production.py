@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import date, datetime
 from decimal import Decimal
 from pydantic import BaseModel
-from app.db.session import get_db
-from app.db.models import ProductionPlan, ProductionActivity, Garment
+from app.db.session import get_db, get_read_db
+from app.api.pagination import paginate_async
+from app.core.cache import report_cache
+from app.db.models import ProductionPlan, ProductionActivity, Garment, Yarn
 
 router = APIRouter()
 
@@ -18,6 +22,7 @@ class ProductionPlanBase(BaseModel):
     status: str = "PLANNED"
     fabric_requirement: Decimal | None = None
     yarn_requirement: Decimal | None = None
+    yarn_id: int | None = None
     notes: str | None = None
 
 
@@ -40,28 +45,35 @@ def create_production_plan(plan: ProductionPlanCreate, db: Session = Depends(get
     garment = db.query(Garment).filter(Garment.id == plan.garment_id).first()
     if not garment:
         raise HTTPException(status_code=404, detail="Garment not found")
+    if plan.yarn_id is not None and db.get(Yarn, plan.yarn_id) is None:
+        raise HTTPException(status_code=404, detail="Yarn not found")
     
     db_plan = ProductionPlan(**plan.model_dump())
     db.add(db_plan)
     db.commit()
+    report_cache.invalidate("production")
     db.refresh(db_plan)
     return db_plan
 
 
 @router.get("/plans", response_model=List[ProductionPlanSchema])
-def list_production_plans(
+async def list_production_plans(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     status: str = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all production plans with optional filtering."""
-    query = db.query(ProductionPlan)
+    query = select(ProductionPlan)
     if status:
-        query = query.filter(ProductionPlan.status == status)
+        query = query.where(ProductionPlan.status == status)
     
-    plans = query.order_by(ProductionPlan.target_date.desc()).offset(skip).limit(limit).all()
-    return plans
+    return await paginate_async(
+        db, query, (ProductionPlan.target_date, ProductionPlan.id), response,
+        skip, limit, cursor, descending=True
+    )
 
 
 @router.get("/plans/{plan_id}", response_model=ProductionPlanSchema)
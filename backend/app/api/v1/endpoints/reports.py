@@ -1,219 +1,317 @@
+import asyncio
+import time
 from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import date
-from typing import Optional
-from app.db.session import get_db
+from typing import Any, Callable, Optional
+from app.api.export import export_format_param, stream_export
+from app.db.replica import ThreadedSessionRouter
+from app.db.session import get_db, get_read_db, get_reports_router
+from app.schemas.report_job import ReportJob as ReportJobSchema, ReportJobCreate
 from app.services.reports import ReportsService
+from app.services.cached_reports import CachedReportsService
+from app.services.report_jobs import ReportJobError, ReportJobQueue, ReportJobService, get_report_job_queue
 
 router = APIRouter()
 
 
+async def run_report(reports: ThreadedSessionRouter, build: Callable[[CachedReportsService], Any]) -> Any:
+    """
+    Run a report on a reports-pool session in a worker thread.
+
+    ReportsService is written against the sync ORM API and does its
+    aggregation in Python (ORM hydration, pandas, cache lookups); running
+    it off the event loop keeps other requests served while it computes.
+    """
+    return await reports.run(lambda session: build(CachedReportsService(ReportsService(session))))
+
+
 # ==================== FABRIC REPORTS ====================
 
 @router.get("/fabric/stock-sheet/total")
-def get_fabric_stock_sheet_total(db: Session = Depends(get_db)):
-    """Get total fabric stock sheet across all types"""
-    service = ReportsService(db)
-    return service.fabric_stock_sheet_total()
+async def get_fabric_stock_sheet_total(
+    include_items: bool = Query(True, description="Include per-fabric lines; false returns totals only"),
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
+):
+    """Get total fabric stock sheet across all types, with totals per type, GSM and color"""
+    return await run_report(reports, lambda service: service.fabric_stock_sheet_total(include_items))
 
 
 @router.get("/fabric/stock-sheet/by-type/{fabric_type}")
-def get_fabric_stock_sheet_by_type(
+async def get_fabric_stock_sheet_by_type(
     fabric_type: str,
-    db: Session = Depends(get_db)
+    include_items: bool = Query(True, description="Include per-fabric lines; false returns totals only"),
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
 ):
     """Get fabric stock sheet filtered by fabric type (JERSEY, TERRY, FLEECE)"""
-    service = ReportsService(db)
-    return service.fabric_stock_sheet_by_type(fabric_type.upper())
+    return await run_report(
+        reports, lambda service: service.fabric_stock_sheet_by_type(fabric_type.upper(), include_items)
+    )
 
 
 @router.get("/fabric/stock-sheet/by-period")
-def get_fabric_stock_sheet_by_period(
+async def get_fabric_stock_sheet_by_period(
     start_date: date = Query(..., description="Start date (YYYY-MM-DD)"),
     end_date: date = Query(..., description="End date (YYYY-MM-DD)"),
-    db: Session = Depends(get_db)
+    include_items: bool = Query(True, description="Include per-fabric lines; false returns totals only"),
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
 ):
     """Get fabric stock sheet for a specific time period"""
-    service = ReportsService(db)
-    return service.fabric_stock_sheet_by_period(start_date, end_date)
+    return await run_report(
+        reports, lambda service: service.fabric_stock_sheet_by_period(start_date, end_date, include_items)
+    )
 
 
 @router.get("/fabric/cost-sheet")
-def get_fabric_cost_sheet(db: Session = Depends(get_db)):
+async def get_fabric_cost_sheet(
+    include_items: bool = Query(True, description="Include per-fabric lines; false returns totals only"),
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
+):
     """Get fabric cost sheet with cost breakdown"""
-    service = ReportsService(db)
-    return service.fabric_cost_sheet()
+    return await run_report(reports, lambda service: service.fabric_cost_sheet(include_items))
 
 
 # ==================== SALES REPORTS ====================
 
 @router.get("/sales/daily/{report_date}")
-def get_daily_sales_report(
+async def get_daily_sales_report(
     report_date: date,
-    db: Session = Depends(get_db)
+    export_format: str = Depends(export_format_param),
+    reports: ThreadedSessionRouter = Depends(get_reports_router),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get daily sales report for a specific date"""
-    service = ReportsService(db)
-    return service.daily_sales_report(report_date)
+    if export_format != "json":
+        return stream_export(
+            db,
+            ReportsService.daily_sales_statement(report_date),
+            lambda row: ReportsService.sale_transaction(row[0]),
+            export_format,
+            f"daily-sales-{report_date.isoformat()}"
+        )
+    return await run_report(reports, lambda service: service.daily_sales_report(report_date))
 
 
 @router.get("/sales/daily/{report_date}/sku/{garment_id}")
-def get_daily_sales_report_single_sku(
+async def get_daily_sales_report_single_sku(
     report_date: date,
     garment_id: int,
-    db: Session = Depends(get_db)
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
 ):
     """Get daily sales report for a single SKU"""
-    service = ReportsService(db)
-    return service.daily_sales_report_single_sku(report_date, garment_id)
+    return await run_report(reports, lambda service: service.daily_sales_report_single_sku(report_date, garment_id))
 
 
 @router.get("/sales/panel-wise")
-def get_panel_wise_sales_report(
+async def get_panel_wise_sales_report(
     start_date: date = Query(..., description="Start date (YYYY-MM-DD)"),
     end_date: date = Query(..., description="End date (YYYY-MM-DD)"),
-    db: Session = Depends(get_db)
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
 ):
     """Get panel-wise sales report for a date range"""
-    service = ReportsService(db)
-    return service.panel_wise_sales_report(start_date, end_date)
+    return await run_report(reports, lambda service: service.panel_wise_sales_report(start_date, end_date))
 
 
 @router.get("/sales/inactive-panels")
-def get_inactive_panel_report(
+async def get_inactive_panel_report(
     days_threshold: int = Query(30, description="Days of inactivity threshold"),
-    db: Session = Depends(get_db)
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
 ):
     """Get report on panels with no activity in the last N days"""
-    service = ReportsService(db)
-    return service.inactive_panel_report(days_threshold)
+    return await run_report(reports, lambda service: service.inactive_panel_report(days_threshold))
 
 
 # ==================== INVENTORY REPORTS ====================
 
 @router.get("/inventory/slow-moving")
-def get_slow_moving_inventory_report(
+async def get_slow_moving_inventory_report(
     days_period: int = Query(90, description="Period in days to analyze"),
-    db: Session = Depends(get_db)
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
 ):
     """Get slow-moving inventory report based on sales velocity"""
-    service = ReportsService(db)
-    return service.slow_moving_inventory_report(days_period)
+    return await run_report(reports, lambda service: service.slow_moving_inventory_report(days_period))
+
+
+@router.get("/inventory/classification")
+async def get_inventory_classification_report(
+    days_period: int = Query(90, ge=1, description="Period in days to analyze"),
+    bucket_days: int = Query(7, ge=1, description="Bucket size in days for demand variability"),
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
+):
+    """Get ABC/XYZ classification, sales velocity and days of cover for every SKU-size"""
+    return await run_report(
+        reports, lambda service: service.inventory_classification_report(days_period, bucket_days)
+    )
 
 
 @router.get("/inventory/fast-moving")
-def get_fast_moving_inventory_report(
+async def get_fast_moving_inventory_report(
     days_period: int = Query(90, description="Period in days to analyze"),
-    db: Session = Depends(get_db)
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
 ):
     """Get fast-moving inventory report with reorder recommendations"""
-    service = ReportsService(db)
-    return service.fast_moving_inventory_report(days_period)
+    return await run_report(reports, lambda service: service.fast_moving_inventory_report(days_period))
 
 
 # ==================== PRODUCTION REPORTS ====================
 
 @router.get("/production/plan-status")
-def get_production_plan_report(
+async def get_production_plan_report(
     start_date: Optional[date] = Query(None, description="Start date filter"),
     end_date: Optional[date] = Query(None, description="End date filter"),
-    db: Session = Depends(get_db)
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
 ):
     """Get production plan status report"""
-    service = ReportsService(db)
-    return service.production_plan_report(start_date, end_date)
+    return await run_report(reports, lambda service: service.production_plan_report(start_date, end_date))
 
 
 @router.get("/production/daily-variance/{report_date}")
-def get_daily_production_variance_report(
+async def get_daily_production_variance_report(
     report_date: date,
-    db: Session = Depends(get_db)
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
 ):
     """Get daily production variance report (calculated vs actual gross weight)"""
-    service = ReportsService(db)
-    return service.daily_production_variance_report(report_date)
+    return await run_report(reports, lambda service: service.daily_production_variance_report(report_date))
 
 
 # ==================== COMBINED REPORTS ====================
 
 @router.get("/summary/all")
-def get_summary_report(db: Session = Depends(get_db)):
-    """Get a comprehensive summary report combining key metrics"""
-    service = ReportsService(db)
+async def get_summary_report(
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
+):
+    """
+    Get a comprehensive summary report combining key metrics
     
-    from datetime import timedelta
+    Sections run concurrently, each on its own session and worker thread,
+    so the response takes as long as the slowest section; per-section
+    times are returned in ``timings_ms``.
+    """
     today = date.today()
     
+    async def run_section(name: str, build: Callable[[ReportsService], Any]):
+        started = time.perf_counter()
+        value = await run_report(reports, build)
+        return name, value, round((time.perf_counter() - started) * 1000, 1)
+    
+    results = await asyncio.gather(*(
+        run_section(name, build)
+        for name, build in ReportsService.summary_sections(today).items()
+    ))
+    
     return {
         "report_type": "Comprehensive Summary Report",
         "generated_at": today.isoformat(),
-        "fabric_stock": service.fabric_stock_sheet_total()["summary"],
-        "daily_sales": service.daily_sales_report(today)["summary"],
-        "slow_moving_count": service.slow_moving_inventory_report(90)["slow_moving_items_count"],
-        "fast_moving_count": service.fast_moving_inventory_report(90)["fast_moving_items_count"],
-        "production_plans": service.production_plan_report()["summary"]
+        **{name: value for name, value, _ in results},
+        "timings_ms": {name: elapsed for name, _, elapsed in results}
     }
 
 
 # ==================== YARN REPORTS ====================
 
 @router.get("/yarn/purchase-raise")
-def get_purchase_raise_report(
+async def get_purchase_raise_report(
     min_stock_threshold: float = Query(100.0, description="Minimum stock threshold"),
     days_forecast: int = Query(30, description="Days to forecast demand"),
-    db: Session = Depends(get_db)
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
 ):
     """Generate purchase raise report for yarn based on stock levels"""
-    service = ReportsService(db)
-    return service.purchase_raise_for_yarn_report(min_stock_threshold, days_forecast)
+    return await run_report(reports, lambda service: service.purchase_raise_for_yarn_report(min_stock_threshold, days_forecast))
+
+
+@router.get("/yarn/forecast")
+async def get_yarn_forecast_report(
+    forecast_days: int = Query(30, ge=1, description="Days to forecast demand"),
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
+):
+    """Forecast yarn consumption from production plans and garment demand forecasts"""
+    return await run_report(reports, lambda service: service.yarn_forecast_report(forecast_days))
 
 
 # ==================== BUNDLE SKU REPORTS ====================
 
 @router.get("/sales/bundle-sku")
-def get_bundle_sku_sales_report(
+async def get_bundle_sku_sales_report(
     start_date: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="End date (YYYY-MM-DD)"),
-    db: Session = Depends(get_db)
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
 ):
     """Get sales report for bundle/combo SKUs"""
-    service = ReportsService(db)
-    return service.bundle_sku_sales_report(start_date, end_date)
+    return await run_report(reports, lambda service: service.bundle_sku_sales_report(start_date, end_date))
 
 
 # ==================== DISCOUNT REPORTS ====================
 
 @router.get("/discounts/general")
-def get_discount_report_general(
+async def get_discount_report_general(
     start_date: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="End date (YYYY-MM-DD)"),
-    db: Session = Depends(get_db)
+    export_format: str = Depends(export_format_param),
+    reports: ThreadedSessionRouter = Depends(get_reports_router),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get general discount report across all sales"""
-    service = ReportsService(db)
-    return service.discount_report_general(start_date, end_date)
+    if export_format != "json":
+        return stream_export(
+            db,
+            ReportsService.discount_lines_statement(start_date, end_date, include_returns=False),
+            ReportsService.discount_line,
+            export_format,
+            "discounts-general"
+        )
+    return await run_report(reports, lambda service: service.discount_report_general(start_date, end_date))
 
 
 @router.get("/discounts/by-panel")
-def get_discount_report_by_panel(
+async def get_discount_report_by_panel(
     start_date: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="End date (YYYY-MM-DD)"),
-    db: Session = Depends(get_db)
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
 ):
     """Get discount report grouped by sales panel"""
-    service = ReportsService(db)
-    return service.discount_report_by_panel(start_date, end_date)
+    return await run_report(reports, lambda service: service.discount_report_by_panel(start_date, end_date))
 
 
 # ==================== SETTLEMENT REPORTS ====================
 
 @router.get("/settlements/panel-settlement")
-def get_settlement_report(
+async def get_settlement_report(
     panel_id: Optional[int] = Query(None, description="Filter by specific panel ID"),
     start_date: Optional[date] = Query(None, description="Start date (YYYY-MM-DD)"),
     end_date: Optional[date] = Query(None, description="End date (YYYY-MM-DD)"),
-    db: Session = Depends(get_db)
+    reports: ThreadedSessionRouter = Depends(get_reports_router)
 ):
     """Get settlement report for panels showing amounts due/payable"""
-    service = ReportsService(db)
-    return service.settlement_report(panel_id, start_date, end_date)
+    return await run_report(reports, lambda service: service.settlement_report(panel_id, start_date, end_date))
+
+
+# ==================== BACKGROUND REPORT JOBS ====================
+
+@router.post("/jobs", response_model=ReportJobSchema, status_code=202)
+def create_report_job(
+    request: ReportJobCreate,
+    db: Session = Depends(get_db),
+    queue: ReportJobQueue = Depends(get_report_job_queue)
+):
+    """
+    Queue a report (any ReportsService report method, with its parameters)
+    for a background worker; poll GET /reports/jobs/{id} for the result.
+    Identical requests share the queued job or its unexpired result.
+    """
+    try:
+        job, created = ReportJobService(db).submit(request.report, request.params)
+    except ReportJobError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    if created:
+        queue.enqueue(job.id)
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=ReportJobSchema)
+def get_report_job(job_id: int, db: Session = Depends(get_db)):
+    """Status, progress (percent) and, once succeeded, the result of a report job"""
+    job = ReportJobService(db).get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return job
@@ -1,40 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from datetime import date, datetime
-from decimal import Decimal
-from pydantic import BaseModel
-from app.db.session import get_db
+from typing import Any, Dict, List, Optional
+from itertools import islice
+from datetime import date
+from app.db.session import get_db, get_read_db
+from app.api.export import export_format_param, stream_list_export
+from app.api.pagination import paginate_async
+from app.core.cache import report_cache
+from app.core.config import settings
 from app.db.models import Sale, Garment, Panel
+from app.schemas.sale import SaleCreate, SaleSchema, BulkSaleResult
+from app.services.panel_activity import PanelActivityService
+from app.services.sales_rollup import SalesRollupService
+from app.services.stock import StockService
+from app.services.sales_ingest import SalesIngestionService, read_sales_csv
 
 router = APIRouter()
 
 
-class SaleBase(BaseModel):
-    transaction_date: date
-    garment_id: int
-    panel_id: int
-    size: str
-    quantity: int
-    unit_price: Decimal
-    discount_percentage: Decimal = Decimal(0)
-    total_amount: Decimal
-    is_return: bool = False
-    invoice_number: str | None = None
-
-
-class SaleCreate(SaleBase):
-    pass
-
-
-class SaleSchema(SaleBase):
-    id: int
-    created_at: datetime
-
-    class Config:
-        from_attributes = True
-
-
 @router.post("/", response_model=SaleSchema, status_code=status.HTTP_201_CREATED)
 def create_sale(sale: SaleCreate, db: Session = Depends(get_db)):
     """Create a new sale record."""
@@ -49,31 +34,84 @@ def create_sale(sale: SaleCreate, db: Session = Depends(get_db)):
     
     db_sale = Sale(**sale.model_dump())
     db.add(db_sale)
+    db.flush()
+    SalesRollupService(db).apply([sale.model_dump()])
+    PanelActivityService(db).record_sales([sale.model_dump()])
+    StockService(db).post_sales([{**sale.model_dump(), "id": db_sale.id}])
     db.commit()
+    report_cache.invalidate("sales", "inventory")
     db.refresh(db_sale)
     return db_sale
 
 
+def _ingest(rows: List[Dict[str, Any]], atomic: bool, db: Session) -> Dict[str, Any]:
+    if len(rows) > settings.BULK_INGEST_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.BULK_INGEST_MAX_ROWS} rows"
+        )
+    result = SalesIngestionService(db).ingest(rows, atomic=atomic)
+    db.commit()
+    if result["inserted"]:
+        report_cache.invalidate("sales", "inventory")
+    return result
+
+
+@router.post("/bulk", response_model=BulkSaleResult)
+def bulk_create_sales(
+    rows: List[Dict[str, Any]],
+    atomic: bool = False,
+    db: Session = Depends(get_db)
+):
+    """
+    Ingest a JSON array of sale/return lines in one transaction.
+    Invalid rows are reported by 1-based position; with atomic=true any
+    invalid row rejects the whole batch.
+    """
+    return _ingest(rows, atomic, db)
+
+
+@router.post("/bulk/csv", response_model=BulkSaleResult)
+def bulk_create_sales_csv(
+    file: UploadFile = File(..., description="CSV with a header row of sale fields"),
+    atomic: bool = False,
+    db: Session = Depends(get_db)
+):
+    """Ingest an end-of-day panel CSV file of sale/return lines."""
+    rows = list(islice(read_sales_csv(file.file), settings.BULK_INGEST_MAX_ROWS + 1))
+    return _ingest(rows, atomic, db)
+
+
 @router.get("/", response_model=List[SaleSchema])
-def list_sales(
+async def list_sales(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     start_date: date = None,
     end_date: date = None,
     panel_id: int = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    export_format: str = Depends(export_format_param),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """List all sales with optional filtering."""
-    query = db.query(Sale)
+    query = select(Sale)
     if start_date:
-        query = query.filter(Sale.transaction_date >= start_date)
+        query = query.where(Sale.transaction_date >= start_date)
     if end_date:
-        query = query.filter(Sale.transaction_date <= end_date)
+        query = query.where(Sale.transaction_date <= end_date)
     if panel_id:
-        query = query.filter(Sale.panel_id == panel_id)
+        query = query.where(Sale.panel_id == panel_id)
     
-    sales = query.order_by(Sale.transaction_date.desc()).offset(skip).limit(limit).all()
-    return sales
+    if export_format != "json":
+        return stream_list_export(
+            db, query, SaleSchema, (Sale.transaction_date.desc(), Sale.id.desc()),
+            export_format, "sales"
+        )
+    return await paginate_async(
+        db, query, (Sale.transaction_date, Sale.id), response,
+        skip, limit, cursor, descending=True
+    )
 
 
 @router.get("/daily/{transaction_date}", response_model=List[SaleSchema])
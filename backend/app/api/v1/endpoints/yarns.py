@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app.db.session import get_db
+from typing import List, Optional
+from app.db.session import get_db, get_read_db
+from app.api.pagination import paginate_async
+from app.core.cache import report_cache
 from app.db.models import Yarn
 from app.schemas.yarn import Yarn as YarnSchema, YarnCreate, YarnUpdate
 
@@ -14,15 +18,21 @@ def create_yarn(yarn: YarnCreate, db: Session = Depends(get_db)):
     db_yarn = Yarn(**yarn.model_dump())
     db.add(db_yarn)
     db.commit()
+    report_cache.invalidate("yarns")
     db.refresh(db_yarn)
     return db_yarn
 
 
 @router.get("/", response_model=List[YarnSchema])
-def list_yarns(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def list_yarns(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
     """List all yarn entries."""
-    yarns = db.query(Yarn).offset(skip).limit(limit).all()
-    return yarns
+    return await paginate_async(db, select(Yarn), (Yarn.id,), response, skip, limit, cursor)
 
 
 @router.get("/{yarn_id}", response_model=YarnSchema)
@@ -46,6 +56,7 @@ def update_yarn(yarn_id: int, yarn_update: YarnUpdate, db: Session = Depends(get
         setattr(db_yarn, field, value)
     
     db.commit()
+    report_cache.invalidate("yarns")
     db.refresh(db_yarn)
     return db_yarn
 
@@ -59,4 +70,5 @@ def delete_yarn(yarn_id: int, db: Session = Depends(get_db)):
     
     db.delete(db_yarn)
     db.commit()
+    report_cache.invalidate("yarns")
     return None
@@ -0,0 +1,249 @@
+"""
+Maintenance commands.
+
+Usage:
+    python -m app.cli rollup-rebuild [--start-date YYYY-MM-DD] [--end-date YYYY-MM-DD]
+    python -m app.cli rollup-check [--start-date YYYY-MM-DD] [--end-date YYYY-MM-DD]
+    python -m app.cli partitions-ensure [--months-ahead N]
+    python -m app.cli partitions-archive [--before YYYY-MM-DD] [--archive-dir DIR]
+    python -m app.cli partitions-backfill [--batch-size N]
+    python -m app.cli panel-activity-rebuild
+    python -m app.cli fabric-summary-refresh
+    python -m app.cli stock-rebuild
+    python -m app.cli stock-check
+    python -m app.cli forecast-refresh [--history-days N] [--method exponential_smoothing|prophet]
+    python -m app.cli report-jobs-purge
+    python -m app.cli seed-synthetic [--scale 10k|100k|1m] [--seed N] [--history-days N]
+"""
+import argparse
+import json
+import sys
+from datetime import date
+
+from app.core.cache import report_cache
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.fabric_summary import FabricSummaryService
+from app.services.forecasting import DemandForecastService
+from app.services.panel_activity import PanelActivityService
+from app.services.partitions import PARTITIONED_TABLES, PartitionManager, add_months, month_start
+from app.services.report_jobs import ReportJobService
+from app.services.sales_rollup import ArchivedPeriodError, SalesRollupService
+from app.services.stock import StockService
+from app.services.synthetic_data import SCALES, SyntheticDataGenerator
+
+
+def _add_period_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--start-date", type=date.fromisoformat, default=None)
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None)
+
+
+def rollup_rebuild(args: argparse.Namespace) -> int:
+    """Backfill or repair sales_daily_rollup from raw sales."""
+    db = SessionLocal()
+    try:
+        written = SalesRollupService(db).rebuild(args.start_date, args.end_date)
+    except ArchivedPeriodError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    finally:
+        db.close()
+    print(f"sales_daily_rollup: {written} rows written")
+    return 0
+
+
+def rollup_check(args: argparse.Namespace) -> int:
+    """Compare sales_daily_rollup against raw sales; non-zero exit on drift."""
+    db = SessionLocal()
+    try:
+        result = SalesRollupService(db).check_consistency(args.start_date, args.end_date)
+    except ArchivedPeriodError as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    finally:
+        db.close()
+    print(json.dumps(result, indent=2))
+    return 0 if result["consistent"] else 1
+
+
+def partitions_ensure(args: argparse.Namespace) -> int:
+    """Create the monthly sales/paid_ads partitions ahead of time (the API also does this on a timer)."""
+    db = SessionLocal()
+    try:
+        created = PartitionManager(db).ensure_future_partitions(args.months_ahead)
+    finally:
+        db.close()
+    print(json.dumps(created, indent=2))
+    return 0
+
+
+def partitions_archive(args: argparse.Namespace) -> int:
+    """Export partitions older than the retention window to Parquet and drop them."""
+    before = args.before or add_months(month_start(date.today()), -settings.PARTITION_RETENTION_MONTHS)
+    db = SessionLocal()
+    try:
+        manager = PartitionManager(db)
+        archived = {
+            table: manager.archive(table, before, args.archive_dir)
+            for table in PARTITIONED_TABLES
+            if manager.is_partitioned(table)
+        }
+    finally:
+        db.close()
+    print(json.dumps(archived, indent=2))
+    return 0
+
+
+def partitions_backfill(args: argparse.Namespace) -> int:
+    """Move rows left behind by a deferred partitioning migration."""
+    db = SessionLocal()
+    try:
+        manager = PartitionManager(db)
+        for table in PARTITIONED_TABLES:
+            moved = manager.backfill(table, args.batch_size)
+            print(f"{table}: {moved} rows moved")
+    finally:
+        db.close()
+    return 0
+
+
+def panel_activity_rebuild(args: argparse.Namespace) -> int:
+    """Recompute the latest sale/ad date per panel from raw sales and ads."""
+    db = SessionLocal()
+    try:
+        written = PanelActivityService(db).rebuild()
+    finally:
+        db.close()
+    report_cache.invalidate("panels")
+    print(f"panel_activity: {written} rows written")
+    return 0
+
+
+def fabric_summary_refresh(args: argparse.Namespace) -> int:
+    """Refresh the fabric_stock_totals view after fabric changes made outside the API."""
+    db = SessionLocal()
+    try:
+        FabricSummaryService(db).refresh()
+    finally:
+        db.close()
+    report_cache.invalidate("fabrics")
+    print("fabric_stock_totals: refreshed")
+    return 0
+
+
+def stock_rebuild(args: argparse.Namespace) -> int:
+    """Reset inventory levels to the sums of the stock_movements ledger."""
+    db = SessionLocal()
+    try:
+        changed = StockService(db).rebuild()
+    finally:
+        db.close()
+    print(f"inventory: {changed} rows corrected")
+    return 0
+
+
+def stock_check(args: argparse.Namespace) -> int:
+    """Compare inventory levels against the ledger; non-zero exit on drift."""
+    db = SessionLocal()
+    try:
+        result = StockService(db).check_consistency()
+    finally:
+        db.close()
+    print(json.dumps(result, indent=2))
+    return 0 if result["consistent"] else 1
+
+
+def forecast_refresh(args: argparse.Namespace) -> int:
+    """Refit garment demand forecasts used by the yarn purchase reports (run nightly)."""
+    db = SessionLocal()
+    try:
+        fitted = DemandForecastService(db).refresh(args.history_days, args.method)
+    finally:
+        db.close()
+    report_cache.invalidate("forecasts")
+    print(f"demand_forecasts: {fitted} garments fitted")
+    return 0
+
+
+def report_jobs_purge(args: argparse.Namespace) -> int:
+    """Delete finished report jobs whose stored results have expired (run daily)."""
+    db = SessionLocal()
+    try:
+        purged = ReportJobService(db).purge()
+    finally:
+        db.close()
+    print(f"report_jobs: {purged} jobs purged")
+    return 0
+
+
+def seed_synthetic(args: argparse.Namespace) -> int:
+    """Fill an empty database with deterministic synthetic data for load testing."""
+    db = SessionLocal()
+    try:
+        counts = SyntheticDataGenerator(db, seed=args.seed, history_days=args.history_days).populate(
+            SCALES[args.scale]
+        )
+    finally:
+        db.close()
+    report_cache.invalidate("sales", "inventory", "garments", "panels", "production", "fabrics", "yarns")
+    print(json.dumps(counts, indent=2))
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Anthrilo maintenance commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser("rollup-rebuild", help=rollup_rebuild.__doc__)
+    _add_period_args(rebuild)
+    rebuild.set_defaults(func=rollup_rebuild)
+
+    check = commands.add_parser("rollup-check", help=rollup_check.__doc__)
+    _add_period_args(check)
+    check.set_defaults(func=rollup_check)
+
+    ensure = commands.add_parser("partitions-ensure", help=partitions_ensure.__doc__)
+    ensure.add_argument("--months-ahead", type=int, default=None)
+    ensure.set_defaults(func=partitions_ensure)
+
+    archive = commands.add_parser("partitions-archive", help=partitions_archive.__doc__)
+    archive.add_argument("--before", type=date.fromisoformat, default=None)
+    archive.add_argument("--archive-dir", default=settings.PARTITION_ARCHIVE_DIR)
+    archive.set_defaults(func=partitions_archive)
+
+    backfill = commands.add_parser("partitions-backfill", help=partitions_backfill.__doc__)
+    backfill.add_argument("--batch-size", type=int, default=10000)
+    backfill.set_defaults(func=partitions_backfill)
+
+    panel_activity = commands.add_parser("panel-activity-rebuild", help=panel_activity_rebuild.__doc__)
+    panel_activity.set_defaults(func=panel_activity_rebuild)
+
+    fabric_summary = commands.add_parser("fabric-summary-refresh", help=fabric_summary_refresh.__doc__)
+    fabric_summary.set_defaults(func=fabric_summary_refresh)
+
+    stock_rebuild_parser = commands.add_parser("stock-rebuild", help=stock_rebuild.__doc__)
+    stock_rebuild_parser.set_defaults(func=stock_rebuild)
+
+    stock_check_parser = commands.add_parser("stock-check", help=stock_check.__doc__)
+    stock_check_parser.set_defaults(func=stock_check)
+
+    forecast = commands.add_parser("forecast-refresh", help=forecast_refresh.__doc__)
+    forecast.add_argument("--history-days", type=int, default=None)
+    forecast.add_argument("--method", choices=["exponential_smoothing", "prophet"], default=None)
+    forecast.set_defaults(func=forecast_refresh)
+
+    purge = commands.add_parser("report-jobs-purge", help=report_jobs_purge.__doc__)
+    purge.set_defaults(func=report_jobs_purge)
+
+    seed = commands.add_parser("seed-synthetic", help=seed_synthetic.__doc__)
+    seed.add_argument("--scale", choices=sorted(SCALES), default="10k")
+    seed.add_argument("--seed", type=int, default=42)
+    seed.add_argument("--history-days", type=int, default=365)
+    seed.set_defaults(func=seed_synthetic)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
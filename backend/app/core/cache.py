@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBackend:
+    """
+    In-process fallback with the subset of Redis behaviour the cache uses.
+    Least recently used keys are evicted past ``max_entries`` (None: never).
+    """
+
+    def __init__(self, max_entries: Optional[int] = 1024):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _live(self, key: str) -> Optional[tuple]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, _ = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return item
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            item = self._live(key)
+            return item[1] if item else None
+
+    def mget(self, keys: List[str]) -> List[Optional[str]]:
+        return [self.get(key) for key in keys]
+
+    def set(self, key: str, value: str, ex: Optional[int] = None, nx: bool = False) -> Optional[bool]:
+        with self._lock:
+            if nx and self._live(key) is not None:
+                return None
+            expires_at = time.monotonic() + ex if ex else None
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while self.max_entries is not None and len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+            return True
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            item = self._live(key)
+            value = int(item[1]) + 1 if item else 1
+            self._data[key] = (item[0] if item else None, str(value))
+            return value
+
+    def expire(self, key: str, seconds: int) -> None:
+        with self._lock:
+            item = self._live(key)
+            if item is not None:
+                self._data[key] = (time.monotonic() + seconds, item[1])
+
+    def ttl(self, key: str) -> int:
+        """Seconds left on the key; -1 if it never expires, -2 if missing (as in Redis)."""
+        with self._lock:
+            item = self._live(key)
+            if item is None:
+                return -2
+            return -1 if item[0] is None else max(0, int(item[0] - time.monotonic()))
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def pipeline(self, transaction: bool = True) -> "MemoryPipeline":
+        return MemoryPipeline(self)
+
+
+class MemoryPipeline:
+    """Queues MemoryBackend commands and runs them in order on execute(), like a Redis pipeline."""
+
+    def __init__(self, backend: MemoryBackend):
+        self._backend = backend
+        self._commands: List[tuple] = []
+
+    def __getattr__(self, name: str) -> Callable[..., "MemoryPipeline"]:
+        command = getattr(self._backend, name)
+
+        def queue(*args: Any, **kwargs: Any) -> "MemoryPipeline":
+            self._commands.append((command, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> List[Any]:
+        commands, self._commands = self._commands, []
+        return [command(*args, **kwargs) for command, args, kwargs in commands]
+
+
+class ReportCache:
+    """
+    Report result cache with tag-based invalidation.
+
+    Every tag (one per table, e.g. ``sales``) has a version counter that is
+    folded into the cache key. Invalidating a tag bumps its counter, so all
+    entries that depended on it stop being addressable and simply age out
+    through their TTL; no key scans are needed.
+
+    Uses Redis at ``settings.REDIS_URL`` when it answers, otherwise an
+    in-process store, so tests and local runs work without Redis.
+    """
+
+    key_prefix = "anthrilo:report"
+
+    def __init__(self, backend: Any = None):
+        self._backend = backend
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self) -> Any:
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = self._connect()
+        return self._backend
+
+    def _connect(self) -> Any:
+        if settings.REPORT_CACHE_BACKEND != "memory" and settings.REDIS_URL:
+            try:
+                client = redis.Redis.from_url(
+                    settings.REDIS_URL,
+                    socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+                    socket_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+                    decode_responses=True
+                )
+                client.ping()
+                return client
+            except redis.RedisError as exc:
+                if settings.REPORT_CACHE_BACKEND == "redis":
+                    raise
+                logger.warning("Redis unavailable (%s); using in-process report cache", exc)
+        return MemoryBackend()
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.key_prefix}:tag:{tag}"
+
+    def make_key(self, name: str, params: Dict[str, Any], tags: Iterable[str]) -> str:
+        tags = sorted(tags)
+        versions = self.backend.mget([self._tag_key(t) for t in tags]) if tags else []
+        payload = json.dumps(params, sort_keys=True, default=str)
+        digest = hashlib.sha256(payload.encode()).hexdigest()[:32]
+        tag_part = ",".join(f"{t}={v or 0}" for t, v in zip(tags, versions))
+        return f"{self.key_prefix}:{name}:{digest}:{tag_part}"
+
+    def get_or_compute(
+        self,
+        name: str,
+        params: Dict[str, Any],
+        compute: Callable[[], Any],
+        ttl: int,
+        tags: Iterable[str] = ()
+    ) -> Any:
+        """Return the cached result for (name, params) or compute and store it."""
+        if not settings.REPORT_CACHE_ENABLED:
+            return compute()
+
+        try:
+            key = self.make_key(name, params, tags)
+            cached = self.backend.get(key)
+        except redis.RedisError as exc:
+            logger.warning("Report cache read failed for %s: %s", name, exc)
+            return compute()
+
+        if cached is not None:
+            return json.loads(cached)
+
+        result = compute()
+        try:
+            self.backend.set(key, json.dumps(result, default=str), ex=ttl)
+        except redis.RedisError as exc:
+            logger.warning("Report cache write failed for %s: %s", name, exc)
+        return result
+
+    def invalidate(self, *tags: str) -> None:
+        """Expire every cached report that depends on any of the given tags."""
+        for tag in tags:
+            try:
+                self.backend.incr(self._tag_key(tag))
+            except redis.RedisError as exc:
+                logger.warning("Report cache invalidation failed for %s: %s", tag, exc)
+
+
+report_cache = ReportCache()
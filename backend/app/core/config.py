@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -14,14 +14,49 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
     
+    # Optional streaming replica for list endpoints and reports
+    DATABASE_REPLICA_URL: Optional[str] = None
+    REPLICA_MAX_LAG_SECONDS: float = 30.0
+    REPLICA_CHECK_INTERVAL_SECONDS: float = 5.0
+    
+    # Connection budget per API process: DB_POOL_SIZE + DB_MAX_OVERFLOW, plus
+    # REPORTS_DB_POOL_SIZE + REPORTS_DB_MAX_OVERFLOW, plus 1 per REPORT_JOB_WORKERS
+    # process. Times the number of API processes, keep it below PostgreSQL's
+    # max_connections (100 by default, 3 reserved for superusers).
+    
+    # Connection pool (transactional API traffic), split between the sync
+    # engine (writes) and the async engine (reads)
+    DB_POOL_SIZE: int = 8
+    DB_MAX_OVERFLOW: int = 4
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 15000  # PostgreSQL only; 0 disables
+    
+    # Connection pool (reports, kept separate so analytics cannot starve writes)
+    REPORTS_DB_POOL_SIZE: int = 4
+    REPORTS_DB_MAX_OVERFLOW: int = 2
+    REPORTS_DB_STATEMENT_TIMEOUT_MS: int = 120000
+    
     # Redis
     REDIS_URL: str
+    REDIS_CONNECT_TIMEOUT_SECONDS: float = 0.5
     
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    AUTH_TOKEN_CACHE_SIZE: int = 10000  # verified token claims kept in memory
+    AUTH_USER_CACHE_SIZE: int = 10000
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60  # users are re-read at least this often
+    PASSWORD_BCRYPT_ROUNDS: int = 12  # changing it rehashes passwords on their next login
+    PASSWORD_HASH_WORKERS: int = 4  # threads dedicated to bcrypt
+    PASSWORD_HASH_MAX_PENDING: int = 64  # hashes running or queued before logins get 503
+    LOGIN_THROTTLE_WINDOW_SECONDS: int = 300
+    LOGIN_MAX_FAILURES_PER_USERNAME: int = 5
+    LOGIN_MAX_FAILURES_PER_IP: int = 50
+    AUTH_STORE_BACKEND: str = "redis"  # revocations/login counters: redis, or memory (single process only)
     
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:3000"]
@@ -30,6 +65,40 @@ class Settings(BaseSettings):
     DEFAULT_PAGE_SIZE: int = 20
     MAX_PAGE_SIZE: int = 100
     
+    # Bulk ingestion
+    BULK_INGEST_MAX_ROWS: int = 200000
+    
+    # Partitioning of sales / paid_ads (PostgreSQL)
+    PARTITION_PREMAKE_MONTHS: int = 3
+    PARTITION_PREMAKE_INTERVAL_HOURS: float = 24  # app re-checks premade months at startup and this often; 0 disables
+    PARTITION_RETENTION_MONTHS: int = 24  # older months are archived to Parquet
+    PARTITION_ARCHIVE_DIR: str = "archive"
+    
+    # Demand forecasting (python -m app.cli forecast-refresh)
+    FORECAST_METHOD: str = "exponential_smoothing"  # or prophet (needs the prophet package)
+    FORECAST_HISTORY_DAYS: int = 180
+    
+    # Reporting
+    USE_SALES_ROLLUP: bool = False  # enable once sales_daily_rollup is backfilled
+    
+    # Report cache
+    REPORT_CACHE_ENABLED: bool = True
+    REPORT_CACHE_BACKEND: str = "auto"  # auto (Redis, falling back to memory), redis, memory
+    REPORT_CACHE_DEFAULT_TTL: int = 300
+    
+    # Request profiling (Server-Timing headers and /metrics)
+    PROFILING_ENABLED: bool = False
+    PROFILING_N_PLUS_ONE_THRESHOLD: int = 10  # repeats of one statement shape flagged as N+1
+    PROFILING_SAMPLE_RATE: float = 0.0  # share of requests run under the profiler
+    PROFILING_SLOW_REQUEST_MS: int = 1000  # sampled requests slower than this keep their profile
+    PROFILING_PROFILER: str = "cprofile"  # or pyinstrument (needs the pyinstrument package)
+    PROFILING_DUMP_DIR: str = "profiles"
+    
+    # Background report jobs (POST /reports/jobs)
+    REPORT_JOB_WORKERS: int = 2  # worker processes
+    REPORT_JOB_RESULT_TTL_SECONDS: int = 3600  # identical requests reuse a result this long
+    REPORT_JOB_TIMEOUT_SECONDS: int = 1800  # queued/running jobs older than this are failed
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
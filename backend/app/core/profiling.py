@@ -0,0 +1,258 @@
+import cProfile
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter as MetricCounter, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+registry = CollectorRegistry()
+REQUESTS = MetricCounter(
+    "http_requests_total", "HTTP requests", ["method", "route", "status"], registry=registry
+)
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Wall time per request", ["method", "route"], registry=registry
+)
+DB_SECONDS = Histogram(
+    "http_request_db_seconds", "Time spent executing SQL per request", ["method", "route"], registry=registry
+)
+STATEMENTS = Histogram(
+    "http_request_sql_statements", "SQL statements executed per request", ["method", "route"],
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 1000), registry=registry
+)
+N_PLUS_ONE = MetricCounter(
+    "http_request_n_plus_one_total", "Requests repeating one SQL statement shape past the threshold",
+    ["method", "route"], registry=registry
+)
+
+# Literal lists and placeholders collapse so e.g. IN (?, ?, ?) and IN (?)
+# count as the same statement shape.
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%\([^)]+\)s|\$\d+|%s)(?:\s*,\s*(?:\?|%\([^)]+\)s|\$\d+|%s))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# cProfile and pyinstrument cannot run two profiles in one process at once
+_profiler_lock = threading.Lock()
+
+
+def statement_shape(statement: str) -> str:
+    return _WHITESPACE.sub(" ", _PLACEHOLDER_LIST.sub("(?)", statement)).strip()
+
+
+class RequestStats:
+    """SQL activity of one request, filled in by the engine event hooks."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.statement_count = 0
+        self.db_seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def repeated_shapes(self, threshold: int):
+        """Statement shapes executed more than ``threshold`` times (likely N+1 loops)."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_stats() -> Optional[RequestStats]:
+    return _request_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _request_stats.get() is not None:
+        conn.info.setdefault("profiling_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    started = conn.info.get("profiling_started")
+    if stats is None or not started:
+        return
+    stats.db_seconds += time.perf_counter() - started.pop()
+    stats.statement_count += 1
+    stats.shapes[statement_shape(statement)] += 1
+
+
+def install_sql_hooks() -> None:
+    """Count and time statements on every engine (sync and async) in the process."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def remove_sql_hooks() -> None:
+    if event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class SampledProfiler:
+    """
+    Profile of one sampled request with cProfile, or pyinstrument when
+    PROFILING_PROFILER is "pyinstrument" and the package is installed.
+    Only the event-loop thread is profiled, which covers the async report
+    endpoints; sync endpoints run in worker threads.
+    """
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.profiler: Any = None
+
+    def start(self) -> None:
+        if self.kind == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+                self.profiler = Profiler(async_mode="enabled")
+            except ImportError:
+                logger.warning("pyinstrument is not installed; profiling with cProfile")
+                self.kind = "cprofile"
+        if self.profiler is None:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        else:
+            self.profiler.start()
+
+    def stop(self) -> None:
+        if self.kind == "pyinstrument":
+            self.profiler.stop()
+        else:
+            self.profiler.disable()
+
+    def dump(self, directory: str, name: str) -> str:
+        os.makedirs(directory, exist_ok=True)
+        if self.kind == "pyinstrument":
+            path = os.path.join(directory, f"{name}.html")
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(self.profiler.output_html())
+        else:
+            path = os.path.join(directory, f"{name}.prof")
+            self.profiler.dump_stats(path)
+        return path
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class ProfilingMiddleware:
+    """
+    Records wall time, SQL time and statement count per request.
+
+    Numbers are returned in a Server-Timing header and fed to the Prometheus
+    metrics at /metrics. Requests repeating one statement shape more than
+    PROFILING_N_PLUS_ONE_THRESHOLD times are logged as likely N+1 loops.
+    A PROFILING_SAMPLE_RATE share of requests is profiled, and the profile
+    of any sampled request slower than PROFILING_SLOW_REQUEST_MS is written
+    to PROFILING_DUMP_DIR and named in an X-Profile header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        install_sql_hooks()
+
+    def _start_profiler(self) -> Optional[SampledProfiler]:
+        if random.random() >= settings.PROFILING_SAMPLE_RATE:
+            return None
+        if not _profiler_lock.acquire(blocking=False):
+            return None
+        profiler = SampledProfiler(settings.PROFILING_PROFILER)
+        try:
+            profiler.start()
+        except Exception:
+            _profiler_lock.release()
+            raise
+        return profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        profiler = self._start_profiler()
+        status = {"code": 500}
+
+        async def send_with_timing(message):
+            nonlocal profiler
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", self._server_timing(stats).encode()))
+                if profiler is not None:
+                    path = self._finish_profile(profiler, scope, stats)
+                    profiler = None
+                    if path:
+                        headers.append((b"x-profile", os.path.basename(path).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            if profiler is not None:
+                self._finish_profile(profiler, scope, stats)
+            _request_stats.reset(token)
+            self._observe(scope, stats, status["code"])
+
+    @staticmethod
+    def _server_timing(stats: RequestStats) -> str:
+        return (
+            f"app;dur={stats.elapsed * 1000:.1f}, "
+            f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.statement_count} statements"'
+        )
+
+    def _finish_profile(self, profiler: SampledProfiler, scope, stats: RequestStats) -> Optional[str]:
+        try:
+            profiler.stop()
+            if stats.elapsed * 1000 < settings.PROFILING_SLOW_REQUEST_MS:
+                return None
+            slug = re.sub(r"[^A-Za-z0-9]+", "-", _route_label(scope)).strip("-") or "root"
+            name = f"{datetime.utcnow():%Y%m%dT%H%M%S%f}-{scope['method']}-{slug}"
+            path = profiler.dump(settings.PROFILING_DUMP_DIR, name)
+            logger.info("Profile of slow request %s %s written to %s", scope["method"], scope["path"], path)
+            return path
+        finally:
+            _profiler_lock.release()
+
+    @staticmethod
+    def _observe(scope, stats: RequestStats, status_code: int) -> None:
+        method, route = scope["method"], _route_label(scope)
+        REQUESTS.labels(method, route, str(status_code)).inc()
+        REQUEST_SECONDS.labels(method, route).observe(stats.elapsed)
+        DB_SECONDS.labels(method, route).observe(stats.db_seconds)
+        STATEMENTS.labels(method, route).observe(stats.statement_count)
+
+        repeated = stats.repeated_shapes(settings.PROFILING_N_PLUS_ONE_THRESHOLD)
+        if repeated:
+            N_PLUS_ONE.labels(method, route).inc()
+            shape, count = repeated[0]
+            logger.warning(
+                "Possible N+1 on %s %s: statement run %d times: %s",
+                method, route, count, shape[:200]
+            )
+
+
+async def metrics(request: Request) -> Response:
+    """Prometheus exposition of the request metrics."""
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
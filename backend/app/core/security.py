@@ -1,10 +1,39 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+import redis
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from prometheus_client import Counter, Gauge, Histogram
+from app.core.cache import MemoryBackend
 from app.core.config import settings
+from app.core.profiling import registry
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+
+# Hashes made with a different cost factor are upgraded on the next login
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS
+)
+
+HASH_QUEUE_DEPTH = Gauge(
+    "password_hash_queue_depth", "Password hashes running or waiting for a hashing thread",
+    registry=registry
+)
+HASH_SECONDS = Histogram(
+    "password_hash_seconds", "Time from submitting a password hash to its result (queueing included)",
+    registry=registry
+)
+HASH_REJECTED = Counter(
+    "password_hash_rejected_total", "Password hashes refused because the queue was full",
+    registry=registry
+)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -17,6 +46,58 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasherBusy(Exception):
+    """Raised when PASSWORD_HASH_MAX_PENDING hashes are already queued."""
+
+
+class PasswordHasher:
+    """
+    bcrypt on a dedicated, bounded thread pool.
+
+    bcrypt releases the GIL while hashing, so PASSWORD_HASH_WORKERS threads
+    hash in parallel while the event loop and the request threadpool stay
+    free for other endpoints. At most PASSWORD_HASH_MAX_PENDING hashes may
+    be running or queued; beyond that callers get PasswordHasherBusy rather
+    than an ever-growing queue during a login burst.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="password-hash")
+        return self._executor
+
+    async def _run(self, fn: Callable, *args: Any) -> Any:
+        if self.pending >= self.max_pending:
+            HASH_REJECTED.inc()
+            raise PasswordHasherBusy()
+        self.pending += 1
+        HASH_QUEUE_DEPTH.set(self.pending)
+        started = time.perf_counter()
+        try:
+            return await asyncio.wrap_future(self.executor.submit(fn, *args))
+        finally:
+            self.pending -= 1
+            HASH_QUEUE_DEPTH.set(self.pending)
+            HASH_SECONDS.observe(time.perf_counter() - started)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Whether the password matches, and a new hash if the stored one uses an outdated cost."""
+        return await self._run(pwd_context.verify_and_update, password, hashed_password)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -25,7 +106,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     else:
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "type": "access"})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -34,7 +115,7 @@ def create_refresh_token(data: dict) -> str:
     """Create a JWT refresh token."""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow(), "type": "refresh"})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -46,3 +127,204 @@ def decode_token(token: str) -> Optional[dict]:
         return payload
     except JWTError:
         return None
+
+
+def token_hash(token: str) -> str:
+    """Digest a token is cached and revoked under, so raw tokens are never stored."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class ExpiringLRU:
+    """Thread-safe LRU map whose entries each expire at their own epoch time."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any, expires_at: float) -> None:
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Any) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# Verified claims of recently seen tokens, keyed by token_hash and kept until
+# the token's own exp, so repeat requests skip signature verification.
+token_cache = ExpiringLRU(settings.AUTH_TOKEN_CACHE_SIZE)
+
+
+def verify_token(token: str) -> Optional[dict]:
+    """decode_token with the verified claims cached until the token expires."""
+    digest = token_hash(token)
+    claims = token_cache.get(digest)
+    if claims is None:
+        claims = decode_token(token)
+        if claims is None:
+            return None
+        token_cache.set(digest, claims, claims.get("exp", 0))
+    return claims
+
+
+class RevocationList:
+    """
+    Revoked tokens, checked on every authenticated request.
+
+    A single token is revoked by its hash until it would have expired; all
+    of a user's tokens are revoked by recording a cut-off second that tokens
+    issued (iat) before are rejected against. Entries live in the auth store
+    (``backend``), so revocations apply immediately on every worker even
+    while the token's claims are cached; store errors propagate so callers
+    fail closed.
+    """
+
+    key_prefix = "anthrilo:auth"
+
+    def __init__(self, backend: Callable[[], Any]):
+        self._backend = backend
+
+    @property
+    def backend(self) -> Any:
+        return self._backend()
+
+    def revoke_token(self, token: str) -> None:
+        claims = decode_token(token)
+        if claims is None:
+            return
+        ttl = max(1, int(claims.get("exp", 0) - time.time()))
+        self.backend.set(f"{self.key_prefix}:revoked:{token_hash(token)}", "1", ex=ttl)
+
+    def revoke_user(self, user_id: int) -> None:
+        """Reject every token issued to the user so far (password change, deactivation)."""
+        ttl = int(timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS).total_seconds())
+        # Whole seconds, like the iat claim, so a token issued later in the
+        # same second as the change is still accepted
+        self.backend.set(f"{self.key_prefix}:revoked-before:{user_id}", str(int(time.time())), ex=ttl)
+
+    def is_revoked(self, digest: str, claims: Dict[str, Any]) -> bool:
+        keys: Sequence[str] = [
+            f"{self.key_prefix}:revoked:{digest}",
+            f"{self.key_prefix}:revoked-before:{claims.get('sub')}",
+        ]
+        revoked, revoked_before = self.backend.mget(keys)
+        if revoked is not None:
+            return True
+        return revoked_before is not None and claims.get("iat", 0) < int(revoked_before)
+
+
+class LoginThrottle:
+    """
+    Failed-login counters per username and per client IP, in fixed windows
+    of LOGIN_THROTTLE_WINDOW_SECONDS kept in the auth store. Throttled
+    attempts are refused before any password is hashed. Counter errors are logged and let the login through. The calls block
+    on Redis, so async callers run them in the threadpool.
+    """
+
+    key_prefix = "anthrilo:auth:login-failures"
+
+    def __init__(self, backend: Callable[[], Any]):
+        self._backend = backend
+
+    @property
+    def backend(self) -> Any:
+        return self._backend()
+
+    def _keys(self, username: str, client_ip: str) -> Tuple[Tuple[str, int], ...]:
+        return (
+            (f"{self.key_prefix}:user:{username.lower()}", settings.LOGIN_MAX_FAILURES_PER_USERNAME),
+            (f"{self.key_prefix}:ip:{client_ip}", settings.LOGIN_MAX_FAILURES_PER_IP),
+        )
+
+    def retry_after(self, username: str, client_ip: str) -> Optional[int]:
+        """Seconds until another attempt is allowed, or None if not throttled."""
+        keys = self._keys(username, client_ip)
+        try:
+            counts = self.backend.mget([key for key, _ in keys])
+            for (key, limit), count in zip(keys, counts):
+                if count is None or int(count) < limit:
+                    continue
+                ttl = self.backend.ttl(key)
+                if ttl == -1:
+                    # A counter without a TTL would lock the key out for
+                    # good; re-arm the window instead
+                    self.backend.expire(key, settings.LOGIN_THROTTLE_WINDOW_SECONDS)
+                    ttl = settings.LOGIN_THROTTLE_WINDOW_SECONDS
+                if ttl >= 0:
+                    return max(1, ttl)
+        except redis.RedisError as exc:
+            logger.warning("Login throttle check failed: %s", exc)
+        return None
+
+    def record_failure(self, username: str, client_ip: str) -> None:
+        try:
+            # One MULTI/EXEC: the window's TTL is set when the counter is
+            # created, never in a separate call that could be lost
+            pipe = self.backend.pipeline(transaction=True)
+            for key, _ in self._keys(username, client_ip):
+                pipe.set(key, 0, ex=settings.LOGIN_THROTTLE_WINDOW_SECONDS, nx=True)
+                pipe.incr(key)
+            pipe.execute()
+        except redis.RedisError as exc:
+            logger.warning("Login throttle update failed: %s", exc)
+
+    def reset(self, username: str) -> None:
+        try:
+            self.backend.delete(self._keys(username, "")[0][0])
+        except redis.RedisError as exc:
+            logger.warning("Login throttle reset failed: %s", exc)
+
+
+_auth_store: Any = None
+_auth_store_lock = threading.Lock()
+
+
+def auth_store() -> Any:
+    """
+    Store for revocations and login counters, separate from the report
+    cache so report entries can never evict them.
+
+    Redis at REDIS_URL, with no in-process fallback: while Redis is down
+    every call raises RedisError, so token checks fail closed instead of
+    silently forgetting revocations or applying them on one worker only.
+    AUTH_STORE_BACKEND=memory keeps them in an unbounded in-process store,
+    correct only for a single process (local development, tests).
+    """
+    global _auth_store
+    if _auth_store is None:
+        with _auth_store_lock:
+            if _auth_store is None:
+                if settings.AUTH_STORE_BACKEND == "memory":
+                    _auth_store = MemoryBackend(max_entries=None)
+                else:
+                    _auth_store = redis.Redis.from_url(
+                        settings.REDIS_URL,
+                        socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+                        socket_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
+                        decode_responses=True
+                    )
+    return _auth_store
+
+
+revocation_list = RevocationList(auth_store)
+login_throttle = LoginThrottle(auth_store)
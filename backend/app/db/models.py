@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Numeric, Date, Text, ForeignKey, ARRAY
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Numeric, Date, Text, ForeignKey, ARRAY, Index, UniqueConstraint, text
+from sqlalchemy import DDL, MetaData, Table, event
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -68,6 +69,40 @@ class Fabric(Base):
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
 
 
+# Fabric stock totals per type, GSM and color. A materialized view on
+# PostgreSQL, refreshed after every fabric write (app.services.fabric_summary);
+# kept out of Base.metadata so create_all never makes a table of it.
+FABRIC_STOCK_TOTALS_SQL = """
+    SELECT fabric_type, gsm, color,
+           COUNT(id) AS fabric_count,
+           SUM(stock_quantity) AS stock_quantity,
+           SUM(stock_quantity * COALESCE(cost_per_unit, 0)) AS stock_value
+    FROM fabrics
+    GROUP BY fabric_type, gsm, color
+"""
+
+fabric_stock_totals = Table(
+    "fabric_stock_totals", MetaData(),
+    Column("fabric_type", String(50)),
+    Column("gsm", Integer),
+    Column("color", String(100)),
+    Column("fabric_count", Integer),
+    Column("stock_quantity", Numeric(14, 2)),
+    Column("stock_value", Numeric(16, 2))
+)
+
+for _ddl in (
+    f"CREATE MATERIALIZED VIEW fabric_stock_totals AS {FABRIC_STOCK_TOTALS_SQL}",
+    # REFRESH ... CONCURRENTLY needs a unique index on plain columns
+    "CREATE UNIQUE INDEX uix_fabric_stock_totals_key ON fabric_stock_totals (fabric_type, gsm, color)",
+):
+    event.listen(Base.metadata, "after_create", DDL(_ddl).execute_if(dialect="postgresql"))
+event.listen(
+    Base.metadata, "before_drop",
+    DDL("DROP MATERIALIZED VIEW IF EXISTS fabric_stock_totals").execute_if(dialect="postgresql")
+)
+
+
 class Garment(Base):
     __tablename__ = "garments"
 
@@ -91,9 +126,12 @@ class Garment(Base):
 
 class Inventory(Base):
     __tablename__ = "inventory"
+    __table_args__ = (
+        UniqueConstraint("garment_id", "size", name="uix_garment_size"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    garment_id = Column(Integer, ForeignKey("garments.id", ondelete="CASCADE"), nullable=False, index=True)
+    garment_id = Column(Integer, ForeignKey("garments.id", ondelete="CASCADE"), nullable=False)
     size = Column(String(20), nullable=False)
     good_stock = Column(Integer, nullable=False, default=0)
     virtual_stock = Column(Integer, nullable=False, default=0)
@@ -103,6 +141,31 @@ class Inventory(Base):
 
     # Relationships
     garment = relationship("Garment", back_populates="inventory")
+    movements = relationship("StockMovement", back_populates="inventory")
+
+
+class StockMovement(Base):
+    """
+    Append-only ledger of stock changes. Inventory levels are the running
+    sum of these deltas and can be rebuilt from them.
+    """
+    __tablename__ = "stock_movements"
+    __table_args__ = (
+        Index("ix_stock_movements_inventory_id", "inventory_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    inventory_id = Column(Integer, ForeignKey("inventory.id", ondelete="CASCADE"), nullable=False)
+    movement_type = Column(String(20), nullable=False)  # OPENING, RECEIPT, ISSUE, RESERVE, RELEASE, ADJUSTMENT, SALE, RETURN
+    good_stock_delta = Column(Integer, nullable=False, default=0)
+    virtual_stock_delta = Column(Integer, nullable=False, default=0)
+    # No foreign key: the partitioned sales table is keyed on (id, transaction_date)
+    sale_id = Column(Integer)
+    reference = Column(String(100))
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    # Relationships
+    inventory = relationship("Inventory", back_populates="movements")
 
 
 class Panel(Base):
@@ -124,12 +187,26 @@ class Panel(Base):
 
 
 class Sale(Base):
+    # On PostgreSQL this is range-partitioned by month on transaction_date
+    # (app.services.partitions); the database primary key is (id, transaction_date).
     __tablename__ = "sales"
+    __table_args__ = (
+        Index(
+            "ix_sales_velocity", "transaction_date", "garment_id", "size",
+            postgresql_include=["quantity"],
+            postgresql_where=text("NOT is_return")
+        ),
+        Index(
+            "ix_sales_panel_date", "panel_id", "transaction_date",
+            postgresql_include=["is_return", "quantity", "unit_price", "total_amount"]
+        ),
+        Index("ix_sales_garment_date", "garment_id", "transaction_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     transaction_date = Column(Date, nullable=False, index=True)
     garment_id = Column(Integer, ForeignKey("garments.id", ondelete="RESTRICT"), nullable=False)
-    panel_id = Column(Integer, ForeignKey("panels.id", ondelete="RESTRICT"), nullable=False, index=True)
+    panel_id = Column(Integer, ForeignKey("panels.id", ondelete="RESTRICT"), nullable=False)
     size = Column(String(20), nullable=False)
     quantity = Column(Integer, nullable=False)
     unit_price = Column(Numeric(10, 2), nullable=False)
@@ -144,8 +221,55 @@ class Sale(Base):
     panel = relationship("Panel", back_populates="sales")
 
 
+class SalesDailyRollup(Base):
+    """Daily sales totals per panel, garment, size and return flag, maintained on write."""
+    __tablename__ = "sales_daily_rollup"
+    __table_args__ = (
+        UniqueConstraint(
+            "transaction_date", "panel_id", "garment_id", "size", "is_return",
+            name="uix_sales_daily_rollup_key"
+        ),
+        Index("ix_sales_daily_rollup_panel_date", "panel_id", "transaction_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    transaction_date = Column(Date, nullable=False, index=True)
+    panel_id = Column(Integer, ForeignKey("panels.id", ondelete="CASCADE"), nullable=False)
+    garment_id = Column(Integer, ForeignKey("garments.id", ondelete="CASCADE"), nullable=False)
+    size = Column(String(20), nullable=False)
+    is_return = Column(Boolean, nullable=False)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    quantity = Column(Integer, nullable=False, default=0)
+    gross_amount = Column(Numeric(14, 2), nullable=False, default=0)  # unit_price * quantity
+    total_amount = Column(Numeric(14, 2), nullable=False, default=0)
+    discount_amount = Column(Numeric(14, 2), nullable=False, default=0)  # gross_amount - total_amount
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class PanelActivity(Base):
+    """Latest sale and paid-ad date per panel, maintained on write for inactivity checks."""
+    __tablename__ = "panel_activity"
+
+    panel_id = Column(Integer, ForeignKey("panels.id", ondelete="CASCADE"), primary_key=True)
+    last_sale_date = Column(Date)  # any sale or return line
+    last_ad_date = Column(Date)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class PartitionArchive(Base):
+    """Archive watermark per partitioned table: months before it were exported and dropped."""
+    __tablename__ = "partition_archives"
+
+    table_name = Column(String(63), primary_key=True)
+    archived_before = Column(Date, nullable=False)  # first month still in the database
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
 class ProductionPlan(Base):
     __tablename__ = "production_plans"
+    __table_args__ = (
+        Index("ix_production_plans_target_date", "target_date", postgresql_include=["status"]),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     plan_name = Column(String(255), nullable=False)
@@ -155,6 +279,7 @@ class ProductionPlan(Base):
     status = Column(String(50), nullable=False, default="PLANNED")
     fabric_requirement = Column(Numeric(12, 2))
     yarn_requirement = Column(Numeric(12, 2))
+    yarn_id = Column(Integer, ForeignKey("yarns.id", ondelete="SET NULL"))  # yarn the requirement is for
     notes = Column(Text)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -163,13 +288,53 @@ class ProductionPlan(Base):
     activities = relationship("ProductionActivity", back_populates="production_plan", cascade="all, delete-orphan")
 
 
+class DemandForecast(Base):
+    """Fitted daily unit demand per garment, refreshed offline and read by purchase reports."""
+    __tablename__ = "demand_forecasts"
+
+    id = Column(Integer, primary_key=True)
+    garment_id = Column(Integer, ForeignKey("garments.id", ondelete="CASCADE"), nullable=False, unique=True)
+    method = Column(String(30), nullable=False)  # exponential_smoothing, prophet
+    daily_units = Column(Numeric(12, 4), nullable=False)
+    smoothing_alpha = Column(Numeric(4, 2))
+    history_days = Column(Integer, nullable=False)
+    fitted_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+
+class ReportJob(Base):
+    """A report run in the background worker pool; the result is kept for polling and reuse."""
+    __tablename__ = "report_jobs"
+    __table_args__ = (
+        # At most one queued/running job per report and parameters, so
+        # concurrent identical requests share a single computation
+        Index(
+            "uq_report_jobs_active_params_hash", "params_hash", unique=True,
+            postgresql_where=text("status IN ('QUEUED', 'RUNNING')"),
+            sqlite_where=text("status IN ('QUEUED', 'RUNNING')")
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    report = Column(String(100), nullable=False)  # ReportsService method name
+    params = Column(JSONB, nullable=False)
+    params_hash = Column(String(64), nullable=False, index=True)  # sha256 of report + params
+    status = Column(String(20), nullable=False, default="QUEUED")  # QUEUED, RUNNING, SUCCEEDED, FAILED
+    progress = Column(Integer, nullable=False, default=0)  # percent
+    result = Column(JSONB)
+    error = Column(Text)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+    expires_at = Column(DateTime)  # results are not reused or kept after this
+
+
 class ProductionActivity(Base):
     __tablename__ = "production_activities"
 
     id = Column(Integer, primary_key=True, index=True)
-    production_plan_id = Column(Integer, ForeignKey("production_plans.id", ondelete="CASCADE"), nullable=False)
+    production_plan_id = Column(Integer, ForeignKey("production_plans.id", ondelete="CASCADE"), nullable=False, index=True)
     activity_type = Column(String(50), nullable=False)
-    activity_date = Column(Date, nullable=False)
+    activity_date = Column(Date, nullable=False, index=True)
     quantity = Column(Numeric(12, 2), nullable=False)
     gross_weight_calculated = Column(Numeric(12, 2))
     gross_weight_actual = Column(Numeric(12, 2))
@@ -200,11 +365,15 @@ class Discount(Base):
 
 
 class PaidAd(Base):
+    # Range-partitioned by month on ad_date on PostgreSQL, like sales
     __tablename__ = "paid_ads"
+    __table_args__ = (
+        Index("ix_paid_ads_panel_date", "panel_id", "ad_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     ad_date = Column(Date, nullable=False, index=True)
-    panel_id = Column(Integer, ForeignKey("panels.id", ondelete="CASCADE"), nullable=False, index=True)
+    panel_id = Column(Integer, ForeignKey("panels.id", ondelete="CASCADE"), nullable=False)
     platform = Column(String(100), nullable=False)
     campaign_name = Column(String(255), nullable=False)
     daily_spend = Column(Numeric(10, 2), nullable=False)
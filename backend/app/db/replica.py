@@ -0,0 +1,208 @@
+import asyncio
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Optional, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# SQLSTATE raised when a statement exceeds the connection's statement_timeout
+QUERY_CANCELED_SQLSTATE = "57014"
+
+
+def is_query_canceled(exc: DBAPIError) -> bool:
+    return getattr(exc.orig, "pgcode", None) == QUERY_CANCELED_SQLSTATE
+
+
+class ReplicaUnavailableError(Exception):
+    """The replica failed mid-request; the request can be retried (on the primary)."""
+
+
+# Seconds the replica is behind the primary. Zero when it has replayed
+# everything it received (an idle primary is not lag) or is not a standby.
+POSTGRES_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReplicaMonitor:
+    """
+    Tracks whether a read replica is reachable and fresh enough to serve reads.
+
+    The check runs at most once per ``check_interval_seconds``; between checks
+    the last verdict is reused, so routing a request costs no extra round trip.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        max_lag_seconds: float,
+        check_interval_seconds: float = 5.0,
+        check_timeout_seconds: float = 1.0
+    ):
+        self.engine = engine
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.check_timeout_seconds = check_timeout_seconds
+        self._usable = False
+        self._checked_at: Optional[float] = None
+
+    async def lag_seconds(self) -> float:
+        async with self.engine.connect() as conn:
+            if conn.dialect.name != "postgresql":
+                await conn.execute(text("SELECT 1"))
+                return 0.0
+            return float((await conn.execute(POSTGRES_LAG_QUERY)).scalar() or 0)
+
+    async def is_usable(self) -> bool:
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval_seconds:
+            return self._usable
+
+        self._checked_at = now
+        try:
+            lag = await asyncio.wait_for(self.lag_seconds(), self.check_timeout_seconds)
+        except (asyncio.TimeoutError, OSError, DBAPIError) as exc:
+            if self._usable:
+                logger.warning("Read replica unavailable, routing reads to primary: %s", exc)
+            self._usable = False
+            return False
+
+        usable = lag <= self.max_lag_seconds
+        if usable != self._usable:
+            if usable:
+                logger.info("Read replica available (lag %.1fs)", lag)
+            else:
+                logger.warning(
+                    "Read replica lag %.1fs exceeds %.1fs, routing reads to primary",
+                    lag, self.max_lag_seconds
+                )
+        self._usable = usable
+        return usable
+
+    def mark_down(self) -> None:
+        """Stop routing to the replica until the next check succeeds."""
+        self._usable = False
+        self._checked_at = time.monotonic()
+
+
+class SessionRouter:
+    """
+    Hands out read sessions on the replica when it is healthy, else the primary.
+
+    Only use for read-only work: writes must go through the primary session
+    so they are visible to the next request.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker,
+        replica: Optional[async_sessionmaker] = None,
+        monitor: Optional[ReplicaMonitor] = None
+    ):
+        self.primary = primary
+        self.replica = replica
+        self.monitor = monitor
+
+    async def reader(self) -> async_sessionmaker:
+        if self.replica is not None and self.monitor is not None and await self.monitor.is_usable():
+            return self.replica
+        return self.primary
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        """
+        A read session for one request, as a context manager so errors
+        raised while it is in use reach it. If the replica fails while the
+        request is using it, the replica is marked down, so the retry goes
+        to the primary, and ReplicaUnavailableError is raised (answered
+        with a 503 and Retry-After).
+        """
+        factory = await self.reader()
+        async with factory() as db:
+            try:
+                yield db
+            except OperationalError as exc:
+                if factory is not self.replica or is_query_canceled(exc):
+                    raise
+                self.monitor.mark_down()
+                logger.warning("Read replica failed mid-request, routing reads to primary: %s", exc)
+                raise ReplicaUnavailableError(str(exc.orig)) from exc
+
+
+class ThreadedSessionRouter:
+    """
+    Runs blocking read-only work on sync sessions in a dedicated thread pool,
+    on the replica when it is healthy, else on the primary.
+
+    For CPU-heavy reads (report ORM hydration, pandas, sync cache calls):
+    none of it runs on the event loop. The pool has one thread per
+    connection the engine can hand out, so work queues for a thread rather
+    than holding one while it waits for a connection. A replica that fails
+    mid-request (other than a statement timeout) is marked down and the
+    work retried once on the primary.
+    """
+
+    def __init__(
+        self,
+        primary: sessionmaker,
+        replica: Optional[sessionmaker] = None,
+        monitor: Optional[ReplicaMonitor] = None,
+        max_workers: int = 4
+    ):
+        self.primary = primary
+        self.replica = replica
+        self.monitor = monitor
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="reports")
+        return self._executor
+
+    async def reader(self) -> sessionmaker:
+        if self.replica is not None and self.monitor is not None and await self.monitor.is_usable():
+            return self.replica
+        return self.primary
+
+    async def run(self, work: Callable[[Session], T]) -> T:
+        factory = await self.reader()
+        try:
+            return await self._run_in_thread(factory, work)
+        except OperationalError as exc:
+            if factory is not self.replica or is_query_canceled(exc):
+                raise
+            self.monitor.mark_down()
+            logger.warning("Read replica failed mid-request, retrying on primary: %s", exc)
+            return await self._run_in_thread(self.primary, work)
+
+    async def _run_in_thread(self, factory: sessionmaker, work: Callable[[Session], T]) -> T:
+        def call() -> T:
+            with factory() as db:
+                return work(db)
+
+        # Copy the context so per-request state (profiling stats) follows the work
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(self.executor, context.run, call)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -1,14 +1,169 @@
+from typing import Any, Dict, Tuple
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.replica import ReplicaMonitor, SessionRouter, ThreadedSessionRouter
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Async drivers for the sync database URLs used in configuration
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
 
 Base = declarative_base()
 
 
+def engine_options(
+    url: str,
+    pool_size: int,
+    max_overflow: int,
+    statement_timeout_ms: int
+) -> Dict[str, Any]:
+    """
+    Pool and connection arguments for an engine on ``url``.
+
+    The statement timeout is set per connection at connect time (PostgreSQL
+    only), so every statement on that pool is cancelled server-side once it
+    runs longer than ``statement_timeout_ms``.
+    """
+    parsed = make_url(url)
+    options: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if parsed.get_backend_name() == "sqlite":
+        return options
+
+    options.update(
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    )
+    if parsed.get_backend_name() == "postgresql" and statement_timeout_ms:
+        if parsed.get_driver_name() == "asyncpg":
+            options["connect_args"] = {
+                "server_settings": {"statement_timeout": str(statement_timeout_ms)}
+            }
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout_ms}"}
+    return options
+
+
+def split_pool(pool_size: int, max_overflow: int) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """
+    Split one (pool_size, max_overflow) budget between the sync and async
+    engines, so together they stay within it. The one exception: each side
+    keeps at least one pooled connection, since pool_size=0 means no limit.
+    """
+    sync_size = max(1, pool_size // 2)
+    sync_overflow = max_overflow // 2
+    return (
+        (sync_size, sync_overflow),
+        (max(1, pool_size - sync_size), max_overflow - sync_overflow)
+    )
+
+
+def to_async_url(url: str) -> str:
+    """Swap the driver of a sync database URL for its async equivalent."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} URLs")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+# DB_POOL_SIZE / DB_MAX_OVERFLOW budget the API's connections per process;
+# sync write endpoints and async read endpoints each get half of it
+(SYNC_POOL_SIZE, SYNC_MAX_OVERFLOW), (ASYNC_POOL_SIZE, ASYNC_MAX_OVERFLOW) = split_pool(
+    settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+)
+
+engine = create_engine(
+    settings.DATABASE_URL,
+    **engine_options(
+        settings.DATABASE_URL,
+        SYNC_POOL_SIZE,
+        SYNC_MAX_OVERFLOW,
+        settings.DB_STATEMENT_TIMEOUT_MS
+    )
+)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+ASYNC_DATABASE_URL = to_async_url(settings.DATABASE_URL)
+
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    **engine_options(
+        ASYNC_DATABASE_URL,
+        ASYNC_POOL_SIZE,
+        ASYNC_MAX_OVERFLOW,
+        settings.DB_STATEMENT_TIMEOUT_MS
+    )
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Reports get their own pool and a longer timeout, so a burst of dashboard
+# reports queues here instead of taking connections from API writes. The
+# pool is sync: reports run in worker threads (see reports_router), since
+# their ORM hydration and pandas work would otherwise block the event loop.
+reports_engine = create_engine(
+    settings.DATABASE_URL,
+    **engine_options(
+        settings.DATABASE_URL,
+        settings.REPORTS_DB_POOL_SIZE,
+        settings.REPORTS_DB_MAX_OVERFLOW,
+        settings.REPORTS_DB_STATEMENT_TIMEOUT_MS
+    )
+)
+ReportsSessionLocal = sessionmaker(autoflush=False, expire_on_commit=False, bind=reports_engine)
+
+ReplicaSessionLocal = None
+ReplicaReportsSessionLocal = None
+replica_monitor = None
+if settings.DATABASE_REPLICA_URL:
+    ASYNC_REPLICA_URL = to_async_url(settings.DATABASE_REPLICA_URL)
+    # Only async reads go to the replica, so it gets the async share
+    replica_engine = create_async_engine(
+        ASYNC_REPLICA_URL,
+        **engine_options(
+            ASYNC_REPLICA_URL,
+            ASYNC_POOL_SIZE,
+            ASYNC_MAX_OVERFLOW,
+            settings.DB_STATEMENT_TIMEOUT_MS
+        )
+    )
+    replica_reports_engine = create_engine(
+        settings.DATABASE_REPLICA_URL,
+        **engine_options(
+            settings.DATABASE_REPLICA_URL,
+            settings.REPORTS_DB_POOL_SIZE,
+            settings.REPORTS_DB_MAX_OVERFLOW,
+            settings.REPORTS_DB_STATEMENT_TIMEOUT_MS
+        )
+    )
+    ReplicaSessionLocal = async_sessionmaker(
+        replica_engine, autoflush=False, expire_on_commit=False
+    )
+    ReplicaReportsSessionLocal = sessionmaker(
+        autoflush=False, expire_on_commit=False, bind=replica_reports_engine
+    )
+    replica_monitor = ReplicaMonitor(
+        replica_engine,
+        max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+        check_interval_seconds=settings.REPLICA_CHECK_INTERVAL_SECONDS
+    )
+
+# Read-only traffic goes to the replica while it is healthy
+read_router = SessionRouter(AsyncSessionLocal, ReplicaSessionLocal, replica_monitor)
+reports_router = ThreadedSessionRouter(
+    ReportsSessionLocal,
+    ReplicaReportsSessionLocal,
+    replica_monitor,
+    max_workers=settings.REPORTS_DB_POOL_SIZE + settings.REPORTS_DB_MAX_OVERFLOW
+)
+
+
 def get_db():
     """Dependency for getting database session."""
     db = SessionLocal()
@@ -16,3 +171,20 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency for getting an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db():
+    """Dependency for a read-only async session (replica when available)."""
+    async with read_router.session() as db:
+        yield db
+
+
+def get_reports_router() -> ThreadedSessionRouter:
+    """Dependency for running read-only report work on the reports pool."""
+    return reports_router
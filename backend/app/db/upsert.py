@@ -0,0 +1,15 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def upsert_insert(db: Session, table):
+    """
+    Return a dialect-specific INSERT supporting ``on_conflict_do_update``.
+
+    Production runs on PostgreSQL; SQLite is accepted so the same code path
+    works against the throwaway databases used in tests.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
@@ -1,13 +1,62 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import OperationalError
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.core.profiling import ProfilingMiddleware, metrics
+from app.db.replica import ReplicaUnavailableError, is_query_canceled
+from app.db.session import engine, reports_router
+from app.services.partitions import premake_partitions
+from app.services.report_jobs import report_job_queue
+
+logger = logging.getLogger(__name__)
+
+
+async def premake_partitions_now() -> None:
+    """Keep PARTITION_PREMAKE_MONTHS of sales/paid_ads partitions ahead of today."""
+    try:
+        created = await run_in_threadpool(premake_partitions, engine)
+        if any(created.values()):
+            logger.info("Premade partitions: %s", created)
+    except Exception:
+        logger.exception("Premaking partitions failed; new rows fall into the DEFAULT partition")
+
+
+async def premake_partitions_periodically(interval_seconds: float) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await premake_partitions_now()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    premake = None
+    if settings.PARTITION_PREMAKE_INTERVAL_HOURS > 0:
+        await premake_partitions_now()
+        premake = asyncio.create_task(
+            premake_partitions_periodically(settings.PARTITION_PREMAKE_INTERVAL_HOURS * 3600)
+        )
+    yield
+    if premake is not None:
+        premake.cancel()
+    # Stop the report worker processes and threads with the app, rather
+    # than leaving them to interpreter exit
+    report_job_queue.shutdown()
+    reports_router.shutdown()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     version="1.0.0",
-    description="Enterprise ERP system for textile manufacturing and garment production management"
+    description="Enterprise ERP system for textile manufacturing and garment production management",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -17,8 +66,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Opt-in request profiling: Server-Timing headers, N+1 warnings and
+# Prometheus metrics at /metrics
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+    app.add_route("/metrics", metrics, include_in_schema=False)
+
+
+@app.exception_handler(OperationalError)
+async def statement_timeout_handler(request: Request, exc: OperationalError):
+    if is_query_canceled(exc):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "The database query took too long and was cancelled"}
+        )
+    raise exc
+
+
+@app.exception_handler(ReplicaUnavailableError)
+async def replica_unavailable_handler(request: Request, exc: ReplicaUnavailableError):
+    # Reads are already routed to the primary, so the retry can come at once
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "The read replica became unavailable; retry the request"},
+        headers={"Retry-After": "1"}
+    )
+
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -1,7 +1,7 @@
-from typing import Optional, List
+from typing import Literal, Optional, List
 from datetime import datetime
 from decimal import Decimal
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class GarmentBase(BaseModel):
@@ -66,3 +66,61 @@ class Inventory(InventoryBase):
 
     class Config:
         from_attributes = True
+
+
+class InventoryCount(BaseModel):
+    garment_id: int
+    size: str = Field(max_length=20)
+    good_stock: int = Field(ge=0)
+    virtual_stock: Optional[int] = Field(default=None, ge=0)
+    warehouse_location: Optional[str] = Field(default=None, max_length=100)
+
+
+class StockLevels(BaseModel):
+    good_stock: int
+    virtual_stock: int
+
+
+class InventoryCountDiff(BaseModel):
+    row: int
+    garment_id: int
+    size: str
+    previous: Optional[StockLevels] = None
+    current: StockLevels
+    good_stock_delta: int
+    virtual_stock_delta: int
+
+
+class InventoryCountRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class BulkInventoryResult(BaseModel):
+    received: int
+    created: int
+    updated: int
+    unchanged: int
+    rejected: int
+    errors: List[InventoryCountRowError]
+    diffs: List[InventoryCountDiff]
+
+
+class StockMovementCreate(BaseModel):
+    movement_type: Literal["RECEIPT", "ISSUE", "RESERVE", "RELEASE"]
+    quantity: int = Field(gt=0)
+    reference: Optional[str] = Field(default=None, max_length=100)
+
+
+class StockMovement(BaseModel):
+    id: int
+    inventory_id: int
+    movement_type: str
+    good_stock_delta: int
+    virtual_stock_delta: int
+    sale_id: Optional[int] = None
+    reference: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
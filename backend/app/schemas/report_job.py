@@ -0,0 +1,25 @@
+from typing import Any, Dict, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class ReportJobCreate(BaseModel):
+    report: str  # ReportsService method, e.g. settlement_report
+    params: Dict[str, Any] = {}
+
+
+class ReportJob(BaseModel):
+    id: int
+    report: str
+    params: Dict[str, Any]
+    status: str
+    progress: int
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
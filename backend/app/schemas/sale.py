@@ -0,0 +1,41 @@
+from typing import Optional, List
+from datetime import date, datetime
+from decimal import Decimal
+from pydantic import BaseModel
+
+
+class SaleBase(BaseModel):
+    transaction_date: date
+    garment_id: int
+    panel_id: int
+    size: str
+    quantity: int
+    unit_price: Decimal
+    discount_percentage: Decimal = Decimal(0)
+    total_amount: Decimal
+    is_return: bool = False
+    invoice_number: Optional[str] = None
+
+
+class SaleCreate(SaleBase):
+    pass
+
+
+class SaleSchema(SaleBase):
+    id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class BulkSaleRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class BulkSaleResult(BaseModel):
+    received: int
+    inserted: int
+    rejected: int
+    errors: List[BulkSaleRowError]
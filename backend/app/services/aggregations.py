@@ -0,0 +1,92 @@
+from datetime import date
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import func, and_, select
+from app.db.models import Garment, Inventory, Sale
+
+
+class SalesVelocityAggregator:
+    """
+    Set-based sales velocity for every inventory (garment_id, size) pair.
+
+    Sales are summed once per garment-size in a grouped subquery and joined
+    to Inventory and Garment, so a report costs one round trip no matter how
+    large the catalogue is.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def units_sold_subquery(self, start_date: date):
+        """Units sold (returns excluded) per garment-size since start_date"""
+        return (
+            select(
+                Sale.garment_id,
+                Sale.size,
+                func.sum(Sale.quantity).label("units_sold")
+            )
+            .where(
+                and_(
+                    Sale.transaction_date >= start_date,
+                    Sale.is_return == False
+                )
+            )
+            .group_by(Sale.garment_id, Sale.size)
+            .subquery()
+        )
+
+    def velocity_query(
+        self,
+        start_date: date,
+        days_period: int,
+        max_rate: Optional[float] = None,
+        min_rate: Optional[float] = None,
+        min_stock: Optional[int] = None
+    ):
+        """
+        Inventory rows with their units sold in the period, as a query.
+
+        Rate thresholds are in units/day and are compared against
+        ``units_sold`` scaled by ``days_period`` so the filter runs in SQL.
+        Each row exposes garment_id, size, good_stock, virtual_stock,
+        garment_name, style_sku and units_sold.
+        """
+        sold = self.units_sold_subquery(start_date)
+        units_sold = func.coalesce(sold.c.units_sold, 0)
+
+        query = (
+            self.db.query(
+                Inventory.garment_id,
+                Inventory.size,
+                Inventory.good_stock,
+                Inventory.virtual_stock,
+                Garment.name.label("garment_name"),
+                Garment.style_sku,
+                units_sold.label("units_sold")
+            )
+            .outerjoin(
+                sold,
+                and_(
+                    sold.c.garment_id == Inventory.garment_id,
+                    sold.c.size == Inventory.size
+                )
+            )
+            .outerjoin(Garment, Garment.id == Inventory.garment_id)
+        )
+
+        if max_rate is not None:
+            query = query.filter(units_sold < max_rate * days_period)
+        if min_rate is not None:
+            query = query.filter(units_sold > min_rate * days_period)
+        if min_stock is not None:
+            query = query.filter(Inventory.good_stock > min_stock)
+
+        return query
+
+    def velocity_rows(self, start_date: date, days_period: int, **thresholds) -> List:
+        """Return the rows of ``velocity_query`` in inventory order."""
+        return self.velocity_query(start_date, days_period, **thresholds).order_by(Inventory.id).all()
+
+    def velocity_count(self, start_date: date, days_period: int, **thresholds) -> int:
+        """Count the rows of ``velocity_query`` without fetching them."""
+        return self.velocity_query(start_date, days_period, **thresholds).count()
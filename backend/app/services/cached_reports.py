@@ -0,0 +1,66 @@
+import inspect
+from functools import wraps
+from typing import Any, Dict, Tuple
+from app.core.cache import ReportCache, report_cache
+from app.core.config import settings
+from app.services.reports import ReportsService
+
+# Report name -> (TTL in seconds, invalidation tags). Tags name the tables a
+# report reads; CRUD endpoints invalidate the tag of the table they write.
+REPORT_CACHE_POLICIES: Dict[str, Tuple[int, Tuple[str, ...]]] = {
+    "fabric_stock_sheet_total": (settings.REPORT_CACHE_DEFAULT_TTL, ("fabrics",)),
+    "fabric_stock_sheet_by_type": (settings.REPORT_CACHE_DEFAULT_TTL, ("fabrics",)),
+    "fabric_stock_sheet_by_period": (settings.REPORT_CACHE_DEFAULT_TTL, ("fabrics",)),
+    "fabric_cost_sheet": (settings.REPORT_CACHE_DEFAULT_TTL, ("fabrics",)),
+    "fabric_stock_summary": (settings.REPORT_CACHE_DEFAULT_TTL, ("fabrics",)),
+    "daily_sales_report": (60, ("sales",)),
+    "daily_sales_summary": (60, ("sales",)),
+    "daily_sales_report_single_sku": (60, ("sales", "garments")),
+    "panel_wise_sales_report": (settings.REPORT_CACHE_DEFAULT_TTL, ("sales", "panels")),
+    "inactive_panel_report": (900, ("sales", "panels")),
+    "slow_moving_inventory_report": (900, ("sales", "inventory", "garments")),
+    "fast_moving_inventory_report": (900, ("sales", "inventory", "garments")),
+    "inventory_classification_report": (900, ("sales", "inventory", "garments")),
+    "slow_moving_count": (900, ("sales", "inventory")),
+    "fast_moving_count": (900, ("sales", "inventory")),
+    "production_plan_report": (settings.REPORT_CACHE_DEFAULT_TTL, ("production", "garments")),
+    "production_plan_summary": (settings.REPORT_CACHE_DEFAULT_TTL, ("production",)),
+    "daily_production_variance_report": (settings.REPORT_CACHE_DEFAULT_TTL, ("production",)),
+    "purchase_raise_for_yarn_report": (900, ("yarns", "production", "forecasts")),
+    "yarn_forecast_report": (900, ("yarns", "production", "forecasts")),
+    "bundle_sku_sales_report": (settings.REPORT_CACHE_DEFAULT_TTL, ("sales", "garments")),
+    "discount_report_general": (settings.REPORT_CACHE_DEFAULT_TTL, ("sales", "garments")),
+    "discount_report_by_panel": (settings.REPORT_CACHE_DEFAULT_TTL, ("sales", "garments", "panels")),
+    "settlement_report": (settings.REPORT_CACHE_DEFAULT_TTL, ("sales", "panels")),
+}
+
+
+class CachedReportsService:
+    """
+    Drop-in front for ReportsService that serves results from the report
+    cache. Methods without a cache policy pass straight through.
+    """
+
+    def __init__(self, service: ReportsService, cache: ReportCache = report_cache):
+        self.service = service
+        self.cache = cache
+
+    def __getattr__(self, name: str) -> Any:
+        method = getattr(self.service, name)
+        policy = REPORT_CACHE_POLICIES.get(name)
+        if policy is None or not callable(method):
+            return method
+
+        ttl, tags = policy
+        signature = inspect.signature(method)
+
+        @wraps(method)
+        def cached(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = {**bound.arguments, "use_rollup": self.service.use_rollup}
+            return self.cache.get_or_compute(
+                name, params, lambda: method(*args, **kwargs), ttl, tags
+            )
+
+        return cached
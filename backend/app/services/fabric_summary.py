@@ -0,0 +1,62 @@
+import logging
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from typing import Union
+from app.core.cache import report_cache
+from app.db.models import Fabric, fabric_stock_totals
+
+logger = logging.getLogger(__name__)
+
+
+class FabricSummaryService:
+    """Reads and refreshes the per (fabric_type, gsm, color) stock totals"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _is_materialized(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    def totals(self):
+        """
+        Selectable with fabric_type, gsm, color, fabric_count,
+        stock_quantity and stock_value columns: the fabric_stock_totals
+        materialized view on PostgreSQL, the same GROUP BY computed live on
+        other databases (SQLite in tests).
+        """
+        if self._is_materialized():
+            return fabric_stock_totals
+        return select(
+            Fabric.fabric_type,
+            Fabric.gsm,
+            Fabric.color,
+            func.count(Fabric.id).label("fabric_count"),
+            func.sum(Fabric.stock_quantity).label("stock_quantity"),
+            func.sum(Fabric.stock_quantity * func.coalesce(Fabric.cost_per_unit, 0)).label("stock_value")
+        ).group_by(Fabric.fabric_type, Fabric.gsm, Fabric.color).subquery("fabric_stock_totals")
+
+    def refresh(self) -> None:
+        """
+        Recompute the materialized view. CONCURRENTLY keeps it readable by
+        reports while the refresh runs. No-op where totals are computed live.
+        """
+        if not self._is_materialized():
+            return
+        self.db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY fabric_stock_totals"))
+        self.db.commit()
+
+
+def refresh_fabric_summary(bind: Union[Engine, Connection]) -> None:
+    """
+    Background task queued by the fabric write endpoints. Cached fabric
+    reports are dropped again once the view is current, so none computed
+    from the old totals in the meantime outlives the refresh.
+    """
+    try:
+        with Session(bind=bind) as db:
+            FabricSummaryService(db).refresh()
+    except Exception:
+        logger.exception("Refreshing fabric_stock_totals failed; fabric reports may be stale")
+        return
+    report_cache.invalidate("fabrics")
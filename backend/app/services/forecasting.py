@@ -0,0 +1,217 @@
+import logging
+from datetime import date, timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models import DemandForecast, ProductionPlan, Sale, SalesDailyRollup
+
+logger = logging.getLogger(__name__)
+
+# Candidate smoothing factors; each series keeps the one with the lowest
+# one-step-ahead squared error over its history.
+SMOOTHING_ALPHAS = np.round(np.linspace(0.05, 0.95, 19), 2)
+# Days averaged for the initial level, so sparse series do not start at zero
+INITIAL_LEVEL_DAYS = 7
+# Plans still to consume their yarn
+OPEN_PLAN_STATUSES = ("PLANNED", "IN_PROGRESS")
+# Days of prophet forecast averaged into the stored daily rate
+PROPHET_HORIZON_DAYS = 30
+
+
+def fit_exponential_smoothing(history: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simple exponential smoothing fitted to many series at once.
+
+    ``history`` is a (series, days) array of daily demand. Every candidate
+    alpha is run for every series in a single pass over the days, and each
+    series keeps the alpha with the lowest one-step-ahead squared error.
+    Returns the final level (the flat daily forecast) and chosen alpha per
+    series.
+    """
+    series_count, day_count = history.shape
+    alphas = SMOOTHING_ALPHAS[:, None]
+    initial = history[:, :INITIAL_LEVEL_DAYS].mean(axis=1)
+    level = np.repeat(initial[None, :], len(SMOOTHING_ALPHAS), axis=0)
+    squared_error = np.zeros_like(level)
+    for day in range(day_count):
+        error = history[:, day] - level
+        squared_error += error ** 2
+        level += alphas * error
+
+    best = squared_error.argmin(axis=0)
+    columns = np.arange(series_count)
+    return level[best, columns], SMOOTHING_ALPHAS[best]
+
+
+def fit_prophet(start_date: date, series: np.ndarray) -> float:
+    """Mean daily demand prophet predicts for the next PROPHET_HORIZON_DAYS."""
+    from prophet import Prophet
+
+    frame = pd.DataFrame({
+        "ds": pd.date_range(start_date, periods=len(series), freq="D"),
+        "y": series,
+    })
+    model = Prophet(weekly_seasonality=True, yearly_seasonality=False, daily_seasonality=False)
+    model.fit(frame)
+    future = model.make_future_dataframe(periods=PROPHET_HORIZON_DAYS, include_history=False)
+    return float(np.clip(model.predict(future)["yhat"].to_numpy(), 0, None).mean())
+
+
+class DemandForecastService:
+    """
+    Garment demand forecasts and the yarn requirements derived from them.
+
+    ``refresh`` fits every garment's daily sales history in one batch and
+    stores the result in demand_forecasts; reports only read that table.
+    """
+
+    def __init__(self, db: Session, use_rollup: Optional[bool] = None):
+        self.db = db
+        self.use_rollup = settings.USE_SALES_ROLLUP if use_rollup is None else use_rollup
+
+    def load_history(self, start_date: date, end_date: date) -> pd.DataFrame:
+        """Daily units sold (returns excluded) as a garment x day frame."""
+        source = SalesDailyRollup if self.use_rollup else Sale
+        result = self.db.execute(
+            select(source.garment_id, source.transaction_date, func.sum(source.quantity).label("units"))
+            .where(
+                source.transaction_date >= start_date,
+                source.transaction_date <= end_date,
+                source.is_return == False
+            )
+            .group_by(source.garment_id, source.transaction_date)
+        )
+        rows = pd.DataFrame.from_records(result.all(), columns=list(result.keys()))
+        days = pd.date_range(start_date, end_date, freq="D")
+        if rows.empty:
+            return pd.DataFrame(columns=days, dtype="float64")
+        rows["transaction_date"] = pd.to_datetime(rows["transaction_date"])
+        return (
+            rows.pivot_table(index="garment_id", columns="transaction_date", values="units",
+                             aggfunc="sum", fill_value=0)
+            .reindex(columns=days, fill_value=0)
+            .astype("float64")
+        )
+
+    def refresh(
+        self,
+        history_days: Optional[int] = None,
+        method: Optional[str] = None,
+        end_date: Optional[date] = None
+    ) -> int:
+        """
+        Refit every garment with sales in the last ``history_days`` and
+        replace the stored forecasts. Returns the number of garments fitted.
+        """
+        history_days = history_days or settings.FORECAST_HISTORY_DAYS
+        method = method or settings.FORECAST_METHOD
+        end_date = end_date or date.today() - timedelta(days=1)
+        start_date = end_date - timedelta(days=history_days - 1)
+
+        history = self.load_history(start_date, end_date)
+        levels, alphas = fit_exponential_smoothing(history.to_numpy())
+        rows = [
+            {
+                "garment_id": int(garment_id),
+                "method": "exponential_smoothing",
+                "daily_units": round(float(level), 4),
+                "smoothing_alpha": float(alpha),
+                "history_days": history_days,
+            }
+            for garment_id, level, alpha in zip(history.index, levels, alphas)
+        ]
+
+        if method == "prophet":
+            try:
+                for row, series in zip(rows, history.to_numpy()):
+                    row.update(
+                        method="prophet",
+                        daily_units=round(fit_prophet(start_date, series), 4),
+                        smoothing_alpha=None
+                    )
+            except ImportError:
+                logger.warning("prophet is not installed; keeping exponential smoothing forecasts")
+
+        self.db.execute(delete(DemandForecast))
+        if rows:
+            self.db.execute(insert(DemandForecast), rows)
+        self.db.commit()
+        return len(rows)
+
+    def forecasts(self) -> Dict[int, float]:
+        """Stored daily unit forecast per garment."""
+        return {
+            garment_id: float(daily_units)
+            for garment_id, daily_units in self.db.execute(
+                select(DemandForecast.garment_id, DemandForecast.daily_units)
+            )
+        }
+
+    def fitted_at(self) -> Optional[str]:
+        fitted_at = self.db.scalar(select(func.max(DemandForecast.fitted_at)))
+        return fitted_at.isoformat() if fitted_at else None
+
+    def yarn_demand(self, days_forecast: int, start_date: Optional[date] = None) -> Dict[int, Dict[str, float]]:
+        """
+        Yarn required per yarn over the next ``days_forecast`` days.
+
+        Committed demand is the yarn_requirement of open plans due in the
+        window. Forecast garment units not already covered by those plans
+        are converted to yarn with each garment's historical yarn per unit
+        (yarn_requirement / planned_quantity over its plans).
+        """
+        start_date = start_date or date.today()
+        end_date = start_date + timedelta(days=days_forecast)
+
+        planned_units = dict(self.db.execute(
+            select(ProductionPlan.garment_id, func.sum(ProductionPlan.planned_quantity))
+            .where(ProductionPlan.yarn_id.is_not(None), ProductionPlan.yarn_requirement.is_not(None))
+            .group_by(ProductionPlan.garment_id)
+        ).all())
+        yarn_per_unit: Dict[Tuple[int, int], float] = {}
+        for garment_id, yarn_id, requirement in self.db.execute(
+            select(ProductionPlan.garment_id, ProductionPlan.yarn_id, func.sum(ProductionPlan.yarn_requirement))
+            .where(ProductionPlan.yarn_id.is_not(None), ProductionPlan.yarn_requirement.is_not(None))
+            .group_by(ProductionPlan.garment_id, ProductionPlan.yarn_id)
+        ):
+            if planned_units.get(garment_id):
+                yarn_per_unit[garment_id, yarn_id] = float(requirement) / planned_units[garment_id]
+
+        open_plans = (
+            select(
+                ProductionPlan.garment_id,
+                ProductionPlan.yarn_id,
+                func.sum(ProductionPlan.planned_quantity).label("units"),
+                func.sum(func.coalesce(ProductionPlan.yarn_requirement, 0)).label("yarn")
+            )
+            .where(
+                ProductionPlan.status.in_(OPEN_PLAN_STATUSES),
+                ProductionPlan.target_date >= start_date,
+                ProductionPlan.target_date <= end_date
+            )
+            .group_by(ProductionPlan.garment_id, ProductionPlan.yarn_id)
+        )
+        demand: Dict[int, Dict[str, float]] = {}
+        covered_units: Dict[int, float] = {}
+        for row in self.db.execute(open_plans):
+            covered_units[row.garment_id] = covered_units.get(row.garment_id, 0) + float(row.units)
+            if row.yarn_id is not None:
+                entry = demand.setdefault(row.yarn_id, {"committed": 0.0, "forecast": 0.0})
+                entry["committed"] += float(row.yarn)
+
+        forecasts = self.forecasts()
+        for (garment_id, yarn_id), per_unit in yarn_per_unit.items():
+            uncovered = max(0.0, forecasts.get(garment_id, 0.0) * days_forecast - covered_units.get(garment_id, 0.0))
+            if uncovered:
+                entry = demand.setdefault(yarn_id, {"committed": 0.0, "forecast": 0.0})
+                entry["forecast"] += uncovered * per_unit
+
+        for entry in demand.values():
+            entry["total"] = entry["committed"] + entry["forecast"]
+            entry["avg_daily"] = entry["total"] / days_forecast if days_forecast else 0.0
+        return demand
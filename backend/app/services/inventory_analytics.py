@@ -0,0 +1,167 @@
+from datetime import date, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import Session
+
+from app.db.models import Garment, Inventory, Sale, SalesDailyRollup
+
+# Cumulative revenue share (of the items ranked above) below which an item
+# is class A, then B; the rest is C.
+ABC_THRESHOLDS = (0.8, 0.95)
+# Coefficient of variation of bucketed demand up to which an item is class
+# X, then Y; the rest (including items with no demand) is Z.
+XYZ_THRESHOLDS = (0.5, 1.0)
+
+KEY_COLUMNS = ["garment_id", "size"]
+
+
+class InventoryAnalytics:
+    """
+    Columnar inventory analytics over every garment-size.
+
+    Sales (grouped per garment-size and day) and inventory are each loaded
+    with one query into a DataFrame; velocity, demand variability, ABC/XYZ
+    classes and days of cover are then computed in vectorized operations
+    rather than per row.
+    """
+
+    def __init__(self, db: Session, use_rollup: bool = False):
+        self.db = db
+        self.use_rollup = use_rollup
+
+    def _frame(self, statement) -> pd.DataFrame:
+        result = self.db.execute(statement)
+        return pd.DataFrame.from_records(result.all(), columns=list(result.keys()))
+
+    def load_sales(self, start_date: date, end_date: date) -> pd.DataFrame:
+        """Daily units sold and net revenue per garment-size in the period."""
+        source = SalesDailyRollup if self.use_rollup else Sale
+        units = func.sum(case((source.is_return == False, source.quantity), else_=0))
+        revenue = func.sum(case((source.is_return == True, -source.total_amount), else_=source.total_amount))
+        statement = (
+            select(
+                source.garment_id,
+                source.size,
+                source.transaction_date,
+                units.label("units"),
+                revenue.label("revenue")
+            )
+            .where(source.transaction_date >= start_date, source.transaction_date <= end_date)
+            .group_by(source.garment_id, source.size, source.transaction_date)
+        )
+        frame = self._frame(statement)
+        return frame.astype({"units": "int64", "revenue": "float64"}) if len(frame) else frame
+
+    def load_inventory(self) -> pd.DataFrame:
+        """Stock levels and garment details for every inventory row."""
+        return self._frame(
+            select(
+                Inventory.garment_id,
+                Inventory.size,
+                Garment.style_sku,
+                Garment.name.label("garment_name"),
+                Inventory.good_stock,
+                Inventory.virtual_stock
+            )
+            .outerjoin(Garment, Garment.id == Inventory.garment_id)
+            .order_by(Inventory.garment_id, Inventory.size)
+        )
+
+    def classify(
+        self,
+        days_period: int = 90,
+        bucket_days: int = 7,
+        end_date: Optional[date] = None,
+        abc_thresholds: Tuple[float, float] = ABC_THRESHOLDS,
+        xyz_thresholds: Tuple[float, float] = XYZ_THRESHOLDS
+    ) -> pd.DataFrame:
+        """
+        One row per inventory garment-size with units_sold, revenue,
+        velocity_per_day, demand_cv, abc_class, xyz_class and days_of_cover
+        (NaN when nothing sold). Demand variability is measured over
+        ``bucket_days`` buckets of the period.
+        """
+        end_date = end_date or date.today()
+        start_date = end_date - timedelta(days=days_period - 1)
+        inventory = self.load_inventory()
+        sales = self.load_sales(start_date, end_date)
+        bucket_count = -(-days_period // bucket_days)
+
+        if len(sales):
+            day_offsets = (pd.to_datetime(sales["transaction_date"]) - pd.Timestamp(start_date)).dt.days
+            sales["bucket"] = day_offsets // bucket_days
+            demand = (
+                sales.groupby(KEY_COLUMNS + ["bucket"])["units"].sum()
+                .unstack(fill_value=0)
+                .reindex(columns=range(bucket_count), fill_value=0)
+            )
+            mean = demand.mean(axis=1)
+            totals = sales.groupby(KEY_COLUMNS).agg(units_sold=("units", "sum"), revenue=("revenue", "sum"))
+            totals["demand_cv"] = (demand.std(axis=1, ddof=0) / mean).where(mean > 0)
+            frame = inventory.merge(totals.reset_index(), on=KEY_COLUMNS, how="left")
+        else:
+            frame = inventory.assign(units_sold=0, revenue=0.0, demand_cv=np.nan)
+
+        frame["units_sold"] = frame["units_sold"].fillna(0).astype("int64")
+        frame["revenue"] = frame["revenue"].fillna(0.0).astype("float64")
+        frame["demand_cv"] = frame["demand_cv"].astype("float64")
+        frame["velocity_per_day"] = frame["units_sold"] / days_period
+        frame["days_of_cover"] = (frame["good_stock"] / frame["velocity_per_day"]).where(
+            frame["velocity_per_day"] > 0
+        )
+
+        # ABC: rank by revenue and classify on the share held by higher-ranked items
+        frame = frame.sort_values("revenue", ascending=False, kind="stable").reset_index(drop=True)
+        positive_revenue = frame["revenue"].clip(lower=0)
+        total_revenue = positive_revenue.sum()
+        share_above = (
+            (positive_revenue.cumsum() - positive_revenue) / total_revenue
+            if total_revenue > 0 else pd.Series(1.0, index=frame.index)
+        )
+        frame["abc_class"] = np.select(
+            [positive_revenue <= 0, share_above < abc_thresholds[0], share_above < abc_thresholds[1]],
+            ["C", "A", "B"],
+            default="C"
+        )
+        frame["xyz_class"] = np.select(
+            [frame["demand_cv"] <= xyz_thresholds[0], frame["demand_cv"] <= xyz_thresholds[1]],
+            ["X", "Y"],
+            default="Z"
+        )
+        return frame
+
+    def classification_report(self, days_period: int = 90, bucket_days: int = 7) -> Dict[str, Any]:
+        """ABC/XYZ classification report with the class matrix and item rows."""
+        frame = self.classify(days_period, bucket_days)
+        matrix = (
+            (frame["abc_class"] + frame["xyz_class"]).value_counts()
+            .reindex([a + x for a in "ABC" for x in "XYZ"], fill_value=0)
+        )
+        items = frame.assign(
+            velocity_per_day=frame["velocity_per_day"].round(3),
+            demand_cv=frame["demand_cv"].round(3),
+            days_of_cover=frame["days_of_cover"].round(1),
+            revenue=frame["revenue"].round(2)
+        )
+        # NaN (no demand) becomes None so the rows serialize as JSON null
+        records = items.astype(object).where(items.notna(), None).to_dict("records")
+        return {
+            "period_days": days_period,
+            "bucket_days": bucket_days,
+            "criteria": {
+                "abc": f"A up to {ABC_THRESHOLDS[0]:.0%} of revenue, B up to {ABC_THRESHOLDS[1]:.0%}, C the rest",
+                "xyz": f"X if demand CV <= {XYZ_THRESHOLDS[0]}, Y if <= {XYZ_THRESHOLDS[1]}, Z otherwise"
+            },
+            "item_count": len(frame),
+            "total_revenue": round(float(frame["revenue"].sum()), 2),
+            "class_matrix": {key: int(count) for key, count in matrix.items()},
+            "items": [_to_python(record) for record in records]
+        }
+
+
+def _to_python(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace NumPy scalars with built-in types for JSON encoding."""
+    return {key: value.item() if isinstance(value, np.generic) else value for key, value in record.items()}
@@ -0,0 +1,70 @@
+from typing import Any, Dict, Iterable, Mapping
+from sqlalchemy.orm import Session
+from sqlalchemy import case, delete, func, insert, select
+from app.db.models import PaidAd, Panel, PanelActivity, Sale
+from app.db.upsert import upsert_insert
+
+
+class PanelActivityService:
+    """Maintains the panel_activity summary (latest sale and ad date per panel)"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record_sales(self, sales: Iterable[Mapping[str, Any]]) -> int:
+        """Advance last_sale_date for newly written sale rows; same transaction as the INSERTs."""
+        return self._record("last_sale_date", ((s["panel_id"], s["transaction_date"]) for s in sales))
+
+    def record_ads(self, ads: Iterable[Mapping[str, Any]]) -> int:
+        """Advance last_ad_date for newly written paid ad rows; same transaction as the INSERTs."""
+        return self._record("last_ad_date", ((a["panel_id"], a["ad_date"]) for a in ads))
+
+    def _record(self, column: str, dates: Iterable) -> int:
+        """
+        Upsert the latest date per panel. The stored date only moves
+        forward, so back-dated writes and concurrent writers never move it
+        back. Returns the number of panels touched.
+        """
+        latest: Dict[int, Any] = {}
+        for panel_id, day in dates:
+            if panel_id not in latest or day > latest[panel_id]:
+                latest[panel_id] = day
+        if not latest:
+            return 0
+
+        stmt = upsert_insert(self.db, PanelActivity)
+        current, new = getattr(PanelActivity, column), getattr(stmt.excluded, column)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["panel_id"],
+            set_={
+                column: case((current.is_(None), new), (new > current, new), else_=current),
+                "updated_at": func.now()
+            }
+        )
+        self.db.execute(stmt, [{"panel_id": k, column: v} for k, v in latest.items()])
+        return len(latest)
+
+    def rebuild(self) -> int:
+        """
+        Recompute the summary from raw sales and ads. Used for backfills
+        and after bulk loads that bypass the write hooks. Returns rows written.
+        """
+        last_sale = select(
+            Sale.panel_id, func.max(Sale.transaction_date).label("last_sale_date")
+        ).group_by(Sale.panel_id).subquery()
+        last_ad = select(
+            PaidAd.panel_id, func.max(PaidAd.ad_date).label("last_ad_date")
+        ).group_by(PaidAd.panel_id).subquery()
+
+        self.db.execute(delete(PanelActivity))
+        result = self.db.execute(
+            insert(PanelActivity).from_select(
+                ["panel_id", "last_sale_date", "last_ad_date"],
+                select(Panel.id, last_sale.c.last_sale_date, last_ad.c.last_ad_date)
+                .outerjoin(last_sale, last_sale.c.panel_id == Panel.id)
+                .outerjoin(last_ad, last_ad.c.panel_id == Panel.id)
+                .where(last_sale.c.last_sale_date.is_not(None) | last_ad.c.last_ad_date.is_not(None))
+            )
+        )
+        self.db.commit()
+        return result.rowcount
@@ -0,0 +1,320 @@
+"""
+Monthly range partitioning of the append-only fact tables (PostgreSQL only).
+
+``sales`` is partitioned on ``transaction_date`` and ``paid_ads`` on
+``ad_date``. Each table has one partition per calendar month plus a DEFAULT
+partition that catches rows outside every monthly range, so inserts never
+fail when the premake job is late. Old months are exported to Parquet and
+dropped; ``sales_daily_rollup`` keeps their totals for long-range reports,
+and ``partition_archives`` records the first month still in the database so
+the rollup is never rebuilt from the missing rows.
+"""
+import os
+import re
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Union
+
+from sqlalchemy import Boolean, Date, DateTime, Integer, Numeric, String, Text, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import Base
+import app.db.models  # noqa: F401  (registers the tables on Base.metadata)
+
+# Partitioned table -> partition key column
+PARTITIONED_TABLES = {
+    "sales": "transaction_date",
+    "paid_ads": "ad_date",
+}
+LEGACY_SUFFIX = "_unpartitioned"
+ARCHIVE_BATCH_ROWS = 50000
+# pg advisory lock key, so only one app process premakes partitions at a time
+PREMAKE_LOCK_KEY = 7204001
+
+BOUND_PATTERN = re.compile(r"FROM \('(\d{4}-\d{2}-\d{2})'\) TO \('(\d{4}-\d{2}-\d{2})'\)")
+
+
+class Partition(NamedTuple):
+    name: str
+    start: date
+    end: date  # exclusive
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    month_index = day.year * 12 + day.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year:04d}m{month.month:02d}"
+
+
+class PartitionManager:
+    """Creates, backfills and archives the monthly partitions"""
+
+    def __init__(self, db: Union[Session, Connection]):
+        self.db = db
+
+    def _execute(self, statement, params: Optional[Dict[str, Any]] = None):
+        if isinstance(statement, str):
+            statement = text(statement)
+        return self.db.execute(statement, params or {})
+
+    def _commit(self) -> None:
+        # Migrations pass their Connection and own the transaction
+        if isinstance(self.db, Session):
+            self.db.commit()
+
+    def _table_exists(self, name: str) -> bool:
+        return self._execute("SELECT to_regclass(:name) IS NOT NULL", {"name": name}).scalar()
+
+    def _columns(self, table: str) -> str:
+        rows = self._execute(
+            """
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = :table
+            ORDER BY ordinal_position
+            """,
+            {"table": table}
+        )
+        return ", ".join(row[0] for row in rows)
+
+    def is_partitioned(self, table: str) -> bool:
+        return self._execute(
+            """
+            SELECT EXISTS (
+                SELECT 1 FROM pg_partitioned_table pt
+                JOIN pg_class c ON c.oid = pt.partrelid
+                WHERE c.relname = :table AND pg_table_is_visible(c.oid)
+            )
+            """,
+            {"table": table}
+        ).scalar()
+
+    def partitions(self, table: str) -> List[Partition]:
+        """Monthly partitions of ``table`` ordered by range (DEFAULT excluded)."""
+        rows = self._execute(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE p.relname = :table AND pg_table_is_visible(p.oid)
+            """,
+            {"table": table}
+        )
+        found = []
+        for name, bound in rows:
+            match = BOUND_PATTERN.search(bound)
+            if match:
+                found.append(Partition(
+                    name, date.fromisoformat(match.group(1)), date.fromisoformat(match.group(2))
+                ))
+        return sorted(found, key=lambda partition: partition.start)
+
+    # ==================== MAINTENANCE ====================
+
+    def ensure_partitions(self, table: str, start: date, end: date) -> List[str]:
+        """
+        Create the monthly partitions of ``table`` for every month from
+        ``start`` to ``end`` inclusive. Returns the names created.
+
+        Rows that already landed in the DEFAULT partition for a new month
+        are moved into it, since PostgreSQL refuses to create a partition
+        whose range the DEFAULT partition already holds.
+        """
+        key = PARTITIONED_TABLES[table]
+        default = f"{table}_default"
+        existing = {partition.name for partition in self.partitions(table)}
+        created = []
+        month = month_start(start)
+        while month <= end:
+            name = partition_name(table, month)
+            following = add_months(month, 1)
+            if name not in existing:
+                bounds = f"FROM ('{month.isoformat()}') TO ('{following.isoformat()}')"
+                in_range = {"start": month, "end": following}
+                stranded = self._execute(
+                    f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {key} >= :start AND {key} < :end)",
+                    in_range
+                ).scalar()
+                if stranded:
+                    self._execute(
+                        f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+                    )
+                    self._execute(
+                        f"WITH moved AS (DELETE FROM {default} WHERE {key} >= :start AND {key} < :end "
+                        f"RETURNING *) INSERT INTO {name} SELECT * FROM moved",
+                        in_range
+                    )
+                    self._execute(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES {bounds}")
+                else:
+                    self._execute(f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES {bounds}")
+                created.append(name)
+            month = following
+        return created
+
+    def ensure_future_partitions(self, months_ahead: Optional[int] = None) -> Dict[str, List[str]]:
+        """Premake partitions from the current month to ``months_ahead`` months out."""
+        if months_ahead is None:
+            months_ahead = settings.PARTITION_PREMAKE_MONTHS
+        today = date.today()
+        created = {}
+        for table in PARTITIONED_TABLES:
+            if self.is_partitioned(table):
+                created[table] = self.ensure_partitions(
+                    table, today, add_months(month_start(today), months_ahead)
+                )
+                self._commit()
+        return created
+
+    def backfill(self, table: str, batch_size: Optional[int] = None) -> int:
+        """
+        Move rows left in ``<table>_unpartitioned`` into the partitioned table
+        and drop it once empty. Returns the number of rows moved.
+
+        With ``batch_size`` rows move in id order and each batch is committed,
+        keeping transactions short on a live database; without it everything
+        moves in a single statement.
+        """
+        legacy = f"{table}{LEGACY_SUFFIX}"
+        if not self._table_exists(legacy):
+            return 0
+
+        columns = self._columns(legacy)
+        moved = 0
+        if batch_size is None:
+            moved = self._execute(
+                f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {legacy}"
+            ).rowcount
+        else:
+            while True:
+                count = self._execute(
+                    f"WITH moved AS (DELETE FROM {legacy} WHERE id IN "
+                    f"(SELECT id FROM {legacy} ORDER BY id LIMIT :limit) RETURNING {columns}) "
+                    f"INSERT INTO {table} ({columns}) SELECT {columns} FROM moved",
+                    {"limit": batch_size}
+                ).rowcount
+                if not count:
+                    break
+                moved += count
+                self._commit()
+
+        self._execute(f"DROP TABLE {legacy}")
+        self._commit()
+        return moved
+
+    def archive(self, table: str, before: date, archive_dir: Union[str, Path]) -> List[Dict[str, Any]]:
+        """
+        Export every monthly partition of ``table`` that ends on or before
+        ``before`` to ``<archive_dir>/<table>/<partition>.parquet`` (zstd)
+        and drop it.
+
+        The partition is detached and dropped only after the file is written
+        and its row count matches the table under an exclusive lock, so a
+        failed export leaves the data in place. The archive watermark in
+        ``partition_archives`` advances in the same transaction as each drop.
+        """
+        cutoff = month_start(before)
+        target = Path(archive_dir) / table
+        archived = []
+        for partition in self.partitions(table):
+            if partition.end > cutoff:
+                continue
+            path = target / f"{partition.name}.parquet"
+            rows = self._export_parquet(table, partition.name, path)
+
+            self._execute(f"ALTER TABLE {table} DETACH PARTITION {partition.name}")
+            current = self._execute(f"SELECT count(*) FROM {partition.name}").scalar()
+            if current != rows:
+                self.db.rollback()
+                raise RuntimeError(
+                    f"{partition.name} changed during export ({rows} rows archived, {current} now); "
+                    "partition left attached"
+                )
+            self._execute(f"DROP TABLE {partition.name}")
+            self._execute(
+                """
+                INSERT INTO partition_archives AS pa (table_name, archived_before)
+                VALUES (:table, :before)
+                ON CONFLICT (table_name) DO UPDATE SET
+                    archived_before = GREATEST(pa.archived_before, EXCLUDED.archived_before),
+                    updated_at = now()
+                """,
+                {"table": table, "before": partition.end}
+            )
+            self._commit()
+            archived.append({"partition": partition.name, "rows": rows, "path": str(path)})
+        return archived
+
+    def _export_parquet(self, table: str, partition: str, path: Path) -> int:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = arrow_schema(table)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_suffix(".parquet.partial")
+        rows = 0
+        result = self.db.execute(
+            text(f"SELECT {', '.join(schema.names)} FROM {partition} ORDER BY id"),
+            execution_options={"yield_per": ARCHIVE_BATCH_ROWS}
+        )
+        with pq.ParquetWriter(partial, schema, compression="zstd") as writer:
+            for batch in result.partitions():
+                writer.write_table(pa.Table.from_pylist([row._asdict() for row in batch], schema=schema))
+                rows += len(batch)
+        os.replace(partial, path)
+        return rows
+
+
+def premake_partitions(bind: Engine) -> Dict[str, List[str]]:
+    """
+    Create the next PARTITION_PREMAKE_MONTHS of monthly partitions, run at
+    app startup and then every PARTITION_PREMAKE_INTERVAL_HOURS. Skipped on
+    databases without partitioning and while another process holds the
+    premake lock. Returns the partitions created per table.
+    """
+    if bind.dialect.name != "postgresql":
+        return {}
+    with bind.connect() as conn:
+        locked = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": PREMAKE_LOCK_KEY}).scalar()
+        conn.commit()
+        if not locked:
+            return {}
+        try:
+            with Session(bind=conn) as db:
+                return PartitionManager(db).ensure_future_partitions()
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": PREMAKE_LOCK_KEY})
+            conn.commit()
+
+
+def arrow_schema(table: str):
+    """Parquet schema for a partitioned table, derived from its model columns."""
+    import pyarrow as pa
+
+    fields = []
+    for column in Base.metadata.tables[table].columns:
+        column_type = column.type
+        if isinstance(column_type, Boolean):
+            arrow_type = pa.bool_()
+        elif isinstance(column_type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column_type, Numeric):
+            arrow_type = pa.decimal128(column_type.precision, column_type.scale)
+        elif isinstance(column_type, DateTime):
+            arrow_type = pa.timestamp("us")
+        elif isinstance(column_type, Date):
+            arrow_type = pa.date32()
+        elif isinstance(column_type, (String, Text)):
+            arrow_type = pa.string()
+        else:
+            raise TypeError(f"No Parquet type for {table}.{column.name} ({column_type})")
+        fields.append(pa.field(column.name, arrow_type, nullable=column.nullable))
+    return pa.schema(fields)
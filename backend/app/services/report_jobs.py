@@ -0,0 +1,274 @@
+import hashlib
+import inspect
+import json
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import create_engine, delete, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.db.models import ReportJob
+from app.db.session import engine_options
+from app.services.cached_reports import REPORT_CACHE_POLICIES, CachedReportsService
+from app.services.reports import ReportsService
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("QUEUED", "RUNNING")
+
+# Progress (percent) recorded as a job passes each stage. Report methods
+# run as a single call, so progress is per stage rather than per row.
+PROGRESS_QUEUED = 0
+PROGRESS_RUNNING = 10
+PROGRESS_DONE = 100
+
+# Reports that can be queued: every report with a cache policy
+JOB_REPORTS = tuple(REPORT_CACHE_POLICIES)
+
+
+class ReportJobError(ValueError):
+    """Raised for an unknown report or parameters its method does not accept."""
+
+
+def coerce_params(report: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Bind ``params`` to the report method's signature, filling in defaults
+    and converting values (e.g. ISO date strings) to the annotated types.
+    """
+    if report not in JOB_REPORTS:
+        raise ReportJobError(f"Unknown report '{report}'")
+    signature = inspect.signature(getattr(ReportsService, report))
+    try:
+        bound = signature.bind(None, **params)
+    except TypeError as exc:
+        raise ReportJobError(f"Invalid parameters for {report}: {exc}") from None
+    bound.apply_defaults()
+
+    coerced = {}
+    for name, value in list(bound.arguments.items())[1:]:
+        annotation = signature.parameters[name].annotation
+        if annotation is not inspect.Parameter.empty:
+            try:
+                value = TypeAdapter(annotation).validate_python(value)
+            except ValidationError as exc:
+                raise ReportJobError(f"Invalid value for {name}: {exc.errors()[0]['msg']}") from None
+        coerced[name] = value
+    return coerced
+
+
+def normalize_params(report: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Validated params in canonical JSON form, so equivalent requests hash the same."""
+    return jsonable_encoder(coerce_params(report, params))
+
+
+def params_hash(report: str, params: Dict[str, Any]) -> str:
+    payload = json.dumps({"report": report, "params": params}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ReportJobService:
+    """
+    Queue bookkeeping for background reports.
+
+    Jobs are keyed by a hash of the report name and its normalized
+    parameters. Submitting a report that is already queued or running, or
+    whose stored result has not expired, returns that job instead of
+    starting another computation.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _reusable(self, digest: str) -> Optional[ReportJob]:
+        now = datetime.utcnow()
+        return self.db.scalars(
+            select(ReportJob)
+            .where(
+                ReportJob.params_hash == digest,
+                or_(
+                    ReportJob.status.in_(ACTIVE_STATUSES),
+                    (ReportJob.status == "SUCCEEDED") & (ReportJob.expires_at > now)
+                )
+            )
+            .order_by(ReportJob.id.desc())
+            .limit(1)
+        ).first()
+
+    def fail_stale(self) -> int:
+        """
+        Mark jobs that have been queued or running for longer than
+        REPORT_JOB_TIMEOUT_SECONDS as failed (lost with a restarted worker
+        pool), so they stop absorbing new submissions.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.REPORT_JOB_TIMEOUT_SECONDS)
+        result = self.db.execute(
+            update(ReportJob)
+            .where(
+                ReportJob.status.in_(ACTIVE_STATUSES),
+                or_(ReportJob.started_at < cutoff,
+                    ReportJob.started_at.is_(None) & (ReportJob.created_at < cutoff))
+            )
+            .values(status="FAILED", error="Job did not finish in time", finished_at=datetime.utcnow())
+        )
+        return result.rowcount
+
+    def submit(self, report: str, params: Dict[str, Any]) -> Tuple[ReportJob, bool]:
+        """
+        Find or create the job for ``report`` with ``params``; commits.
+        Returns the job and whether it was newly created (and so needs to
+        be handed to a worker).
+        """
+        params = normalize_params(report, params)
+        digest = params_hash(report, params)
+
+        self.fail_stale()
+        job = self._reusable(digest)
+        if job is not None:
+            self.db.commit()
+            return job, False
+
+        job = ReportJob(
+            report=report, params=params, params_hash=digest, status="QUEUED",
+            progress=PROGRESS_QUEUED, created_at=datetime.utcnow()
+        )
+        self.db.add(job)
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # An identical request queued the job between our lookup and insert
+            self.db.rollback()
+            return self._reusable(digest), False
+        return job, True
+
+    def get(self, job_id: int) -> Optional[ReportJob]:
+        return self.db.get(ReportJob, job_id)
+
+    def claim(self, job_id: int) -> Optional[ReportJob]:
+        """Move a queued job to RUNNING; None if another worker has it or it is gone."""
+        claimed = self.db.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id, ReportJob.status == "QUEUED")
+            .values(status="RUNNING", progress=PROGRESS_RUNNING, started_at=datetime.utcnow())
+        ).rowcount
+        self.db.commit()
+        return self.db.get(ReportJob, job_id) if claimed else None
+
+    def _finish(self, job_id: int, **values: Any) -> None:
+        self.db.execute(
+            update(ReportJob)
+            .where(ReportJob.id == job_id, ReportJob.status == "RUNNING")
+            .values(finished_at=datetime.utcnow(), **values)
+        )
+        self.db.commit()
+
+    def run(self, job_id: int) -> None:
+        """Claim and compute a job, storing its result or error."""
+        job = self.claim(job_id)
+        if job is None:
+            return
+        report, params = job.report, job.params
+        try:
+            method = getattr(CachedReportsService(ReportsService(self.db)), report)
+            result = jsonable_encoder(method(**coerce_params(report, params)))
+        except Exception as exc:
+            logger.exception("Report job %s (%s) failed", job_id, report)
+            self.db.rollback()
+            self._finish(job_id, status="FAILED", error=f"{type(exc).__name__}: {exc}")
+            return
+
+        self._finish(
+            job_id, status="SUCCEEDED", progress=PROGRESS_DONE, result=result,
+            expires_at=datetime.utcnow() + timedelta(seconds=settings.REPORT_JOB_RESULT_TTL_SECONDS)
+        )
+
+    def purge(self, before: Optional[datetime] = None) -> int:
+        """Delete finished jobs whose results expired (or finished) before ``before``."""
+        before = before or datetime.utcnow()
+        result = self.db.execute(
+            delete(ReportJob).where(
+                ReportJob.status.not_in(ACTIVE_STATUSES),
+                or_(ReportJob.expires_at < before,
+                    ReportJob.expires_at.is_(None) & (ReportJob.finished_at < before))
+            )
+        )
+        self.db.commit()
+        return result.rowcount
+
+
+# Session factory of a worker process, created by its initializer
+_worker_sessionmaker: Optional[sessionmaker] = None
+
+
+def _init_worker() -> None:
+    """Give each worker process a single connection with the reports statement timeout."""
+    global _worker_sessionmaker
+    worker_engine = create_engine(
+        settings.DATABASE_URL,
+        **engine_options(settings.DATABASE_URL, 1, 0, settings.REPORTS_DB_STATEMENT_TIMEOUT_MS)
+    )
+    _worker_sessionmaker = sessionmaker(bind=worker_engine, autoflush=False)
+
+
+def run_report_job(job_id: int, session_factory: Optional[Callable[[], Session]] = None) -> None:
+    """Worker entry point: compute job ``job_id`` in a fresh session."""
+    session_factory = session_factory or _worker_sessionmaker
+    with session_factory() as db:
+        ReportJobService(db).run(job_id)
+
+
+class ReportJobQueue:
+    """
+    Hands submitted jobs to a pool of worker processes.
+
+    The pool is created on first use with REPORT_JOB_WORKERS processes.
+    ``executor`` and ``session_factory`` can be supplied instead, e.g. a
+    thread pool bound to a test database.
+    """
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        session_factory: Optional[Callable[[], Session]] = None
+    ):
+        self._executor = executor
+        self.session_factory = session_factory
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.REPORT_JOB_WORKERS,
+                # spawn: workers must not inherit the API's open connections
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        return self._executor
+
+    def enqueue(self, job_id: int) -> None:
+        args = (job_id,) if self.session_factory is None else (job_id, self.session_factory)
+        self.executor.submit(run_report_job, *args).add_done_callback(_log_worker_error)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _log_worker_error(future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Report worker crashed", exc_info=future.exception())
+
+
+report_job_queue = ReportJobQueue()
+
+
+def get_report_job_queue() -> ReportJobQueue:
+    """Dependency for the background report queue."""
+    return report_job_queue
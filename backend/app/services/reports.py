@@ -1,138 +1,200 @@
 from datetime import date, datetime
-from typing import List, Optional, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import Select, case, func, and_, or_, select
+from app.core.config import settings
 from app.db.models import (
-    Fabric, Yarn, Garment, Inventory, Sale, 
-    ProductionPlan, ProductionActivity, Panel, PaidAd, Discount
+    Fabric, Yarn, Garment, Sale, SalesDailyRollup,
+    ProductionPlan, ProductionActivity, Panel, PanelActivity, PaidAd, Discount
 )
+from app.services.aggregations import SalesVelocityAggregator
+from app.services.fabric_summary import FabricSummaryService
+from app.services.forecasting import DemandForecastService
+from app.services.inventory_analytics import InventoryAnalytics
+
+# Rows fetched per round trip when walking report lines
+STREAM_BATCH_SIZE = 1000
+
+# Velocity thresholds (units/day, units in stock) for inventory movement reports
+SLOW_MOVING_THRESHOLDS = {"max_rate": 0.1, "min_stock": 10}
+FAST_MOVING_THRESHOLDS = {"min_rate": 1.0}
 
 
 class ReportsService:
     """Service for generating all business reports"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, use_rollup: Optional[bool] = None):
         self.db = db
+        self.use_rollup = settings.USE_SALES_ROLLUP if use_rollup is None else use_rollup
+    
+    def _rollup_totals(
+        self,
+        group_by: List,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        **filters: Any
+    ):
+        """
+        Aggregate sales_daily_rollup grouped by the given columns.
+        Rows carry the group columns plus transaction_count, quantity,
+        gross_amount and total_amount.
+        """
+        query = self.db.query(
+            *group_by,
+            func.sum(SalesDailyRollup.transaction_count).label("transaction_count"),
+            func.sum(SalesDailyRollup.quantity).label("quantity"),
+            func.sum(SalesDailyRollup.gross_amount).label("gross_amount"),
+            func.sum(SalesDailyRollup.total_amount).label("total_amount")
+        )
+        if start_date:
+            query = query.filter(SalesDailyRollup.transaction_date >= start_date)
+        if end_date:
+            query = query.filter(SalesDailyRollup.transaction_date <= end_date)
+        for column, value in filters.items():
+            query = query.filter(getattr(SalesDailyRollup, column) == value)
+        return query.group_by(*group_by).all()
     
     # ==================== FABRIC REPORTS ====================
     
-    def fabric_stock_sheet_total(self) -> Dict[str, Any]:
-        """Generate total fabric stock sheet across all types"""
-        fabrics = self.db.query(Fabric).all()
-        
-        total_stock = sum(float(f.stock_quantity) for f in fabrics)
-        total_value = sum(
-            float(f.stock_quantity * (f.cost_per_unit or 0)) 
-            for f in fabrics
-        )
-        
-        fabric_data = [
-            {
-                "id": f.id,
-                "fabric_type": f.fabric_type,
-                "subtype": f.subtype,
-                "gsm": f.gsm,
-                "composition": f.composition,
-                "color": f.color,
-                "stock_quantity": float(f.stock_quantity),
-                "unit": f.unit,
-                "cost_per_unit": float(f.cost_per_unit) if f.cost_per_unit else 0,
-                "stock_value": float(f.stock_quantity * (f.cost_per_unit or 0))
-            }
-            for f in fabrics
+    def _fabric_totals(self, fabric_type: Optional[str] = None) -> List[Any]:
+        """Stock totals per (fabric_type, gsm, color), read from the fabric summary"""
+        totals = FabricSummaryService(self.db).totals()
+        query = select(totals)
+        if fabric_type:
+            query = query.where(totals.c.fabric_type == fabric_type)
+        return self.db.execute(query).all()
+    
+    @staticmethod
+    def _fabric_breakdown(rows: List[Any], *keys: str) -> List[Dict[str, Any]]:
+        """Roll (fabric_type, gsm, color) totals up to the given columns"""
+        grouped: Dict[tuple, Dict[str, Any]] = {}
+        for row in rows:
+            bucket = grouped.setdefault(
+                tuple(getattr(row, key) for key in keys),
+                {"fabric_count": 0, "stock_quantity": 0.0, "stock_value": 0.0}
+            )
+            bucket["fabric_count"] += row.fabric_count
+            bucket["stock_quantity"] += float(row.stock_quantity or 0)
+            bucket["stock_value"] += float(row.stock_value or 0)
+        return [
+            {**dict(zip(keys, group)), **bucket}
+            for group, bucket in sorted(
+                grouped.items(), key=lambda item: tuple((v is None, v) for v in item[0])
+            )
         ]
+    
+    def _fabric_lines(self, fabric_type: Optional[str] = None) -> List[Fabric]:
+        query = select(Fabric).order_by(Fabric.id)
+        if fabric_type:
+            query = query.where(Fabric.fabric_type == fabric_type)
+        return self.db.scalars(query).all()
+    
+    def fabric_stock_sheet_total(self, include_items: bool = True) -> Dict[str, Any]:
+        """
+        Generate total fabric stock sheet across all types, with totals
+        per type, GSM and color. Per-fabric lines only with include_items.
+        """
+        rows = self._fabric_totals()
         
-        return {
+        report = {
             "report_type": "Fabric Stock Sheet - Total",
             "generated_at": datetime.utcnow().isoformat(),
-            "summary": {
-                "total_fabric_types": len(fabrics),
-                "total_stock_quantity": total_stock,
-                "total_stock_value": total_value,
-                "unit": "kg"
-            },
-            "fabrics": fabric_data
+            "summary": self._fabric_stock_summary(rows),
+            "by_type": self._fabric_breakdown(rows, "fabric_type"),
+            "by_gsm": self._fabric_breakdown(rows, "gsm"),
+            "by_color": self._fabric_breakdown(rows, "color")
+        }
+        if include_items:
+            report["fabrics"] = [
+                {
+                    "id": f.id,
+                    "fabric_type": f.fabric_type,
+                    "subtype": f.subtype,
+                    "gsm": f.gsm,
+                    "composition": f.composition,
+                    "color": f.color,
+                    "stock_quantity": float(f.stock_quantity),
+                    "unit": f.unit,
+                    "cost_per_unit": float(f.cost_per_unit) if f.cost_per_unit else 0,
+                    "stock_value": float(f.stock_quantity * (f.cost_per_unit or 0))
+                }
+                for f in self._fabric_lines()
+            ]
+        return report
+    
+    def fabric_stock_summary(self) -> Dict[str, Any]:
+        """Summary block of the total fabric stock sheet without line items"""
+        return self._fabric_stock_summary(self._fabric_totals())
+    
+    def _fabric_stock_summary(self, rows: List[Any]) -> Dict[str, Any]:
+        return {
+            "total_fabric_types": sum(row.fabric_count for row in rows),
+            "total_stock_quantity": sum(float(row.stock_quantity or 0) for row in rows),
+            "total_stock_value": sum(float(row.stock_value or 0) for row in rows),
+            "unit": "kg"
         }
     
-    def fabric_stock_sheet_by_type(self, fabric_type: str) -> Dict[str, Any]:
+    def fabric_stock_sheet_by_type(self, fabric_type: str, include_items: bool = True) -> Dict[str, Any]:
         """Generate fabric stock sheet filtered by fabric type"""
-        fabrics = self.db.query(Fabric).filter(
-            Fabric.fabric_type == fabric_type
-        ).all()
+        rows = self._fabric_totals(fabric_type)
         
-        total_stock = sum(float(f.stock_quantity) for f in fabrics)
-        total_value = sum(
-            float(f.stock_quantity * (f.cost_per_unit or 0)) 
-            for f in fabrics
-        )
-        
-        fabric_data = [
-            {
-                "id": f.id,
-                "subtype": f.subtype,
-                "gsm": f.gsm,
-                "composition": f.composition,
-                "color": f.color,
-                "width": float(f.width) if f.width else None,
-                "stock_quantity": float(f.stock_quantity),
-                "unit": f.unit,
-                "cost_per_unit": float(f.cost_per_unit) if f.cost_per_unit else 0,
-                "stock_value": float(f.stock_quantity * (f.cost_per_unit or 0))
-            }
-            for f in fabrics
-        ]
-        
-        return {
+        report = {
             "report_type": f"Fabric Stock Sheet - {fabric_type}",
             "fabric_type": fabric_type,
             "generated_at": datetime.utcnow().isoformat(),
             "summary": {
-                "total_subtypes": len(fabrics),
-                "total_stock_quantity": total_stock,
-                "total_stock_value": total_value,
+                "total_subtypes": sum(row.fabric_count for row in rows),
+                "total_stock_quantity": sum(float(row.stock_quantity or 0) for row in rows),
+                "total_stock_value": sum(float(row.stock_value or 0) for row in rows),
                 "unit": "kg"
             },
-            "fabrics": fabric_data
+            "by_gsm": self._fabric_breakdown(rows, "gsm"),
+            "by_color": self._fabric_breakdown(rows, "color")
         }
+        if include_items:
+            report["fabrics"] = [
+                {
+                    "id": f.id,
+                    "subtype": f.subtype,
+                    "gsm": f.gsm,
+                    "composition": f.composition,
+                    "color": f.color,
+                    "width": float(f.width) if f.width else None,
+                    "stock_quantity": float(f.stock_quantity),
+                    "unit": f.unit,
+                    "cost_per_unit": float(f.cost_per_unit) if f.cost_per_unit else 0,
+                    "stock_value": float(f.stock_quantity * (f.cost_per_unit or 0))
+                }
+                for f in self._fabric_lines(fabric_type)
+            ]
+        return report
     
     def fabric_stock_sheet_by_period(
         self, 
         start_date: date, 
-        end_date: date
+        end_date: date,
+        include_items: bool = True
     ) -> Dict[str, Any]:
         """
         Generate fabric stock sheet for a specific time period.
         Shows stock added/updated within the period.
         """
-        fabrics = self.db.query(Fabric).filter(
-            and_(
-                Fabric.updated_at >= start_date,
-                Fabric.updated_at <= end_date
-            )
-        ).all()
-        
-        total_stock = sum(float(f.stock_quantity) for f in fabrics)
-        total_value = sum(
-            float(f.stock_quantity * (f.cost_per_unit or 0)) 
-            for f in fabrics
+        # Filters on each fabric's updated_at, so totals come from fabrics
+        # itself rather than the per type/GSM/color summary
+        in_period = and_(
+            Fabric.updated_at >= start_date,
+            Fabric.updated_at <= end_date
         )
-        
-        fabric_data = [
-            {
-                "id": f.id,
-                "fabric_type": f.fabric_type,
-                "subtype": f.subtype,
-                "gsm": f.gsm,
-                "stock_quantity": float(f.stock_quantity),
-                "cost_per_unit": float(f.cost_per_unit) if f.cost_per_unit else 0,
-                "stock_value": float(f.stock_quantity * (f.cost_per_unit or 0)),
-                "updated_at": f.updated_at.isoformat()
-            }
-            for f in fabrics
-        ]
-        
-        return {
+        totals = self.db.query(
+            func.count(Fabric.id).label("fabric_count"),
+            func.coalesce(func.sum(Fabric.stock_quantity), 0).label("stock_quantity"),
+            func.coalesce(
+                func.sum(Fabric.stock_quantity * func.coalesce(Fabric.cost_per_unit, 0)), 0
+            ).label("stock_value")
+        ).filter(in_period).one()
+        
+        report = {
             "report_type": "Fabric Stock Sheet - Time Period",
             "period": {
                 "start_date": start_date.isoformat(),
@@ -140,62 +202,88 @@ class ReportsService:
             },
             "generated_at": datetime.utcnow().isoformat(),
             "summary": {
-                "fabrics_updated": len(fabrics),
-                "total_stock_quantity": total_stock,
-                "total_stock_value": total_value
-            },
-            "fabrics": fabric_data
+                "fabrics_updated": totals.fabric_count,
+                "total_stock_quantity": float(totals.stock_quantity),
+                "total_stock_value": float(totals.stock_value)
+            }
         }
+        if include_items:
+            report["fabrics"] = [
+                {
+                    "id": f.id,
+                    "fabric_type": f.fabric_type,
+                    "subtype": f.subtype,
+                    "gsm": f.gsm,
+                    "stock_quantity": float(f.stock_quantity),
+                    "cost_per_unit": float(f.cost_per_unit) if f.cost_per_unit else 0,
+                    "stock_value": float(f.stock_quantity * (f.cost_per_unit or 0)),
+                    "updated_at": f.updated_at.isoformat()
+                }
+                for f in self.db.scalars(select(Fabric).where(in_period).order_by(Fabric.id))
+            ]
+        return report
     
-    def fabric_cost_sheet(self) -> Dict[str, Any]:
+    def fabric_cost_sheet(self, include_items: bool = True) -> Dict[str, Any]:
         """Generate fabric cost sheet with cost breakdown"""
-        fabrics = self.db.query(Fabric).all()
-        
-        cost_data = []
-        for f in fabrics:
-            stock_qty = float(f.stock_quantity)
-            cost_per_unit = float(f.cost_per_unit) if f.cost_per_unit else 0
-            total_value = stock_qty * cost_per_unit
-            
-            cost_data.append({
-                "fabric_type": f.fabric_type,
-                "subtype": f.subtype,
-                "gsm": f.gsm,
-                "stock_quantity": stock_qty,
-                "unit": f.unit,
-                "cost_per_unit": cost_per_unit,
-                "total_value": total_value
-            })
+        rows = self._fabric_totals()
         
-        # Group by fabric type
-        type_summary = {}
-        for item in cost_data:
-            ftype = item["fabric_type"]
-            if ftype not in type_summary:
-                type_summary[ftype] = {
-                    "total_quantity": 0,
-                    "total_value": 0,
-                    "count": 0
-                }
-            type_summary[ftype]["total_quantity"] += item["stock_quantity"]
-            type_summary[ftype]["total_value"] += item["total_value"]
-            type_summary[ftype]["count"] += 1
-        
-        return {
+        report = {
             "report_type": "Fabric Cost Sheet",
             "generated_at": datetime.utcnow().isoformat(),
-            "summary_by_type": type_summary,
-            "total_stock_value": sum(item["total_value"] for item in cost_data),
-            "detailed_costs": cost_data
+            "summary_by_type": {
+                line["fabric_type"]: {
+                    "total_quantity": line["stock_quantity"],
+                    "total_value": line["stock_value"],
+                    "count": line["fabric_count"]
+                }
+                for line in self._fabric_breakdown(rows, "fabric_type")
+            },
+            "total_stock_value": sum(float(row.stock_value or 0) for row in rows)
         }
+        if include_items:
+            cost_data = []
+            for f in self._fabric_lines():
+                stock_qty = float(f.stock_quantity)
+                cost_per_unit = float(f.cost_per_unit) if f.cost_per_unit else 0
+                
+                cost_data.append({
+                    "fabric_type": f.fabric_type,
+                    "subtype": f.subtype,
+                    "gsm": f.gsm,
+                    "stock_quantity": stock_qty,
+                    "unit": f.unit,
+                    "cost_per_unit": cost_per_unit,
+                    "total_value": stock_qty * cost_per_unit
+                })
+            report["detailed_costs"] = cost_data
+        return report
     
     # ==================== SALES REPORTS ====================
     
+    @staticmethod
+    def daily_sales_statement(report_date: date) -> Select:
+        """Sales transactions of one day, in id order"""
+        return select(Sale).where(Sale.transaction_date == report_date).order_by(Sale.id)
+    
+    @staticmethod
+    def sale_transaction(s) -> Dict[str, Any]:
+        """Serialize one sale as a daily sales report transaction line"""
+        return {
+            "id": s.id,
+            "garment_id": s.garment_id,
+            "panel_id": s.panel_id,
+            "size": s.size,
+            "quantity": s.quantity,
+            "unit_price": float(s.unit_price),
+            "discount_percentage": float(s.discount_percentage),
+            "total_amount": float(s.total_amount),
+            "is_return": s.is_return,
+            "invoice_number": s.invoice_number
+        }
+    
     def daily_sales_report(self, report_date: date) -> Dict[str, Any]:
         """Generate daily sales report for a specific date"""
-        sales = self.db.query(Sale).filter(
-            Sale.transaction_date == report_date
-        ).all()
+        sales = self.db.scalars(self.daily_sales_statement(report_date)).all()
         
         returns = [s for s in sales if s.is_return]
         actual_sales = [s for s in sales if not s.is_return]
@@ -207,21 +295,7 @@ class ReportsService:
         total_units_sold = sum(s.quantity for s in actual_sales)
         total_units_returned = sum(s.quantity for s in returns)
         
-        sales_data = [
-            {
-                "id": s.id,
-                "garment_id": s.garment_id,
-                "panel_id": s.panel_id,
-                "size": s.size,
-                "quantity": s.quantity,
-                "unit_price": float(s.unit_price),
-                "discount_percentage": float(s.discount_percentage),
-                "total_amount": float(s.total_amount),
-                "is_return": s.is_return,
-                "invoice_number": s.invoice_number
-            }
-            for s in sales
-        ]
+        sales_data = [self.sale_transaction(s) for s in sales]
         
         return {
             "report_type": "Daily Sales Report",
@@ -241,6 +315,44 @@ class ReportsService:
             "transactions": sales_data
         }
     
+    def daily_sales_summary(self, report_date: date) -> Dict[str, Any]:
+        """Summary block of the daily sales report without line items"""
+        if self.use_rollup:
+            rows = self._rollup_totals(
+                [SalesDailyRollup.is_return], report_date, report_date
+            )
+        else:
+            rows = self.db.query(
+                Sale.is_return,
+                func.count(Sale.id).label("transaction_count"),
+                func.sum(Sale.quantity).label("quantity"),
+                func.sum(Sale.total_amount).label("total_amount")
+            ).filter(
+                Sale.transaction_date == report_date
+            ).group_by(Sale.is_return).all()
+        
+        totals = {row.is_return: row for row in rows}
+        sold, returned = totals.get(False), totals.get(True)
+        
+        sales_count = int(sold.transaction_count) if sold else 0
+        returns_count = int(returned.transaction_count) if returned else 0
+        units_sold = int(sold.quantity) if sold else 0
+        units_returned = int(returned.quantity) if returned else 0
+        sales_value = float(sold.total_amount) if sold else 0
+        returns_value = float(returned.total_amount) if returned else 0
+        
+        return {
+            "total_transactions": sales_count + returns_count,
+            "total_sales_transactions": sales_count,
+            "total_returns": returns_count,
+            "total_units_sold": units_sold,
+            "total_units_returned": units_returned,
+            "net_units": units_sold - units_returned,
+            "total_sales_value": sales_value,
+            "total_returns_value": returns_value,
+            "net_sales_value": sales_value - returns_value
+        }
+    
     def daily_sales_report_single_sku(
         self, 
         report_date: date, 
@@ -316,36 +428,10 @@ class ReportsService:
         end_date: date
     ) -> Dict[str, Any]:
         """Generate panel-wise sales report for a date range"""
-        sales = self.db.query(Sale).filter(
-            and_(
-                Sale.transaction_date >= start_date,
-                Sale.transaction_date <= end_date
-            )
-        ).all()
-        
-        panels = self.db.query(Panel).all()
-        
-        panel_data = {}
-        for panel in panels:
-            panel_sales = [s for s in sales if s.panel_id == panel.id]
-            actual_sales = [s for s in panel_sales if not s.is_return]
-            returns = [s for s in panel_sales if s.is_return]
-            
-            panel_data[panel.id] = {
-                "panel_name": panel.panel_name,
-                "panel_type": panel.panel_type,
-                "is_active": panel.is_active,
-                "total_transactions": len(panel_sales),
-                "sales_transactions": len(actual_sales),
-                "return_transactions": len(returns),
-                "total_units_sold": sum(s.quantity for s in actual_sales),
-                "total_units_returned": sum(s.quantity for s in returns),
-                "gross_sales_value": sum(float(s.total_amount) for s in actual_sales),
-                "returns_value": sum(float(s.total_amount) for s in returns),
-                "net_sales_value": sum(
-                    float(s.total_amount) for s in actual_sales
-                ) - sum(float(s.total_amount) for s in returns)
-            }
+        if self.use_rollup:
+            panel_data = self._panel_wise_from_rollup(start_date, end_date)
+        else:
+            panel_data = self._panel_wise_from_sales(start_date, end_date)
         
         return {
             "report_type": "Panel-Wise Sales Report",
@@ -362,33 +448,103 @@ class ReportsService:
             }
         }
     
+    def _panel_wise_from_sales(self, start_date: date, end_date: date) -> Dict[int, Dict[str, Any]]:
+        rows = self.db.query(
+            Sale.panel_id,
+            Sale.is_return,
+            func.count(Sale.id).label("transaction_count"),
+            func.sum(Sale.quantity).label("quantity"),
+            func.sum(Sale.total_amount).label("total_amount")
+        ).filter(
+            and_(
+                Sale.transaction_date >= start_date,
+                Sale.transaction_date <= end_date
+            )
+        ).group_by(Sale.panel_id, Sale.is_return).all()
+        return self._panel_wise_from_totals(rows)
+    
+    def _panel_wise_from_rollup(self, start_date: date, end_date: date) -> Dict[int, Dict[str, Any]]:
+        rows = self._rollup_totals(
+            [SalesDailyRollup.panel_id, SalesDailyRollup.is_return],
+            start_date, end_date
+        )
+        return self._panel_wise_from_totals(rows)
+    
+    def _panel_wise_from_totals(self, rows) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-panel report lines from totals grouped by (panel_id, is_return);
+        idle panels get zeros. Keyed by panel id as a string, the shape the
+        JSON response and the report cache return.
+        """
+        totals = {(row.panel_id, row.is_return): row for row in rows}
+        
+        panel_data = {}
+        for panel in self.db.query(Panel).all():
+            sold = totals.get((panel.id, False))
+            returned = totals.get((panel.id, True))
+            sales_count = int(sold.transaction_count) if sold else 0
+            returns_count = int(returned.transaction_count) if returned else 0
+            sales_value = float(sold.total_amount) if sold else 0
+            returns_value = float(returned.total_amount) if returned else 0
+            
+            panel_data[str(panel.id)] = {
+                "panel_name": panel.panel_name,
+                "panel_type": panel.panel_type,
+                "is_active": panel.is_active,
+                "total_transactions": sales_count + returns_count,
+                "sales_transactions": sales_count,
+                "return_transactions": returns_count,
+                "total_units_sold": int(sold.quantity) if sold else 0,
+                "total_units_returned": int(returned.quantity) if returned else 0,
+                "gross_sales_value": sales_value,
+                "returns_value": returns_value,
+                "net_sales_value": sales_value - returns_value
+            }
+        
+        return panel_data
+    
     def inactive_panel_report(self, days_threshold: int = 30) -> Dict[str, Any]:
         """Report on panels with no activity in the last N days"""
         from datetime import timedelta
         
         cutoff_date = date.today() - timedelta(days=days_threshold)
         
-        all_panels = self.db.query(Panel).all()
-        inactive_panels = []
+        # One read of the maintained panel_activity summary instead of a
+        # latest-sale lookup per panel; recent ad counts come from the
+        # (panel_id, ad_date) index
+        recent_ads = select(
+            PaidAd.panel_id, func.count(PaidAd.id).label("ads_in_period")
+        ).where(PaidAd.ad_date >= cutoff_date).group_by(PaidAd.panel_id).subquery()
+        
+        rows = self.db.execute(
+            select(
+                Panel,
+                PanelActivity.last_sale_date,
+                PanelActivity.last_ad_date,
+                func.coalesce(recent_ads.c.ads_in_period, 0).label("ads_in_period")
+            ).outerjoin(
+                PanelActivity, PanelActivity.panel_id == Panel.id
+            ).outerjoin(
+                recent_ads, recent_ads.c.panel_id == Panel.id
+            ).where(
+                or_(PanelActivity.last_sale_date.is_(None), PanelActivity.last_sale_date < cutoff_date)
+            ).order_by(Panel.id)
+        ).all()
         
-        for panel in all_panels:
-            # Check last sale date
-            last_sale = self.db.query(Sale).filter(
-                Sale.panel_id == panel.id
-            ).order_by(Sale.transaction_date.desc()).first()
-            
-            if not last_sale or last_sale.transaction_date < cutoff_date:
-                inactive_panels.append({
-                    "id": panel.id,
-                    "panel_name": panel.panel_name,
-                    "panel_type": panel.panel_type,
-                    "is_active": panel.is_active,
-                    "last_sale_date": last_sale.transaction_date.isoformat() if last_sale else None,
-                    "days_since_last_sale": (
-                        (date.today() - last_sale.transaction_date).days 
-                        if last_sale else None
-                    )
-                })
+        today = date.today()
+        inactive_panels = []
+        for panel, last_sale_date, last_ad_date, ads_in_period in rows:
+            inactive_panels.append({
+                "id": panel.id,
+                "panel_name": panel.panel_name,
+                "panel_type": panel.panel_type,
+                "is_active": panel.is_active,
+                "last_sale_date": last_sale_date.isoformat() if last_sale_date else None,
+                "days_since_last_sale": (today - last_sale_date).days if last_sale_date else None,
+                "last_ad_date": last_ad_date.isoformat() if last_ad_date else None,
+                "days_since_last_ad": (today - last_ad_date).days if last_ad_date else None,
+                "ads_in_period": int(ads_in_period)
+            })
         
         return {
             "report_type": "Inactive Panel Report",
@@ -406,41 +562,29 @@ class ReportsService:
         
         start_date = date.today() - timedelta(days=days_period)
         
-        # Get all inventory items
-        inventory_items = self.db.query(Inventory).all()
+        # Consider slow if turnover rate < 0.1 units/day and stock > 10
+        rows = SalesVelocityAggregator(self.db).velocity_rows(
+            start_date, days_period, **SLOW_MOVING_THRESHOLDS
+        )
         slow_movers = []
         
-        for inv in inventory_items:
-            # Calculate sales for this garment-size in the period
-            sales_count = self.db.query(func.sum(Sale.quantity)).filter(
-                and_(
-                    Sale.garment_id == inv.garment_id,
-                    Sale.size == inv.size,
-                    Sale.transaction_date >= start_date,
-                    Sale.is_return == False
-                )
-            ).scalar() or 0
+        for row in rows:
+            sales_count = row.units_sold
             
             # Calculate turnover rate (sales per day)
             turnover_rate = float(sales_count) / days_period if sales_count > 0 else 0
             
-            # Consider slow if turnover rate < 0.1 units/day and stock > 10
-            if turnover_rate < 0.1 and inv.good_stock > 10:
-                garment = self.db.query(Garment).filter(
-                    Garment.id == inv.garment_id
-                ).first()
-                
-                slow_movers.append({
-                    "garment_id": inv.garment_id,
-                    "garment_name": garment.name if garment else "Unknown",
-                    "style_sku": garment.style_sku if garment else "Unknown",
-                    "size": inv.size,
-                    "good_stock": inv.good_stock,
-                    "virtual_stock": inv.virtual_stock,
-                    "sales_in_period": int(sales_count),
-                    "turnover_rate_per_day": round(turnover_rate, 3),
-                    "days_of_stock": round(inv.good_stock / turnover_rate, 1) if turnover_rate > 0 else float('inf')
-                })
+            slow_movers.append({
+                "garment_id": row.garment_id,
+                "garment_name": row.garment_name or "Unknown",
+                "style_sku": row.style_sku or "Unknown",
+                "size": row.size,
+                "good_stock": row.good_stock,
+                "virtual_stock": row.virtual_stock,
+                "sales_in_period": int(sales_count),
+                "turnover_rate_per_day": round(turnover_rate, 3),
+                "days_of_stock": round(row.good_stock / turnover_rate, 1) if turnover_rate > 0 else float('inf')
+            })
         
         return {
             "report_type": "Slow Moving Inventory Report",
@@ -457,43 +601,32 @@ class ReportsService:
         
         start_date = date.today() - timedelta(days=days_period)
         
-        inventory_items = self.db.query(Inventory).all()
+        # Consider fast if turnover rate > 1 unit/day
+        rows = SalesVelocityAggregator(self.db).velocity_rows(
+            start_date, days_period, **FAST_MOVING_THRESHOLDS
+        )
         fast_movers = []
         
-        for inv in inventory_items:
-            sales_count = self.db.query(func.sum(Sale.quantity)).filter(
-                and_(
-                    Sale.garment_id == inv.garment_id,
-                    Sale.size == inv.size,
-                    Sale.transaction_date >= start_date,
-                    Sale.is_return == False
-                )
-            ).scalar() or 0
-            
+        for row in rows:
+            sales_count = row.units_sold
             turnover_rate = float(sales_count) / days_period if sales_count > 0 else 0
             
-            # Consider fast if turnover rate > 1 unit/day
-            if turnover_rate > 1.0:
-                garment = self.db.query(Garment).filter(
-                    Garment.id == inv.garment_id
-                ).first()
-                
-                # Calculate reorder recommendation
-                days_of_stock = inv.good_stock / turnover_rate if turnover_rate > 0 else 0
-                needs_reorder = days_of_stock < 30  # Less than 30 days of stock
-                
-                fast_movers.append({
-                    "garment_id": inv.garment_id,
-                    "garment_name": garment.name if garment else "Unknown",
-                    "style_sku": garment.style_sku if garment else "Unknown",
-                    "size": inv.size,
-                    "good_stock": inv.good_stock,
-                    "sales_in_period": int(sales_count),
-                    "turnover_rate_per_day": round(turnover_rate, 2),
-                    "days_of_stock_remaining": round(days_of_stock, 1),
-                    "needs_reorder": needs_reorder,
-                    "recommended_order_quantity": round(turnover_rate * 60, 0) if needs_reorder else 0
-                })
+            # Calculate reorder recommendation
+            days_of_stock = row.good_stock / turnover_rate if turnover_rate > 0 else 0
+            needs_reorder = days_of_stock < 30  # Less than 30 days of stock
+            
+            fast_movers.append({
+                "garment_id": row.garment_id,
+                "garment_name": row.garment_name or "Unknown",
+                "style_sku": row.style_sku or "Unknown",
+                "size": row.size,
+                "good_stock": row.good_stock,
+                "sales_in_period": int(sales_count),
+                "turnover_rate_per_day": round(turnover_rate, 2),
+                "days_of_stock_remaining": round(days_of_stock, 1),
+                "needs_reorder": needs_reorder,
+                "recommended_order_quantity": round(turnover_rate * 60, 0) if needs_reorder else 0
+            })
         
         # Sort by turnover rate descending
         fast_movers.sort(key=lambda x: x["turnover_rate_per_day"], reverse=True)
@@ -508,6 +641,35 @@ class ReportsService:
             "fast_moving_items": fast_movers
         }
     
+    def inventory_classification_report(self, days_period: int = 90, bucket_days: int = 7) -> Dict[str, Any]:
+        """ABC (revenue) / XYZ (demand variability) classes, velocity and days of cover per SKU-size"""
+        report = InventoryAnalytics(self.db, use_rollup=self.use_rollup).classification_report(
+            days_period, bucket_days
+        )
+        return {
+            "report_type": "Inventory Classification Report",
+            "generated_at": datetime.utcnow().isoformat(),
+            **report
+        }
+    
+    def slow_moving_count(self, days_period: int = 90) -> int:
+        """Number of items the slow-moving inventory report would list"""
+        from datetime import timedelta
+        
+        start_date = date.today() - timedelta(days=days_period)
+        return SalesVelocityAggregator(self.db).velocity_count(
+            start_date, days_period, **SLOW_MOVING_THRESHOLDS
+        )
+    
+    def fast_moving_count(self, days_period: int = 90) -> int:
+        """Number of items the fast-moving inventory report would list"""
+        from datetime import timedelta
+        
+        start_date = date.today() - timedelta(days=days_period)
+        return SalesVelocityAggregator(self.db).velocity_count(
+            start_date, days_period, **FAST_MOVING_THRESHOLDS
+        )
+    
     # ==================== PRODUCTION REPORTS ====================
     
     def production_plan_report(
@@ -516,36 +678,45 @@ class ReportsService:
         end_date: Optional[date] = None
     ) -> Dict[str, Any]:
         """Generate production plan status report"""
-        query = self.db.query(ProductionPlan)
-        
+        in_range = []
         if start_date:
-            query = query.filter(ProductionPlan.target_date >= start_date)
+            in_range.append(ProductionPlan.target_date >= start_date)
         if end_date:
-            query = query.filter(ProductionPlan.target_date <= end_date)
-        
-        plans = query.all()
-        
-        # Group by status
+            in_range.append(ProductionPlan.target_date <= end_date)
+
+        # Cutting output and activity count per plan, correlated so only the
+        # activities of plans in range are read (production_plan_id index)
+        def activity_total(column):
+            return (
+                select(column)
+                .where(ProductionActivity.production_plan_id == ProductionPlan.id)
+                .scalar_subquery()
+            )
+
+        query = select(
+            ProductionPlan,
+            Garment.style_sku,
+            Garment.name.label("garment_name"),
+            activity_total(func.count(ProductionActivity.id)).label("activities_count"),
+            activity_total(func.sum(case(
+                (ProductionActivity.activity_type == "CUTTING", ProductionActivity.quantity), else_=0
+            ))).label("actual_quantity")
+        ).outerjoin(
+            Garment, Garment.id == ProductionPlan.garment_id
+        ).where(*in_range)
+        
+        rows = self.db.execute(query.order_by(ProductionPlan.id)).all()
+        
+        # Group by status; statuses outside the usual three get their own list
         status_summary = {
             "PLANNED": [],
             "IN_PROGRESS": [],
             "COMPLETED": []
         }
         
-        for plan in plans:
-            garment = self.db.query(Garment).filter(
-                Garment.id == plan.garment_id
-            ).first()
-            
-            # Get activities for this plan
-            activities = self.db.query(ProductionActivity).filter(
-                ProductionActivity.production_plan_id == plan.id
-            ).all()
-            
-            actual_quantity = sum(
-                float(a.quantity) for a in activities 
-                if a.activity_type == "CUTTING"
-            )
+        for row in rows:
+            plan = row.ProductionPlan
+            actual_quantity = float(row.actual_quantity or 0)
             
             completion_percentage = (
                 (actual_quantity / plan.planned_quantity * 100) 
@@ -555,18 +726,18 @@ class ReportsService:
             plan_data = {
                 "id": plan.id,
                 "plan_name": plan.plan_name,
-                "garment_sku": garment.style_sku if garment else "Unknown",
-                "garment_name": garment.name if garment else "Unknown",
+                "garment_sku": row.style_sku or "Unknown",
+                "garment_name": row.garment_name or "Unknown",
                 "planned_quantity": plan.planned_quantity,
                 "actual_quantity": actual_quantity,
                 "completion_percentage": round(completion_percentage, 2),
                 "target_date": plan.target_date.isoformat(),
                 "fabric_requirement": float(plan.fabric_requirement) if plan.fabric_requirement else 0,
                 "yarn_requirement": float(plan.yarn_requirement) if plan.yarn_requirement else 0,
-                "activities_count": len(activities)
+                "activities_count": row.activities_count or 0
             }
             
-            status_summary[plan.status].append(plan_data)
+            status_summary.setdefault(plan.status, []).append(plan_data)
         
         return {
             "report_type": "Production Plan Report",
@@ -576,7 +747,7 @@ class ReportsService:
             },
             "generated_at": datetime.utcnow().isoformat(),
             "summary": {
-                "total_plans": len(plans),
+                "total_plans": len(rows),
                 "planned": len(status_summary["PLANNED"]),
                 "in_progress": len(status_summary["IN_PROGRESS"]),
                 "completed": len(status_summary["COMPLETED"])
@@ -584,29 +755,52 @@ class ReportsService:
             "plans_by_status": status_summary
         }
     
+    def production_plan_summary(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """Summary block of the production plan report without plan details"""
+        query = self.db.query(
+            ProductionPlan.status, func.count(ProductionPlan.id)
+        )
+        
+        if start_date:
+            query = query.filter(ProductionPlan.target_date >= start_date)
+        if end_date:
+            query = query.filter(ProductionPlan.target_date <= end_date)
+        
+        counts = dict(query.group_by(ProductionPlan.status).all())
+        
+        return {
+            "total_plans": sum(counts.values()),
+            "planned": counts.get("PLANNED", 0),
+            "in_progress": counts.get("IN_PROGRESS", 0),
+            "completed": counts.get("COMPLETED", 0)
+        }
+    
     def daily_production_variance_report(self, report_date: date) -> Dict[str, Any]:
         """Generate daily production report with gross weight variance"""
-        activities = self.db.query(ProductionActivity).filter(
-            ProductionActivity.activity_date == report_date
+        activities = self.db.execute(
+            select(ProductionActivity, ProductionPlan.plan_name)
+            .outerjoin(ProductionPlan, ProductionPlan.id == ProductionActivity.production_plan_id)
+            .where(ProductionActivity.activity_date == report_date)
+            .order_by(ProductionActivity.id)
         ).all()
         
         variance_data = []
         total_variance = 0
         
-        for activity in activities:
+        for activity, plan_name in activities:
             if activity.gross_weight_calculated and activity.gross_weight_actual:
                 calculated = float(activity.gross_weight_calculated)
                 actual = float(activity.gross_weight_actual)
                 variance = actual - calculated
                 variance_percentage = (variance / calculated * 100) if calculated > 0 else 0
                 
-                plan = self.db.query(ProductionPlan).filter(
-                    ProductionPlan.id == activity.production_plan_id
-                ).first()
-                
                 variance_data.append({
                     "activity_id": activity.id,
-                    "production_plan": plan.plan_name if plan else "Unknown",
+                    "production_plan": plan_name or "Unknown",
                     "activity_type": activity.activity_type,
                     "quantity": float(activity.quantity),
                     "gross_weight_calculated": calculated,
@@ -643,10 +837,16 @@ class ReportsService:
         """
         Generate purchase raise report for yarn based on stock levels and forecasted demand.
         
+        Demand comes from open production plans plus the precomputed garment
+        demand forecasts (see DemandForecastService.refresh); nothing is
+        fitted per request.
+        
         Args:
             min_stock_threshold: Minimum stock level to trigger purchase
             days_forecast: Number of days to forecast demand
         """
+        forecast_service = DemandForecastService(self.db, use_rollup=self.use_rollup)
+        demand = forecast_service.yarn_demand(days_forecast)
         yarns = self.db.query(Yarn).all()
         
         purchase_recommendations = []
@@ -654,13 +854,10 @@ class ReportsService:
         
         for yarn in yarns:
             current_stock = float(yarn.stock_quantity or 0)
-            unit_cost = float(yarn.cost_per_unit or 0)
-            
-            # Calculate average daily consumption (simplified - you can enhance this)
-            # This would ideally look at production plans and fabric requirements
-            avg_daily_consumption = 10.0  # Placeholder - should calculate from production data
+            unit_cost = float(yarn.unit_price or 0)
+            yarn_demand = demand.get(yarn.id, {})
+            forecasted_requirement = yarn_demand.get("total", 0.0)
             
-            forecasted_requirement = avg_daily_consumption * days_forecast
             shortage = max(0, min_stock_threshold + forecasted_requirement - current_stock)
             
             if shortage > 0 or current_stock < min_stock_threshold:
@@ -673,7 +870,9 @@ class ReportsService:
                     "composition": yarn.composition,
                     "current_stock": round(current_stock, 2),
                     "minimum_threshold": min_stock_threshold,
-                    "forecasted_requirement_30days": round(forecasted_requirement, 2),
+                    "avg_daily_consumption": round(yarn_demand.get("avg_daily", 0.0), 2),
+                    "committed_requirement": round(yarn_demand.get("committed", 0.0), 2),
+                    "forecasted_requirement": round(forecasted_requirement, 2),
                     "shortage": round(shortage, 2),
                     "recommended_order_quantity": round(recommended_order_qty, 2),
                     "unit_cost": round(unit_cost, 2),
@@ -696,6 +895,7 @@ class ReportsService:
         return {
             "report_type": "Purchase Raise for Yarn",
             "generated_at": datetime.utcnow().isoformat(),
+            "forecasts_fitted_at": forecast_service.fitted_at(),
             "parameters": {
                 "min_stock_threshold": min_stock_threshold,
                 "forecast_period_days": days_forecast
@@ -708,6 +908,38 @@ class ReportsService:
             "purchase_recommendations": purchase_recommendations
         }
     
+    def yarn_forecast_report(self, forecast_days: int = 30) -> Dict[str, Any]:
+        """Forecast yarn consumption and days until stockout for every yarn"""
+        forecast_service = DemandForecastService(self.db, use_rollup=self.use_rollup)
+        demand = forecast_service.yarn_demand(forecast_days)
+        
+        items = []
+        for yarn in self.db.query(Yarn).order_by(Yarn.id):
+            current_stock = float(yarn.stock_quantity or 0)
+            yarn_demand = demand.get(yarn.id, {})
+            avg_daily = yarn_demand.get("avg_daily", 0.0)
+            forecasted_demand = yarn_demand.get("total", 0.0)
+            items.append({
+                "yarn_id": yarn.id,
+                "yarn_type": yarn.yarn_type,
+                "yarn_count": yarn.yarn_count,
+                "current_stock": round(current_stock, 2),
+                "avg_daily_consumption": round(avg_daily, 2),
+                "committed_demand": round(yarn_demand.get("committed", 0.0), 2),
+                "forecasted_demand": round(forecasted_demand, 2),
+                "days_until_stockout": round(current_stock / avg_daily, 1) if avg_daily > 0 else None,
+                "recommended_order": round(max(0.0, forecasted_demand - current_stock), 2),
+                "unit": yarn.unit
+            })
+        
+        return {
+            "report_type": "Yarn Forecast Report",
+            "generated_at": datetime.utcnow().isoformat(),
+            "forecasts_fitted_at": forecast_service.fitted_at(),
+            "forecast_days": forecast_days,
+            "items": items
+        }
+    
     # ==================== BUNDLE SKU REPORTS ====================
     
     def bundle_sku_sales_report(
@@ -723,9 +955,9 @@ class ReportsService:
         query = self.db.query(Sale).join(Garment)
         
         if start_date:
-            query = query.filter(Sale.sale_date >= start_date)
+            query = query.filter(Sale.transaction_date >= start_date)
         if end_date:
-            query = query.filter(Sale.sale_date <= end_date)
+            query = query.filter(Sale.transaction_date <= end_date)
         
         # Identify bundles - products with "BUNDLE", "COMBO", "SET" in category or name
         query = query.filter(
@@ -747,7 +979,7 @@ class ReportsService:
             if garment_id not in bundle_data:
                 bundle_data[garment_id] = {
                     "garment_id": garment_id,
-                    "sku": sale.garment.sku,
+                    "sku": sale.garment.style_sku,
                     "name": sale.garment.name,
                     "category": sale.garment.category,
                     "mrp": float(sale.garment.mrp or 0),
@@ -797,21 +1029,62 @@ class ReportsService:
     
     # ==================== DISCOUNT REPORTS ====================
     
+    @staticmethod
+    def discount_lines_statement(
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        include_returns: bool = True
+    ) -> Select:
+        """Sale lines joined to garment pricing for the general discount report"""
+        statement = select(
+            Sale.id,
+            Sale.transaction_date,
+            Sale.quantity,
+            Sale.unit_price,
+            Sale.discount_percentage,
+            Sale.is_return,
+            Garment.style_sku,
+            Garment.name,
+            Garment.mrp
+        ).join(Garment, Sale.garment_id == Garment.id)
+        
+        if start_date:
+            statement = statement.where(Sale.transaction_date >= start_date)
+        if end_date:
+            statement = statement.where(Sale.transaction_date <= end_date)
+        if not include_returns:
+            statement = statement.where(Sale.is_return.is_(False))
+        
+        return statement.order_by(Sale.id)
+    
+    @staticmethod
+    def discount_line(row) -> Dict[str, Any]:
+        """Serialize one row of ``discount_lines_statement``"""
+        mrp = float(row.mrp or 0)
+        unit_price = float(row.unit_price or 0)
+        qty = row.quantity
+        mrp_value = mrp * qty
+        selling_value = unit_price * qty
+        return {
+            "sale_id": row.id,
+            "sale_date": row.transaction_date.isoformat(),
+            "sku": row.style_sku,
+            "garment_name": row.name,
+            "quantity": qty,
+            "mrp": round(mrp, 2),
+            "selling_price": round(unit_price, 2),
+            "discount_percentage": round(float(row.discount_percentage or 0), 2),
+            "discount_amount": round(mrp_value - selling_value, 2),
+            "total_mrp_value": round(mrp_value, 2),
+            "total_selling_value": round(selling_value, 2)
+        }
+    
     def discount_report_general(
         self,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None
     ) -> Dict[str, Any]:
         """Generate general discount report across all sales"""
-        query = self.db.query(Sale).join(Garment)
-        
-        if start_date:
-            query = query.filter(Sale.sale_date >= start_date)
-        if end_date:
-            query = query.filter(Sale.sale_date <= end_date)
-        
-        sales = query.all()
-        
         total_mrp_value = 0
         total_selling_price = 0
         total_discount_amount = 0
@@ -825,19 +1098,18 @@ class ReportsService:
         
         sales_data = []
         
-        for sale in sales:
-            mrp = float(sale.garment.mrp or 0)
-            unit_price = float(sale.unit_price or 0)
-            qty = sale.quantity
-            discount_pct = float(sale.discount_percentage or 0)
-            
-            mrp_value = mrp * qty
-            selling_value = unit_price * qty
-            discount_amt = mrp_value - selling_value
+        rows = self.db.execute(
+            self.discount_lines_statement(start_date, end_date)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        for row in rows:
+            mrp_value = float(row.mrp or 0) * row.quantity
+            selling_value = float(row.unit_price or 0) * row.quantity
+            discount_pct = float(row.discount_percentage or 0)
             
             total_mrp_value += mrp_value
             total_selling_price += selling_value
-            total_discount_amount += discount_amt
+            total_discount_amount += mrp_value - selling_value
             
             # Categorize discount
             if discount_pct < 10:
@@ -851,20 +1123,8 @@ class ReportsService:
             else:
                 discount_buckets["40%+"] += 1
             
-            if not sale.is_return:  # Only include actual sales
-                sales_data.append({
-                    "sale_id": sale.id,
-                    "sale_date": sale.sale_date.isoformat(),
-                    "sku": sale.garment.sku,
-                    "garment_name": sale.garment.name,
-                    "quantity": qty,
-                    "mrp": round(mrp, 2),
-                    "selling_price": round(unit_price, 2),
-                    "discount_percentage": round(discount_pct, 2),
-                    "discount_amount": round(discount_amt, 2),
-                    "total_mrp_value": round(mrp_value, 2),
-                    "total_selling_value": round(selling_value, 2)
-                })
+            if not row.is_return:  # Only include actual sales
+                sales_data.append(self.discount_line(row))
         
         overall_discount_pct = (
             (total_discount_amount / total_mrp_value * 100) if total_mrp_value > 0 else 0
@@ -878,7 +1138,7 @@ class ReportsService:
                 "end_date": end_date.isoformat() if end_date else None
             },
             "summary": {
-                "total_transactions": len([s for s in sales if not s.is_return]),
+                "total_transactions": len(sales_data),
                 "total_mrp_value": round(total_mrp_value, 2),
                 "total_selling_price": round(total_selling_price, 2),
                 "total_discount_amount": round(total_discount_amount, 2),
@@ -894,12 +1154,51 @@ class ReportsService:
         end_date: Optional[date] = None
     ) -> Dict[str, Any]:
         """Generate discount report grouped by sales panel"""
+        if self.use_rollup:
+            panel_data = self._discount_by_panel_from_rollup(start_date, end_date)
+        else:
+            panel_data = self._discount_by_panel_from_sales(start_date, end_date)
+        
+        # Calculate average discount percentage for each panel
+        for panel_id, data in panel_data.items():
+            if data["total_mrp_value"] > 0:
+                data["average_discount_percentage"] = round(
+                    (data["total_discount_amount"] / data["total_mrp_value"]) * 100, 2
+                )
+            data["total_mrp_value"] = round(data["total_mrp_value"], 2)
+            data["total_selling_value"] = round(data["total_selling_value"], 2)
+            data["total_discount_amount"] = round(data["total_discount_amount"], 2)
+        
+        panels_list = list(panel_data.values())
+        panels_list.sort(key=lambda x: x["total_discount_amount"], reverse=True)
+        
+        return {
+            "report_type": "Discount Report - By Panel",
+            "generated_at": datetime.utcnow().isoformat(),
+            "period": {
+                "start_date": start_date.isoformat() if start_date else None,
+                "end_date": end_date.isoformat() if end_date else None
+            },
+            "summary": {
+                "total_panels": len(panels_list),
+                "total_discount_amount": round(
+                    sum(p["total_discount_amount"] for p in panels_list), 2
+                )
+            },
+            "panels": panels_list
+        }
+    
+    def _discount_by_panel_from_sales(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> Dict[int, Dict[str, Any]]:
         query = self.db.query(Sale).join(Garment).join(Panel)
         
         if start_date:
-            query = query.filter(Sale.sale_date >= start_date)
+            query = query.filter(Sale.transaction_date >= start_date)
         if end_date:
-            query = query.filter(Sale.sale_date <= end_date)
+            query = query.filter(Sale.transaction_date <= end_date)
         
         sales = query.all()
         
@@ -935,33 +1234,47 @@ class ReportsService:
             panel_data[panel_id]["total_selling_value"] += selling_value
             panel_data[panel_id]["total_discount_amount"] += discount_amt
         
-        # Calculate average discount percentage for each panel
-        for panel_id, data in panel_data.items():
-            if data["total_mrp_value"] > 0:
-                data["average_discount_percentage"] = round(
-                    (data["total_discount_amount"] / data["total_mrp_value"]) * 100, 2
-                )
-            data["total_mrp_value"] = round(data["total_mrp_value"], 2)
-            data["total_selling_value"] = round(data["total_selling_value"], 2)
-            data["total_discount_amount"] = round(data["total_discount_amount"], 2)
+        return panel_data
+    
+    def _discount_by_panel_from_rollup(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> Dict[int, Dict[str, Any]]:
+        query = self.db.query(
+            SalesDailyRollup.panel_id,
+            Panel.panel_name,
+            Panel.panel_type,
+            func.sum(SalesDailyRollup.transaction_count).label("transaction_count"),
+            func.sum(SalesDailyRollup.quantity * Garment.mrp).label("mrp_value"),
+            func.sum(SalesDailyRollup.gross_amount).label("selling_value")
+        ).join(
+            Panel, Panel.id == SalesDailyRollup.panel_id
+        ).join(
+            Garment, Garment.id == SalesDailyRollup.garment_id
+        ).filter(SalesDailyRollup.is_return == False)
         
-        panels_list = list(panel_data.values())
-        panels_list.sort(key=lambda x: x["total_discount_amount"], reverse=True)
+        if start_date:
+            query = query.filter(SalesDailyRollup.transaction_date >= start_date)
+        if end_date:
+            query = query.filter(SalesDailyRollup.transaction_date <= end_date)
+        
+        rows = query.group_by(
+            SalesDailyRollup.panel_id, Panel.panel_name, Panel.panel_type
+        ).all()
         
         return {
-            "report_type": "Discount Report - By Panel",
-            "generated_at": datetime.utcnow().isoformat(),
-            "period": {
-                "start_date": start_date.isoformat() if start_date else None,
-                "end_date": end_date.isoformat() if end_date else None
-            },
-            "summary": {
-                "total_panels": len(panels_list),
-                "total_discount_amount": round(
-                    sum(p["total_discount_amount"] for p in panels_list), 2
-                )
-            },
-            "panels": panels_list
+            row.panel_id: {
+                "panel_id": row.panel_id,
+                "panel_name": row.panel_name,
+                "panel_type": row.panel_type,
+                "total_transactions": int(row.transaction_count),
+                "total_mrp_value": float(row.mrp_value or 0),
+                "total_selling_value": float(row.selling_value or 0),
+                "total_discount_amount": float(row.mrp_value or 0) - float(row.selling_value or 0),
+                "average_discount_percentage": 0
+            }
+            for row in rows
         }
     
     def settlement_report(
@@ -973,14 +1286,68 @@ class ReportsService:
         """
         Generate settlement report for panels showing amounts due/payable.
         """
+        if self.use_rollup:
+            panel_settlements = self._settlements_from_rollup(panel_id, start_date, end_date)
+        else:
+            panel_settlements = self._settlements_from_sales(panel_id, start_date, end_date)
+        
+        # Calculate commissions and payables
+        for pid, data in panel_settlements.items():
+            net_sales = data["net_sales_value"]
+            
+            # Assuming 10% platform commission (should be configurable per panel)
+            data["platform_commission"] = round(net_sales * 0.10, 2)
+            
+            # Assuming 5% logistics (should be actual data)
+            data["logistics_charges"] = round(net_sales * 0.05, 2)
+            
+            # Calculate final payable amount
+            data["amount_payable_to_panel"] = round(
+                net_sales - data["platform_commission"] - data["logistics_charges"] - data["other_deductions"],
+                2
+            )
+            
+            # Round other values
+            data["total_sales_value"] = round(data["total_sales_value"], 2)
+            data["total_returns_value"] = round(data["total_returns_value"], 2)
+            data["net_sales_value"] = round(data["net_sales_value"], 2)
+        
+        settlements_list = list(panel_settlements.values())
+        settlements_list.sort(key=lambda x: x["net_sales_value"], reverse=True)
+        
+        total_payable = sum(s["amount_payable_to_panel"] for s in settlements_list)
+        
+        return {
+            "report_type": "Settlement Report",
+            "generated_at": datetime.utcnow().isoformat(),
+            "period": {
+                "start_date": start_date.isoformat() if start_date else None,
+                "end_date": end_date.isoformat() if end_date else None
+            },
+            "summary": {
+                "total_panels": len(settlements_list),
+                "total_amount_payable": round(total_payable, 2),
+                "total_net_sales": round(
+                    sum(s["net_sales_value"] for s in settlements_list), 2
+                )
+            },
+            "settlements": settlements_list
+        }
+    
+    def _settlements_from_sales(
+        self,
+        panel_id: Optional[int],
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> Dict[int, Dict[str, Any]]:
         query = self.db.query(Sale).join(Garment).join(Panel)
         
         if panel_id:
             query = query.filter(Sale.panel_id == panel_id)
         if start_date:
-            query = query.filter(Sale.sale_date >= start_date)
+            query = query.filter(Sale.transaction_date >= start_date)
         if end_date:
-            query = query.filter(Sale.sale_date <= end_date)
+            query = query.filter(Sale.transaction_date <= end_date)
         
         sales = query.all()
         
@@ -1016,45 +1383,74 @@ class ReportsService:
                 panel_settlements[pid]["total_returns_value"]
             )
         
-        # Calculate commissions and payables
-        for pid, data in panel_settlements.items():
-            net_sales = data["net_sales_value"]
+        return panel_settlements
+    
+    def _settlements_from_rollup(
+        self,
+        panel_id: Optional[int],
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> Dict[int, Dict[str, Any]]:
+        filters = {"panel_id": panel_id} if panel_id else {}
+        rows = self._rollup_totals(
+            [SalesDailyRollup.panel_id, SalesDailyRollup.is_return],
+            start_date, end_date, **filters
+        )
+        panels = {
+            p.id: p for p in self.db.query(Panel).filter(
+                Panel.id.in_({row.panel_id for row in rows})
+            )
+        }
+        
+        panel_settlements = {}
+        
+        for row in rows:
+            pid = row.panel_id
+            if pid not in panel_settlements:
+                panel_settlements[pid] = {
+                    "panel_id": pid,
+                    "panel_name": panels[pid].panel_name,
+                    "panel_type": panels[pid].panel_type,
+                    "total_sales_value": 0,
+                    "total_returns_value": 0,
+                    "net_sales_value": 0,
+                    "platform_commission": 0,
+                    "logistics_charges": 0,
+                    "other_deductions": 0,
+                    "amount_payable_to_panel": 0,
+                    "transaction_count": 0
+                }
             
-            # Assuming 10% platform commission (should be configurable per panel)
-            data["platform_commission"] = round(net_sales * 0.10, 2)
+            amount = float(row.total_amount or 0)
             
-            # Assuming 5% logistics (should be actual data)
-            data["logistics_charges"] = round(net_sales * 0.05, 2)
+            if row.is_return:
+                panel_settlements[pid]["total_returns_value"] += amount
+            else:
+                panel_settlements[pid]["total_sales_value"] += amount
+                panel_settlements[pid]["transaction_count"] += int(row.transaction_count)
             
-            # Calculate final payable amount
-            data["amount_payable_to_panel"] = round(
-                net_sales - data["platform_commission"] - data["logistics_charges"] - data["other_deductions"],
-                2
+            panel_settlements[pid]["net_sales_value"] = (
+                panel_settlements[pid]["total_sales_value"] - 
+                panel_settlements[pid]["total_returns_value"]
             )
-            
-            # Round other values
-            data["total_sales_value"] = round(data["total_sales_value"], 2)
-            data["total_returns_value"] = round(data["total_returns_value"], 2)
-            data["net_sales_value"] = round(data["net_sales_value"], 2)
-        
-        settlements_list = list(panel_settlements.values())
-        settlements_list.sort(key=lambda x: x["net_sales_value"], reverse=True)
         
-        total_payable = sum(s["amount_payable_to_panel"] for s in settlements_list)
+        return panel_settlements
+    
+    # ==================== SUMMARY ====================
+    
+    @staticmethod
+    def summary_sections(report_date: date) -> Dict[str, Callable[["ReportsService"], Any]]:
+        """
+        Independent sections of the combined summary report.
         
+        Each section reads only aggregates, so the dashboard gets the same
+        figures as the full reports without building their line items, and
+        callers can run the sections concurrently on separate sessions.
+        """
         return {
-            "report_type": "Settlement Report",
-            "generated_at": datetime.utcnow().isoformat(),
-            "period": {
-                "start_date": start_date.isoformat() if start_date else None,
-                "end_date": end_date.isoformat() if end_date else None
-            },
-            "summary": {
-                "total_panels": len(settlements_list),
-                "total_amount_payable": round(total_payable, 2),
-                "total_net_sales": round(
-                    sum(s["net_sales_value"] for s in settlements_list), 2
-                )
-            },
-            "settlements": settlements_list
+            "fabric_stock": lambda service: service.fabric_stock_summary(),
+            "daily_sales": lambda service: service.daily_sales_summary(report_date),
+            "slow_moving_count": lambda service: service.slow_moving_count(90),
+            "fast_moving_count": lambda service: service.fast_moving_count(90),
+            "production_plans": lambda service: service.production_plan_summary()
         }
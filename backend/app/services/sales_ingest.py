@@ -0,0 +1,138 @@
+import csv
+import io
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.db.models import Garment, Panel, Sale
+from app.schemas.sale import SaleCreate
+from app.services.panel_activity import PanelActivityService
+from app.services.sales_rollup import SalesRollupService
+from app.services.stock import StockService
+
+SALE_COLUMNS = [
+    "transaction_date", "garment_id", "panel_id", "size", "quantity",
+    "unit_price", "discount_percentage", "total_amount", "is_return", "invoice_number"
+]
+
+
+class SalesIngestionService:
+    """
+    Bulk loader for end-of-day panel sale/return files.
+
+    Rows are validated individually, garment and panel IDs are checked
+    against sets loaded once for the whole batch, and valid rows are written
+    in one transaction with PostgreSQL COPY (or a batched executemany on
+    other databases), together with their rollup totals and stock
+    movements. Rows that fail are reported back by position.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def ingest(
+        self,
+        rows: Iterable[Mapping[str, Any]],
+        atomic: bool = False,
+        use_copy: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Validate and insert sale rows.
+
+        Args:
+            rows: Raw sale dicts (JSON objects or CSV records)
+            atomic: Reject the whole batch if any row is invalid
+            use_copy: Use COPY FROM STDIN when connected to PostgreSQL
+
+        Row numbers in the error report are 1-based positions in ``rows``.
+        The caller commits.
+        """
+        valid: List[Tuple[int, Dict[str, Any]]] = []
+        errors: List[Dict[str, Any]] = []
+        received = 0
+
+        for received, raw in enumerate(rows, start=1):
+            try:
+                sale = SaleCreate.model_validate(raw)
+            except ValidationError as exc:
+                errors.append({
+                    "row": received,
+                    "errors": [
+                        f"{'.'.join(str(p) for p in e['loc']) or 'row'}: {e['msg']}"
+                        for e in exc.errors()
+                    ]
+                })
+                continue
+            valid.append((received, sale.model_dump()))
+
+        garment_ids = self._existing_ids(Garment, {row["garment_id"] for _, row in valid})
+        panel_ids = self._existing_ids(Panel, {row["panel_id"] for _, row in valid})
+
+        accepted: List[Dict[str, Any]] = []
+        for position, row in valid:
+            row_errors = []
+            if row["garment_id"] not in garment_ids:
+                row_errors.append(f"garment_id: Garment {row['garment_id']} not found")
+            if row["panel_id"] not in panel_ids:
+                row_errors.append(f"panel_id: Panel {row['panel_id']} not found")
+            if row_errors:
+                errors.append({"row": position, "errors": row_errors})
+            else:
+                accepted.append(row)
+
+        errors.sort(key=lambda e: e["row"])
+        if atomic and errors:
+            accepted = []
+
+        if accepted:
+            if use_copy and self.db.get_bind().dialect.name == "postgresql":
+                self._copy(accepted)
+            else:
+                self.db.execute(insert(Sale), accepted)
+            SalesRollupService(self.db).apply(accepted)
+            PanelActivityService(self.db).record_sales(accepted)
+            StockService(self.db).post_sales(accepted)
+
+        return {
+            "received": received,
+            "inserted": len(accepted),
+            "rejected": received - len(accepted),
+            "errors": errors
+        }
+
+    def _existing_ids(self, model, ids: set) -> set:
+        if not ids:
+            return set()
+        return {
+            row_id for (row_id,) in self.db.query(model.id).filter(model.id.in_(ids))
+        }
+
+    def _copy(self, rows: List[Dict[str, Any]]) -> None:
+        """Stream rows into sales with COPY on the session's own connection."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([
+                "" if row[c] is None else row[c] for c in SALE_COLUMNS
+            ])
+        buffer.seek(0)
+
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY sales ({', '.join(SALE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
+
+
+def read_sales_csv(stream: io.IOBase) -> Iterable[Dict[str, Any]]:
+    """Yield CSV records with blank cells treated as missing values."""
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig"))
+    for record in reader:
+        yield {
+            key.strip(): value
+            for key, value in record.items()
+            if key and value not in (None, "")
+        }
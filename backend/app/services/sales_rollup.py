@@ -0,0 +1,208 @@
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy import func, and_, delete, select, insert
+from app.db.models import PartitionArchive, Sale, SalesDailyRollup
+from app.db.upsert import upsert_insert
+
+RollupKey = Tuple[date, int, int, str, bool]
+
+KEY_COLUMNS = ("transaction_date", "panel_id", "garment_id", "size", "is_return")
+MEASURE_COLUMNS = ("transaction_count", "quantity", "gross_amount", "total_amount", "discount_amount")
+
+
+class ArchivedPeriodError(ValueError):
+    """A rebuild or check reaches into sales months that were archived and dropped."""
+
+
+class SalesRollupService:
+    """Maintains the sales_daily_rollup fact table"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply(self, sales: Iterable[Mapping[str, Any]]) -> int:
+        """
+        Add newly written sale rows to the rollup.
+
+        Must run in the same transaction as the sale INSERTs. Rows are
+        pre-aggregated per key and merged with ON CONFLICT DO UPDATE, so
+        concurrent writers add to the totals instead of overwriting them.
+        Returns the number of rollup keys touched.
+        """
+        totals: Dict[RollupKey, Dict[str, Any]] = {}
+        for sale in sales:
+            key = (
+                sale["transaction_date"],
+                sale["panel_id"],
+                sale["garment_id"],
+                sale["size"],
+                bool(sale.get("is_return", False))
+            )
+            quantity = int(sale["quantity"])
+            gross_amount = Decimal(str(sale["unit_price"])) * quantity
+            total_amount = Decimal(str(sale["total_amount"]))
+
+            bucket = totals.setdefault(key, dict.fromkeys(MEASURE_COLUMNS, 0))
+            bucket["transaction_count"] += 1
+            bucket["quantity"] += quantity
+            bucket["gross_amount"] += gross_amount
+            bucket["total_amount"] += total_amount
+            bucket["discount_amount"] += gross_amount - total_amount
+
+        if not totals:
+            return 0
+
+        rows = [
+            {**dict(zip(KEY_COLUMNS, key)), **measures}
+            for key, measures in totals.items()
+        ]
+        stmt = upsert_insert(self.db, SalesDailyRollup)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(KEY_COLUMNS),
+            set_={
+                **{
+                    c: getattr(SalesDailyRollup, c) + getattr(stmt.excluded, c)
+                    for c in MEASURE_COLUMNS
+                },
+                "updated_at": func.now()
+            }
+        )
+        self.db.execute(stmt, rows)
+        return len(rows)
+
+    def _live_period(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> Tuple[Optional[date], Optional[date]]:
+        """
+        Clamp a period to the sales still in the database. Archived months
+        only survive in the rollup, so an open start begins at the archive
+        watermark and an explicit bound before it is refused.
+        """
+        archived_before = self.db.scalar(
+            select(PartitionArchive.archived_before).where(PartitionArchive.table_name == "sales")
+        )
+        if archived_before is None:
+            return start_date, end_date
+        for bound in (start_date, end_date):
+            if bound and bound < archived_before:
+                raise ArchivedPeriodError(
+                    f"sales before {archived_before.isoformat()} are archived; "
+                    "their rollup totals cannot be rebuilt or checked from raw sales"
+                )
+        return start_date or archived_before, end_date
+
+    def _raw_totals_query(self, start_date: Optional[date], end_date: Optional[date]):
+        """Rollup-shaped totals computed from the raw sales table"""
+        gross_amount = func.sum(Sale.unit_price * Sale.quantity)
+        total_amount = func.sum(Sale.total_amount)
+        query = select(
+            Sale.transaction_date,
+            Sale.panel_id,
+            Sale.garment_id,
+            Sale.size,
+            Sale.is_return,
+            func.count(Sale.id).label("transaction_count"),
+            func.sum(Sale.quantity).label("quantity"),
+            gross_amount.label("gross_amount"),
+            total_amount.label("total_amount"),
+            (gross_amount - total_amount).label("discount_amount")
+        )
+        if start_date:
+            query = query.where(Sale.transaction_date >= start_date)
+        if end_date:
+            query = query.where(Sale.transaction_date <= end_date)
+        return query.group_by(
+            Sale.transaction_date, Sale.panel_id, Sale.garment_id, Sale.size, Sale.is_return
+        )
+
+    def rebuild(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> int:
+        """
+        Recompute the rollup from raw sales for a date range (all dates
+        still in the database if no bounds are given). Used for the initial
+        backfill and to repair drift reported by check_consistency. Raises
+        ArchivedPeriodError for a range reaching into archived months.
+        Returns rows written.
+        """
+        start_date, end_date = self._live_period(start_date, end_date)
+        conditions = []
+        if start_date:
+            conditions.append(SalesDailyRollup.transaction_date >= start_date)
+        if end_date:
+            conditions.append(SalesDailyRollup.transaction_date <= end_date)
+
+        stmt = delete(SalesDailyRollup)
+        if conditions:
+            stmt = stmt.where(and_(*conditions))
+        self.db.execute(stmt)
+        result = self.db.execute(
+            insert(SalesDailyRollup).from_select(
+                list(KEY_COLUMNS) + list(MEASURE_COLUMNS),
+                self._raw_totals_query(start_date, end_date)
+            )
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def check_consistency(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """
+        Compare rollup totals against the raw sales table, over the dates
+        still in the database if no bounds are given
+        """
+        start_date, end_date = self._live_period(start_date, end_date)
+        raw = {
+            tuple(row[:5]): tuple(row[5:])
+            for row in self.db.execute(self._raw_totals_query(start_date, end_date))
+        }
+
+        rollup_query = select(
+            *[getattr(SalesDailyRollup, c) for c in KEY_COLUMNS + MEASURE_COLUMNS]
+        )
+        if start_date:
+            rollup_query = rollup_query.where(SalesDailyRollup.transaction_date >= start_date)
+        if end_date:
+            rollup_query = rollup_query.where(SalesDailyRollup.transaction_date <= end_date)
+        rollup = {
+            tuple(row[:5]): tuple(row[5:])
+            for row in self.db.execute(rollup_query)
+        }
+
+        def _fmt(key):
+            return dict(zip(KEY_COLUMNS, [key[0].isoformat(), *key[1:]]))
+
+        missing = [_fmt(k) for k in raw.keys() - rollup.keys()]
+        extra = [_fmt(k) for k in rollup.keys() - raw.keys()]
+        mismatched = [
+            {
+                **_fmt(k),
+                "raw": dict(zip(MEASURE_COLUMNS, map(float, raw[k]))),
+                "rollup": dict(zip(MEASURE_COLUMNS, map(float, rollup[k])))
+            }
+            for k in raw.keys() & rollup.keys()
+            if tuple(map(Decimal, map(str, raw[k]))) != tuple(map(Decimal, map(str, rollup[k])))
+        ]
+
+        return {
+            "checked_at": datetime.utcnow().isoformat(),
+            "period": {
+                "start_date": start_date.isoformat() if start_date else None,
+                "end_date": end_date.isoformat() if end_date else None
+            },
+            "raw_keys": len(raw),
+            "rollup_keys": len(rollup),
+            "consistent": not (missing or extra or mismatched),
+            "missing_in_rollup": missing,
+            "extra_in_rollup": extra,
+            "mismatched": mismatched
+        }
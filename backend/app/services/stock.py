@@ -0,0 +1,361 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+from sqlalchemy import func, insert, or_, select, update
+from sqlalchemy.orm import Session
+from app.db.models import Garment, Inventory, StockMovement
+from app.db.upsert import upsert_insert
+
+# Per-unit (good_stock, virtual_stock) deltas of the manual movement types.
+# Reserving holds good stock against pending orders as virtual stock.
+MOVEMENT_DELTAS: Dict[str, Tuple[int, int]] = {
+    "RECEIPT": (1, 0),
+    "ISSUE": (-1, 0),
+    "RESERVE": (-1, 1),
+    "RELEASE": (1, -1),
+}
+
+
+class InsufficientStockError(Exception):
+    """A movement would take a stock level below zero."""
+
+
+class StockService:
+    """
+    Changes inventory levels through the stock_movements ledger.
+
+    Every change is a single ``UPDATE ... SET good_stock = good_stock + :delta
+    RETURNING`` so concurrent writers add to the current level instead of
+    overwriting each other, plus an INSERT into the ledger in the same
+    transaction. The caller commits.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def move(
+        self,
+        inventory_id: int,
+        movement_type: str,
+        good_stock_delta: int = 0,
+        virtual_stock_delta: int = 0,
+        reference: Optional[str] = None,
+        sale_id: Optional[int] = None,
+        allow_negative: bool = False
+    ):
+        """
+        Apply a delta to one inventory row and record it.
+
+        Returns the row's (good_stock, virtual_stock) after the change.
+        Unless ``allow_negative`` is set, raises InsufficientStockError when
+        a decrement would take its level below zero.
+        """
+        good_stock = Inventory.good_stock + good_stock_delta
+        virtual_stock = Inventory.virtual_stock + virtual_stock_delta
+        stmt = (
+            update(Inventory)
+            .where(Inventory.id == inventory_id)
+            .values(good_stock=good_stock, virtual_stock=virtual_stock, last_updated=func.now())
+            .returning(Inventory.good_stock, Inventory.virtual_stock)
+            .execution_options(synchronize_session=False)
+        )
+        if not allow_negative:
+            # Only the level being decreased is checked, so stock that is
+            # already negative (oversold) can still be replenished.
+            if good_stock_delta < 0:
+                stmt = stmt.where(good_stock >= 0)
+            if virtual_stock_delta < 0:
+                stmt = stmt.where(virtual_stock >= 0)
+
+        levels = self.db.execute(stmt).one_or_none()
+        if levels is None:
+            raise InsufficientStockError(
+                f"Inventory {inventory_id} cannot apply {movement_type} "
+                f"({good_stock_delta:+d} good, {virtual_stock_delta:+d} virtual)"
+            )
+        self.db.execute(insert(StockMovement), [{
+            "inventory_id": inventory_id,
+            "movement_type": movement_type,
+            "good_stock_delta": good_stock_delta,
+            "virtual_stock_delta": virtual_stock_delta,
+            "sale_id": sale_id,
+            "reference": reference,
+        }])
+        return levels
+
+    def apply_movement(
+        self,
+        inventory_id: int,
+        movement_type: str,
+        quantity: int,
+        reference: Optional[str] = None
+    ):
+        """Apply ``quantity`` units of a RECEIPT, ISSUE, RESERVE or RELEASE."""
+        good_unit, virtual_unit = MOVEMENT_DELTAS[movement_type]
+        return self.move(
+            inventory_id, movement_type,
+            good_stock_delta=good_unit * quantity,
+            virtual_stock_delta=virtual_unit * quantity,
+            reference=reference
+        )
+
+    def set_levels(
+        self,
+        inventory_id: int,
+        good_stock: Optional[int] = None,
+        virtual_stock: Optional[int] = None,
+        reference: Optional[str] = None
+    ):
+        """
+        Set absolute levels (stocktake) by posting the difference as an
+        ADJUSTMENT. The row is locked while the difference is computed.
+        """
+        current = self.db.execute(
+            select(Inventory.good_stock, Inventory.virtual_stock)
+            .where(Inventory.id == inventory_id)
+            .with_for_update()
+        ).one()
+        good_stock_delta = 0 if good_stock is None else good_stock - current.good_stock
+        virtual_stock_delta = 0 if virtual_stock is None else virtual_stock - current.virtual_stock
+        if not (good_stock_delta or virtual_stock_delta):
+            return current
+        return self.move(
+            inventory_id, "ADJUSTMENT", good_stock_delta, virtual_stock_delta,
+            reference=reference, allow_negative=True
+        )
+
+    def open_balance(self, inventory: Inventory) -> None:
+        """Record the starting levels of a newly created (flushed) inventory row."""
+        if inventory.good_stock or inventory.virtual_stock:
+            self.db.execute(insert(StockMovement), [{
+                "inventory_id": inventory.id,
+                "movement_type": "OPENING",
+                "good_stock_delta": inventory.good_stock,
+                "virtual_stock_delta": inventory.virtual_stock,
+            }])
+
+    def post_sales(self, sales: Iterable[Mapping[str, Any]]) -> int:
+        """
+        Decrement good stock for sold lines and add returned lines back.
+
+        Must run in the same transaction as the sale INSERTs. Sales are
+        facts reported by the panels, so they are never rejected for lack
+        of stock: levels may go negative, and a garment-size without an
+        inventory row gets one. Returns the number of movements recorded.
+        """
+        lines = list(sales)
+        if not lines:
+            return 0
+
+        totals: Dict[Tuple[int, str], int] = {}
+        for sale in lines:
+            key = (sale["garment_id"], sale["size"])
+            totals[key] = totals.get(key, 0) + self._sale_delta(sale)
+
+        # Keys are locked in a fixed order so concurrent batches cannot deadlock
+        table = Inventory.__table__
+        stmt = upsert_insert(self.db, table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["garment_id", "size"],
+            set_={"good_stock": table.c.good_stock + stmt.excluded.good_stock, "last_updated": func.now()}
+        ).returning(table.c.id, table.c.garment_id, table.c.size)
+        result = self.db.execute(stmt, [
+            {"garment_id": garment_id, "size": size, "good_stock": totals[garment_id, size], "virtual_stock": 0}
+            for garment_id, size in sorted(totals)
+        ])
+        inventory_ids = {(row.garment_id, row.size): row.id for row in result}
+
+        self.db.execute(insert(StockMovement), [
+            {
+                "inventory_id": inventory_ids[sale["garment_id"], sale["size"]],
+                "movement_type": "RETURN" if sale.get("is_return") else "SALE",
+                "good_stock_delta": self._sale_delta(sale),
+                "virtual_stock_delta": 0,
+                "sale_id": sale.get("id"),
+                "reference": sale.get("invoice_number"),
+            }
+            for sale in lines
+        ])
+        return len(lines)
+
+    def apply_counts(
+        self,
+        counts: Sequence[Mapping[str, Any]],
+        reference: Optional[str] = "cycle count"
+    ) -> Dict[str, Any]:
+        """
+        Set counted levels for many garment-sizes in one transaction.
+
+        ``counts`` rows carry garment_id, size, good_stock and optionally
+        virtual_stock and warehouse_location (omitted values are kept).
+        Existing rows of the counted garments are locked, changed rows are
+        written with one batched INSERT ... ON CONFLICT DO UPDATE, and each
+        stock change is posted to the ledger as an ADJUSTMENT (OPENING for
+        new rows). Returns per-row diffs against the previous levels; row
+        numbers are 1-based positions in ``counts``. The caller commits.
+        """
+        garment_ids = {
+            row_id for (row_id,) in self.db.execute(
+                select(Garment.id).where(Garment.id.in_({row["garment_id"] for row in counts}))
+            )
+        } if counts else set()
+
+        errors: List[Dict[str, Any]] = []
+        accepted: Dict[Tuple[int, str], Tuple[int, Mapping[str, Any]]] = {}
+        for position, row in enumerate(counts, start=1):
+            key = (row["garment_id"], row["size"])
+            if row["garment_id"] not in garment_ids:
+                errors.append({"row": position, "errors": [f"garment_id: Garment {row['garment_id']} not found"]})
+            elif key in accepted:
+                errors.append({"row": position, "errors": [f"size: duplicates row {accepted[key][0]}"]})
+            else:
+                accepted[key] = (position, row)
+
+        previous = {}
+        if accepted:
+            locked = self.db.execute(
+                select(Inventory.garment_id, Inventory.size, Inventory.good_stock,
+                       Inventory.virtual_stock, Inventory.warehouse_location)
+                .where(Inventory.garment_id.in_({garment_id for garment_id, _ in accepted}))
+                .order_by(Inventory.id)
+                .with_for_update()
+            )
+            previous = {(row.garment_id, row.size): row for row in locked}
+
+        writes: List[Dict[str, Any]] = []
+        diffs: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        unchanged = 0
+        for key, (position, row) in sorted(accepted.items()):
+            before = previous.get(key)
+            good_stock = row["good_stock"]
+            virtual_stock = row.get("virtual_stock")
+            if virtual_stock is None:
+                virtual_stock = before.virtual_stock if before else 0
+            location = row.get("warehouse_location")
+            if location is None and before:
+                location = before.warehouse_location
+
+            if before and (before.good_stock, before.virtual_stock, before.warehouse_location) == (
+                good_stock, virtual_stock, location
+            ):
+                unchanged += 1
+                continue
+            writes.append({
+                "garment_id": key[0],
+                "size": key[1],
+                "good_stock": good_stock,
+                "virtual_stock": virtual_stock,
+                "warehouse_location": location,
+            })
+            diffs[key] = {
+                "row": position,
+                "garment_id": key[0],
+                "size": key[1],
+                "previous": {"good_stock": before.good_stock, "virtual_stock": before.virtual_stock}
+                if before else None,
+                "current": {"good_stock": good_stock, "virtual_stock": virtual_stock},
+                "good_stock_delta": good_stock - (before.good_stock if before else 0),
+                "virtual_stock_delta": virtual_stock - (before.virtual_stock if before else 0),
+            }
+
+        if writes:
+            table = Inventory.__table__
+            stmt = upsert_insert(self.db, table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["garment_id", "size"],
+                set_={
+                    "good_stock": stmt.excluded.good_stock,
+                    "virtual_stock": stmt.excluded.virtual_stock,
+                    "warehouse_location": stmt.excluded.warehouse_location,
+                    "last_updated": func.now()
+                }
+            ).returning(table.c.id, table.c.garment_id, table.c.size)
+            inventory_ids = {
+                (row.garment_id, row.size): row.id for row in self.db.execute(stmt, writes)
+            }
+            movements = [
+                {
+                    "inventory_id": inventory_ids[key],
+                    "movement_type": "ADJUSTMENT" if diff["previous"] else "OPENING",
+                    "good_stock_delta": diff["good_stock_delta"],
+                    "virtual_stock_delta": diff["virtual_stock_delta"],
+                    "reference": reference,
+                }
+                for key, diff in diffs.items()
+                if diff["good_stock_delta"] or diff["virtual_stock_delta"]
+            ]
+            if movements:
+                self.db.execute(insert(StockMovement), movements)
+
+        errors.sort(key=lambda e: e["row"])
+        created = sum(1 for diff in diffs.values() if diff["previous"] is None)
+        return {
+            "received": len(counts),
+            "created": created,
+            "updated": len(diffs) - created,
+            "unchanged": unchanged,
+            "rejected": len(errors),
+            "errors": errors,
+            "diffs": sorted(diffs.values(), key=lambda diff: diff["row"])
+        }
+
+    @staticmethod
+    def _sale_delta(sale: Mapping[str, Any]) -> int:
+        quantity = int(sale["quantity"])
+        return quantity if sale.get("is_return") else -quantity
+
+    def _ledger_levels(self):
+        """Correlated ledger sums for each inventory row."""
+        def total(column):
+            return (
+                select(func.coalesce(func.sum(column), 0))
+                .where(StockMovement.inventory_id == Inventory.id)
+                .scalar_subquery()
+            )
+        return total(StockMovement.good_stock_delta), total(StockMovement.virtual_stock_delta)
+
+    def rebuild(self) -> int:
+        """
+        Reset every inventory level to the sum of its ledger movements.
+        Repairs drift reported by check_consistency. Returns rows changed.
+        """
+        good_stock, virtual_stock = self._ledger_levels()
+        result = self.db.execute(
+            update(Inventory)
+            .where(or_(Inventory.good_stock != good_stock, Inventory.virtual_stock != virtual_stock))
+            .values(good_stock=good_stock, virtual_stock=virtual_stock, last_updated=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+        return result.rowcount
+
+    def check_consistency(self) -> Dict[str, Any]:
+        """Compare inventory levels against the ledger"""
+        good_stock, virtual_stock = self._ledger_levels()
+        rows = self.db.execute(
+            select(
+                Inventory.id,
+                Inventory.garment_id,
+                Inventory.size,
+                Inventory.good_stock,
+                Inventory.virtual_stock,
+                good_stock.label("ledger_good_stock"),
+                virtual_stock.label("ledger_virtual_stock")
+            ).order_by(Inventory.id)
+        ).all()
+        mismatched: List[Dict[str, Any]] = [
+            {
+                "inventory_id": row.id,
+                "garment_id": row.garment_id,
+                "size": row.size,
+                "inventory": {"good_stock": row.good_stock, "virtual_stock": row.virtual_stock},
+                "ledger": {"good_stock": row.ledger_good_stock, "virtual_stock": row.ledger_virtual_stock}
+            }
+            for row in rows
+            if (row.good_stock, row.virtual_stock) != (row.ledger_good_stock, row.ledger_virtual_stock)
+        ]
+        return {
+            "checked_at": datetime.utcnow().isoformat(),
+            "inventory_rows": len(rows),
+            "consistent": not mismatched,
+            "mismatched": mismatched
+        }
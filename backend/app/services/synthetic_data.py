@@ -0,0 +1,289 @@
+import csv
+import io
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.db.models import (
+    Discount, Fabric, Garment, Inventory, PaidAd, Panel, ProductionActivity, ProductionPlan,
+    Sale, StockMovement, Yarn
+)
+from app.services.fabric_summary import FabricSummaryService
+from app.services.panel_activity import PanelActivityService
+from app.services.sales_rollup import SalesRollupService
+
+# Named data volumes, by number of sale rows
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+CATEGORIES = ("T-Shirt", "Polo", "Hoodie", "Sweatshirt", "Track Pant", "Shorts", "Combo Pack")
+SIZE_RUNS = (("S", "M", "L", "XL"), ("XS", "S", "M", "L", "XL", "XXL"), ("2-3Y", "4-5Y", "6-7Y", "8-9Y"))
+MRP_POINTS = np.array([299, 399, 499, 599, 799, 999, 1299, 1499])
+PANEL_TYPES = ("e-commerce", "e-commerce", "e-commerce", "retail", "wholesale")
+PANEL_COUNT = 24
+# The last few panels stop selling this many days before the end date
+INACTIVE_PANELS = 3
+INACTIVE_DAYS = 90
+DISCOUNT_STEPS = np.array([0, 5, 10, 15, 20, 30])
+DISCOUNT_WEIGHTS = np.array([0.45, 0.15, 0.15, 0.1, 0.1, 0.05])
+RETURN_RATE = 0.06
+FABRIC_TYPES = ("JERSEY", "TERRY", "FLEECE")
+PLAN_STATUSES = ("PLANNED", "IN_PROGRESS", "COMPLETED")
+ACTIVITY_TYPES = ("KNITTING", "DYEING", "CUTTING", "STITCHING")
+AD_PLATFORMS = ("Google Ads", "Meta Ads", "Marketplace Sponsored")
+
+
+class SyntheticDataGenerator:
+    """
+    Deterministic synthetic ERP data for benchmarks and load tests.
+
+    Volumes scale with the number of sales: one garment per 250 sales (at
+    least 100), each with a size run, three production plans with their
+    activities, and opening stock. Garment popularity follows a Zipf-like
+    curve, sales carry panel discounts and a share of returns, and a few
+    panels go quiet in the last INACTIVE_DAYS days so every report has
+    something to find. The same seed always produces the same rows.
+    Rows are inserted in batches (COPY for sales on PostgreSQL) into an
+    empty database; commits as it goes.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        seed: int = 42,
+        end_date: Optional[date] = None,
+        history_days: int = 365,
+        batch_size: int = 50_000
+    ):
+        self.db = db
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.end_date = end_date or date.today()
+        self.history_days = history_days
+        self.start_date = self.end_date - timedelta(days=history_days - 1)
+        self.batch_size = batch_size
+
+    def _insert(self, model, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert rows and return their ids in order."""
+        if not rows:
+            return []
+        ids = self.db.scalars(insert(model).returning(model.id, sort_by_parameter_order=True), rows).all()
+        return list(ids)
+
+    def populate(self, sales: int) -> Dict[str, int]:
+        """Generate a full dataset around ``sales`` sale rows; returns rows written per table."""
+        counts: Dict[str, int] = {}
+        garment_count = max(100, sales // 250)
+
+        panel_ids = self._panels()
+        garments = self._garments(garment_count)
+        yarn_ids = self._yarns(40)
+        counts["panels"], counts["garments"], counts["yarns"] = len(panel_ids), len(garments), len(yarn_ids)
+        counts["fabrics"] = self._fabrics(60)
+        counts["discounts"] = self._discounts(panel_ids)
+        counts["inventory"] = self._inventory(garments)
+        counts["production_plans"], counts["production_activities"] = self._production(garments, yarn_ids)
+        counts["paid_ads"] = self._paid_ads(panel_ids)
+        self.db.commit()
+
+        counts["sales"] = self._sales(sales, garments, panel_ids)
+        counts["sales_daily_rollup"] = SalesRollupService(self.db).rebuild()
+        counts["panel_activity"] = PanelActivityService(self.db).rebuild()
+        FabricSummaryService(self.db).refresh()
+        return counts
+
+    def _panels(self) -> List[int]:
+        return self._insert(Panel, [
+            {"panel_name": f"Panel {i + 1:02d}", "panel_type": PANEL_TYPES[i % len(PANEL_TYPES)],
+             "is_active": True}
+            for i in range(PANEL_COUNT)
+        ])
+
+    def _garments(self, count: int) -> List[Dict[str, Any]]:
+        categories = self.rng.integers(0, len(CATEGORIES), count)
+        runs = self.rng.integers(0, len(SIZE_RUNS), count)
+        mrps = self.rng.choice(MRP_POINTS, count)
+        rows = []
+        for i in range(count):
+            category = CATEGORIES[categories[i]]
+            sizes = list(SIZE_RUNS[runs[i]])
+            rows.append({
+                "style_sku": f"SYN{self.seed}-{i + 1:05d}",
+                "name": f"{category} {i + 1}",
+                "category": category,
+                "sizes": sizes,
+                "gross_weight_per_size": {size: round(0.18 + 0.02 * n, 2) for n, size in enumerate(sizes)},
+                "mrp": int(mrps[i]),
+                "is_active": True,
+            })
+        for row, garment_id in zip(rows, self._insert(Garment, rows)):
+            row["id"] = garment_id
+        return rows
+
+    def _yarns(self, count: int) -> List[int]:
+        return self._insert(Yarn, [
+            {"yarn_type": ("Cotton", "Polyester", "Viscose", "Melange")[i % 4],
+             "yarn_count": f"{20 + 10 * (i % 4)}s",
+             "composition": "100% Cotton" if i % 4 == 0 else "60/40 Blend",
+             "unit_price": round(float(self.rng.uniform(180, 420)), 2),
+             "stock_quantity": round(float(self.rng.uniform(0, 2000)), 2)}
+            for i in range(count)
+        ])
+
+    def _fabrics(self, count: int) -> int:
+        return len(self._insert(Fabric, [
+            {"fabric_type": FABRIC_TYPES[i % len(FABRIC_TYPES)],
+             "subtype": f"Subtype {i % 5}",
+             "gsm": int(self.rng.choice([160, 180, 220, 280, 320])),
+             "composition": "100% Cotton",
+             "stock_quantity": round(float(self.rng.uniform(0, 5000)), 2),
+             "cost_per_unit": round(float(self.rng.uniform(250, 650)), 2)}
+            for i in range(count)
+        ]))
+
+    def _discounts(self, panel_ids: Sequence[int]) -> int:
+        return len(self._insert(Discount, [
+            {"discount_name": f"Panel {panel_id} season sale", "discount_type": "PERCENTAGE",
+             "discount_value": int(self.rng.choice(DISCOUNT_STEPS[1:])), "applicable_to": "PANEL",
+             "panel_id": panel_id, "valid_from": self.start_date, "is_active": True}
+            for panel_id in panel_ids
+        ]))
+
+    def _inventory(self, garments: List[Dict[str, Any]]) -> int:
+        rows = [
+            {"garment_id": garment["id"], "size": size,
+             "good_stock": int(self.rng.integers(0, 400)), "virtual_stock": 0}
+            for garment in garments for size in garment["sizes"]
+        ]
+        inventory_ids = self._insert(Inventory, rows)
+        self.db.execute(insert(StockMovement), [
+            {"inventory_id": inventory_id, "movement_type": "OPENING",
+             "good_stock_delta": row["good_stock"], "virtual_stock_delta": 0, "reference": "synthetic"}
+            for inventory_id, row in zip(inventory_ids, rows)
+        ])
+        return len(rows)
+
+    def _production(self, garments: List[Dict[str, Any]], yarn_ids: Sequence[int]):
+        plans = []
+        for garment in garments:
+            for _ in range(3):
+                quantity = int(self.rng.integers(100, 2000))
+                plans.append({
+                    "plan_name": f"{garment['style_sku']} run {len(plans) + 1}",
+                    "garment_id": garment["id"],
+                    "planned_quantity": quantity,
+                    "target_date": self.start_date + timedelta(days=int(self.rng.integers(0, self.history_days + 60))),
+                    "status": PLAN_STATUSES[int(self.rng.integers(0, len(PLAN_STATUSES)))],
+                    "fabric_requirement": round(quantity * 0.3, 2),
+                    "yarn_requirement": round(quantity * 0.32, 2),
+                    "yarn_id": yarn_ids[int(self.rng.integers(0, len(yarn_ids)))],
+                })
+        plan_ids = self._insert(ProductionPlan, plans)
+
+        activities = []
+        for plan_id, plan in zip(plan_ids, plans):
+            for step, activity_type in enumerate(ACTIVITY_TYPES[:int(self.rng.integers(1, len(ACTIVITY_TYPES) + 1))]):
+                calculated = plan["planned_quantity"] * 0.25
+                actual = calculated * float(self.rng.normal(1.0, 0.03))
+                activities.append({
+                    "production_plan_id": plan_id,
+                    "activity_type": activity_type,
+                    "activity_date": min(self.end_date, plan["target_date"] - timedelta(days=14 - 3 * step)),
+                    "quantity": plan["planned_quantity"],
+                    "gross_weight_calculated": round(calculated, 2),
+                    "gross_weight_actual": round(actual, 2),
+                    "variance": round(actual - calculated, 2),
+                })
+        self.db.execute(insert(ProductionActivity), activities)
+        return len(plans), len(activities)
+
+    def _paid_ads(self, panel_ids: Sequence[int]) -> int:
+        rows = []
+        online = [pid for i, pid in enumerate(panel_ids) if PANEL_TYPES[i % len(PANEL_TYPES)] == "e-commerce"]
+        for day in range(self.history_days):
+            ad_date = self.start_date + timedelta(days=day)
+            for panel_id in online:
+                spend = float(self.rng.gamma(4.0, 500.0))
+                clicks = int(spend / 4)
+                rows.append({
+                    "ad_date": ad_date, "panel_id": panel_id,
+                    "platform": AD_PLATFORMS[(panel_id + day) % len(AD_PLATFORMS)],
+                    "campaign_name": f"Always-on {panel_id}", "daily_spend": round(spend, 2),
+                    "impressions": clicks * 40, "clicks": clicks, "conversions": clicks // 25,
+                    "revenue_generated": round(spend * float(self.rng.uniform(1.5, 5.0)), 2),
+                })
+        for start in range(0, len(rows), self.batch_size):
+            self.db.execute(insert(PaidAd), rows[start:start + self.batch_size])
+        return len(rows)
+
+    def _sales(self, count: int, garments: List[Dict[str, Any]], panel_ids: Sequence[int]) -> int:
+        garment_ids = np.array([g["id"] for g in garments])
+        mrps = np.array([g["mrp"] for g in garments], dtype="float64")
+        size_runs = [g["sizes"] for g in garments]
+        popularity = 1.0 / np.arange(1, len(garments) + 1) ** 1.1
+        popularity = self.rng.permutation(popularity / popularity.sum())
+        panel_weights = self.rng.uniform(0.5, 2.0, len(panel_ids))
+        panel_weights /= panel_weights.sum()
+        # Weekends sell more and volume grows over the period
+        days = np.arange(self.history_days)
+        weekdays = np.array([(self.start_date + timedelta(days=int(d))).weekday() for d in days])
+        day_weights = (1.0 + 0.5 * (weekdays >= 5)) * (1.0 + days / self.history_days)
+        day_weights /= day_weights.sum()
+        dates = [self.start_date + timedelta(days=int(d)) for d in days]
+        inactive_from = len(panel_ids) - INACTIVE_PANELS
+        active_days = max(1, self.history_days - INACTIVE_DAYS)
+
+        written = 0
+        while written < count:
+            n = min(self.batch_size, count - written)
+            garment_idx = self.rng.choice(len(garments), n, p=popularity)
+            panel_idx = self.rng.choice(len(panel_ids), n, p=panel_weights)
+            day_idx = self.rng.choice(self.history_days, n, p=day_weights)
+            quiet = panel_idx >= inactive_from
+            day_idx[quiet] = self.rng.integers(0, active_days, quiet.sum())
+            size_pick = self.rng.random(n)
+            quantity = np.minimum(self.rng.geometric(0.6, n), 6)
+            discount = self.rng.choice(DISCOUNT_STEPS, n, p=DISCOUNT_WEIGHTS)
+            unit_price = mrps[garment_idx]
+            total = np.round(unit_price * quantity * (1 - discount / 100), 2)
+            is_return = self.rng.random(n) < RETURN_RATE
+
+            rows = [
+                {
+                    "transaction_date": dates[d],
+                    "garment_id": int(garment_ids[g]),
+                    "panel_id": panel_ids[p],
+                    "size": size_runs[g][int(s * len(size_runs[g]))],
+                    "quantity": int(q),
+                    "unit_price": float(u),
+                    "discount_percentage": float(dp),
+                    "total_amount": float(t),
+                    "is_return": bool(r),
+                    "invoice_number": f"SYN{self.seed}-{written + i + 1:08d}",
+                }
+                for i, (g, p, d, s, q, u, dp, t, r) in enumerate(zip(
+                    garment_idx.tolist(), panel_idx.tolist(), day_idx.tolist(), size_pick.tolist(),
+                    quantity.tolist(), unit_price.tolist(), discount.tolist(), total.tolist(), is_return.tolist()
+                ))
+            ]
+            if self.db.get_bind().dialect.name == "postgresql":
+                self._copy_sales(rows)
+            else:
+                self.db.execute(insert(Sale), rows)
+            self.db.commit()
+            written += n
+        return written
+
+    def _copy_sales(self, rows: List[Dict[str, Any]]) -> None:
+        columns = list(rows[0])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows([row[c] for c in columns] for row in rows)
+        buffer.seek(0)
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY sales ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        finally:
+            cursor.close()
@@ -0,0 +1,63 @@
+# Benchmarks are opt-in: RUN_BENCHMARKS=1 pytest tests/benchmarks -s
+# They run against TEST_DATABASE_URL (PostgreSQL) when set, else a SQLite file.
+import os
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+
+def database_backend():
+    url = os.environ.get("TEST_DATABASE_URL", "")
+    return "postgresql" if url.startswith("postgresql") else "sqlite"
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # The committed baseline was recorded on PostgreSQL; SQLite timings are
+    # not comparable with it, so a SQLite run only reports
+    if database_backend() != "postgresql" and config.getoption("benchmark_compare", None):
+        config.option.benchmark_compare = False
+        config.option.benchmark_compare_fail = None
+        config.issue_config_time_warning(
+            pytest.PytestConfigWarning(
+                "benchmark comparison skipped: TEST_DATABASE_URL is not PostgreSQL"
+            ),
+            stacklevel=2
+        )
+
+
+def pytest_benchmark_update_machine_info(config, machine_info):
+    machine_info["database"] = database_backend()
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get("RUN_BENCHMARKS"):
+        return
+    skip = pytest.mark.skip(reason="set RUN_BENCHMARKS=1 to run benchmarks")
+    for item in items:
+        if "benchmarks" in item.nodeid.split("::")[0]:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def bench_engine(tmp_path):
+    from app.db.session import Base
+    import app.db.models  # noqa: F401
+
+    url = os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{tmp_path / 'bench.db'}"
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def bench_db(bench_engine):
+    session = sessionmaker(autocommit=False, autoflush=False, bind=bench_engine)()
+    try:
+        yield session
+    finally:
+        session.close()
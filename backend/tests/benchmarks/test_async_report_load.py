@@ -0,0 +1,118 @@
+import asyncio
+import os
+import statistics
+import time
+from datetime import date
+from decimal import Decimal
+
+import httpx
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.db.models import Garment, Panel, Sale
+from app.db.replica import ThreadedSessionRouter
+from app.db.session import get_read_db, get_reports_router, to_async_url
+from app.services.reports import ReportsService
+
+CONCURRENCY = int(os.environ.get("BENCH_CONCURRENCY", 20))
+# Threads (and connections) the reports pool gets
+REPORT_WORKERS = int(os.environ.get("BENCH_REPORT_WORKERS", 10))
+# Latency probes sent to other endpoints while the reports run
+PROBES = int(os.environ.get("BENCH_PROBES", 50))
+# Server-side latency added to each report to stand in for a slow query
+QUERY_DELAY_SECONDS = float(os.environ.get("BENCH_QUERY_DELAY", 0.05))
+REPORT_DATE = date(2026, 3, 1)
+
+original_daily_report = ReportsService.daily_sales_report
+
+
+def slow_daily_report(self, report_date):
+    if self.db.get_bind().dialect.name == "postgresql":
+        self.db.execute(text("SELECT pg_sleep(:delay)"), {"delay": QUERY_DELAY_SECONDS})
+    return original_daily_report(self, report_date)
+
+
+async def probe_latencies(client, path):
+    latencies = []
+    for _ in range(PROBES):
+        started = time.perf_counter()
+        response = await client.get(path)
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200
+    return latencies
+
+
+async def measure(client, path, reports=0):
+    """Probe ``path`` while ``reports`` daily sales reports are computing."""
+    report_requests = [
+        asyncio.create_task(client.get(f"/api/v1/reports/sales/daily/{REPORT_DATE.isoformat()}"))
+        for _ in range(reports)
+    ]
+    latencies = await probe_latencies(client, path)
+    for response in await asyncio.gather(*report_requests):
+        assert response.json()["summary"]["total_transactions"] == 500
+    return latencies
+
+
+def p95(latencies):
+    return statistics.quantiles(latencies, n=20)[-1]
+
+
+@pytest.mark.slow
+def test_reports_do_not_stall_other_endpoints(bench_db, bench_engine, monkeypatch):
+    from app.core.config import settings
+    from app.main import app
+
+    garment = Garment(style_sku="BENCH-1", name="Bench Tee", category="T-Shirt",
+                      sizes=["M"], mrp=Decimal("499.00"))
+    panel = Panel(panel_name="Bench Panel", panel_type="e-commerce")
+    bench_db.add_all([garment, panel])
+    bench_db.flush()
+    bench_db.add_all(
+        Sale(transaction_date=REPORT_DATE, garment_id=garment.id, panel_id=panel.id,
+             size="M", quantity=1, unit_price=Decimal("399.00"), total_amount=Decimal("399.00"))
+        for _ in range(500)
+    )
+    bench_db.commit()
+
+    monkeypatch.setattr(settings, "REPORT_CACHE_ENABLED", False)
+    monkeypatch.setattr(ReportsService, "daily_sales_report", slow_daily_report)
+    url = bench_engine.url.render_as_string(hide_password=False)
+    async_engine = create_async_engine(to_async_url(url), poolclass=NullPool)
+    read_sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    reports = ThreadedSessionRouter(sessionmaker(bind=bench_engine), max_workers=REPORT_WORKERS)
+
+    async def override_get_read_db():
+        async with read_sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    app.dependency_overrides[get_reports_router] = lambda: reports
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return {
+                (path, load): await measure(client, path, reports=load)
+                for path in ("/health", "/api/v1/fabrics/?limit=20")
+                for load in (0, CONCURRENCY)
+            }
+
+    try:
+        timings = asyncio.run(run())
+    finally:
+        app.dependency_overrides.clear()
+        reports.shutdown()
+        asyncio.run(async_engine.dispose())
+
+    print(f"\nProbe latency, idle vs {CONCURRENCY} daily sales reports in flight ({REPORT_WORKERS} report threads)")
+    for (path, load), latencies in timings.items():
+        print(f"  {path} with {load:>3} reports: median {statistics.median(latencies) * 1000:.1f}ms, "
+              f"p95 {p95(latencies) * 1000:.1f}ms")
+    # Reports hold worker threads, not the event loop: probes must not wait
+    # for a report to finish before being served
+    for path in ("/health", "/api/v1/fabrics/?limit=20"):
+        assert p95(timings[(path, CONCURRENCY)]) < max(10 * p95(timings[(path, 0)]), 0.25)
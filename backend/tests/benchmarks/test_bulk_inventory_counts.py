@@ -0,0 +1,64 @@
+import os
+import time
+from decimal import Decimal
+
+import pytest
+
+from app.db.models import Garment, Inventory
+from app.services.stock import StockService
+
+ROWS = int(os.environ.get("BENCH_ROWS", 20_000))
+SIZES = ("S", "M", "L", "XL")
+
+
+def seed_counts(db):
+    garments = [
+        Garment(style_sku=f"SKU-{i}", name=f"Garment {i}", category="T-Shirt",
+                sizes=list(SIZES), mrp=Decimal("499.00"))
+        for i in range(ROWS // len(SIZES))
+    ]
+    db.add_all(garments)
+    db.flush()
+    # Half the counted rows exist already, half are new
+    db.add_all(
+        Inventory(garment_id=garment.id, size=size, good_stock=50, virtual_stock=0)
+        for garment in garments for size in SIZES[:2]
+    )
+    db.commit()
+    return [
+        {"garment_id": garment.id, "size": size, "good_stock": 40 + i % 20}
+        for i, (garment, size) in enumerate((g, s) for g in garments for s in SIZES)
+    ]
+
+
+@pytest.mark.slow
+def test_bulk_cycle_count_throughput(bench_db):
+    counts = seed_counts(bench_db)
+
+    started = time.perf_counter()
+    result = StockService(bench_db).apply_counts(counts)
+    bench_db.commit()
+    elapsed = time.perf_counter() - started
+
+    print(f"\n{len(counts)} counted rows in one upsert: {elapsed:.2f}s ({len(counts) / elapsed:,.0f} rows/s)")
+    assert result["rejected"] == 0
+    assert result["created"] + result["updated"] + result["unchanged"] == len(counts)
+
+
+@pytest.mark.slow
+def test_per_row_cycle_count_baseline(bench_db):
+    """The old path: one locked read, adjustment and commit per row (existing rows only)."""
+    counts = seed_counts(bench_db)
+    existing = {
+        (row.garment_id, row.size): row.id for row in bench_db.query(Inventory.id, Inventory.garment_id, Inventory.size)
+    }
+    counts = [count for count in counts if (count["garment_id"], count["size"]) in existing]
+
+    started = time.perf_counter()
+    service = StockService(bench_db)
+    for count in counts:
+        service.set_levels(existing[count["garment_id"], count["size"]], good_stock=count["good_stock"])
+        bench_db.commit()
+    elapsed = time.perf_counter() - started
+
+    print(f"\n{len(counts)} counted rows one at a time: {elapsed:.2f}s ({len(counts) / elapsed:,.0f} rows/s)")
@@ -0,0 +1,53 @@
+import os
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from app.db.models import Garment, Panel, Sale
+from app.services.sales_ingest import SalesIngestionService
+
+ROWS = int(os.environ.get("BENCH_ROWS", 100_000))
+
+
+def synthetic_sales(garment_ids, panel_ids, count):
+    start = date(2026, 1, 1)
+    for i in range(count):
+        quantity = 1 + i % 3
+        yield {
+            "transaction_date": (start + timedelta(days=i % 90)).isoformat(),
+            "garment_id": garment_ids[i % len(garment_ids)],
+            "panel_id": panel_ids[i % len(panel_ids)],
+            "size": ("S", "M", "L", "XL")[i % 4],
+            "quantity": quantity,
+            "unit_price": "399.00",
+            "discount_percentage": "10.00",
+            "total_amount": str(Decimal("359.10") * quantity),
+            "is_return": i % 17 == 0,
+            "invoice_number": f"INV-{i}",
+        }
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("use_copy", [True, False], ids=["copy", "executemany"])
+def test_bulk_ingest_throughput(bench_db, use_copy):
+    garments = [
+        Garment(style_sku=f"SKU-{i}", name=f"Garment {i}", category="T-Shirt",
+                sizes=["S", "M", "L", "XL"], mrp=Decimal("499.00"))
+        for i in range(200)
+    ]
+    panels = [Panel(panel_name=f"Panel {i}", panel_type="e-commerce") for i in range(20)]
+    bench_db.add_all(garments + panels)
+    bench_db.commit()
+    rows = list(synthetic_sales([g.id for g in garments], [p.id for p in panels], ROWS))
+
+    started = time.perf_counter()
+    result = SalesIngestionService(bench_db).ingest(rows, use_copy=use_copy)
+    bench_db.commit()
+    elapsed = time.perf_counter() - started
+
+    mode = "COPY" if use_copy and bench_db.get_bind().dialect.name == "postgresql" else "executemany"
+    print(f"\n{ROWS} sale rows via {mode}: {elapsed:.2f}s ({ROWS / elapsed:,.0f} rows/s)")
+    assert result["inserted"] == ROWS
+    assert bench_db.query(Sale).count() == ROWS
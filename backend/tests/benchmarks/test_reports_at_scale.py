@@ -0,0 +1,156 @@
+# Times every report and bulk path on synthetic data with pytest-benchmark.
+#   RUN_BENCHMARKS=1 pytest tests/benchmarks/test_reports_at_scale.py
+# The baseline under tests/benchmarks/baseline/postgresql/<platform>/ was
+# recorded on PostgreSQL. Compare against it, failing on a median regression
+# over 20% (runs without a PostgreSQL TEST_DATABASE_URL skip the comparison):
+#   RUN_BENCHMARKS=1 TEST_DATABASE_URL=postgresql://... \
+#       pytest tests/benchmarks/test_reports_at_scale.py \
+#       --benchmark-storage=tests/benchmarks/baseline/postgresql \
+#       --benchmark-compare --benchmark-compare-fail=median:20%
+# After an intended change record a new one with the same storage and
+# --benchmark-save=baseline instead of the compare flags, and commit it.
+import os
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Inventory, Sale
+from app.services.forecasting import DemandForecastService
+from app.services.reports import ReportsService
+from app.services.sales_ingest import SALE_COLUMNS, SalesIngestionService
+from app.services.sales_rollup import SalesRollupService
+from app.services.stock import StockService
+from app.services.synthetic_data import SCALES, SyntheticDataGenerator
+
+BENCH_SCALES = os.environ.get("BENCH_SCALES", "10k").split(",")
+ROUNDS = int(os.environ.get("BENCH_ROUNDS", 15))
+TODAY = date.today()
+WEEK_AGO = TODAY - timedelta(days=7)
+MONTH_AGO = TODAY - timedelta(days=30)
+YEAR_AGO = TODAY - timedelta(days=365)
+
+REPORTS = {
+    "fabric_stock_sheet_total": lambda s: s.fabric_stock_sheet_total(),
+    "fabric_stock_sheet_by_type": lambda s: s.fabric_stock_sheet_by_type("JERSEY"),
+    "fabric_stock_sheet_by_period": lambda s: s.fabric_stock_sheet_by_period(YEAR_AGO, TODAY),
+    "fabric_cost_sheet": lambda s: s.fabric_cost_sheet(),
+    "fabric_stock_summary": lambda s: s.fabric_stock_summary(),
+    "daily_sales_report": lambda s: s.daily_sales_report(WEEK_AGO),
+    "daily_sales_summary": lambda s: s.daily_sales_summary(WEEK_AGO),
+    "daily_sales_report_single_sku": lambda s: s.daily_sales_report_single_sku(WEEK_AGO, 1),
+    "panel_wise_sales_report": lambda s: s.panel_wise_sales_report(MONTH_AGO, TODAY),
+    "inactive_panel_report": lambda s: s.inactive_panel_report(30),
+    "slow_moving_inventory_report": lambda s: s.slow_moving_inventory_report(90),
+    "fast_moving_inventory_report": lambda s: s.fast_moving_inventory_report(90),
+    "inventory_classification_report": lambda s: s.inventory_classification_report(90),
+    "slow_moving_count": lambda s: s.slow_moving_count(90),
+    "fast_moving_count": lambda s: s.fast_moving_count(90),
+    "production_plan_report": lambda s: s.production_plan_report(YEAR_AGO, TODAY),
+    "production_plan_summary": lambda s: s.production_plan_summary(YEAR_AGO, TODAY),
+    "daily_production_variance_report": lambda s: s.daily_production_variance_report(WEEK_AGO),
+    "purchase_raise_for_yarn_report": lambda s: s.purchase_raise_for_yarn_report(),
+    "yarn_forecast_report": lambda s: s.yarn_forecast_report(30),
+    "bundle_sku_sales_report": lambda s: s.bundle_sku_sales_report(MONTH_AGO, TODAY),
+    "discount_report_general": lambda s: s.discount_report_general(MONTH_AGO, TODAY),
+    "discount_report_by_panel": lambda s: s.discount_report_by_panel(MONTH_AGO, TODAY),
+    "settlement_report": lambda s: s.settlement_report(None, YEAR_AGO, TODAY),
+}
+
+
+@pytest.fixture(scope="module", params=BENCH_SCALES)
+def dataset(request, tmp_path_factory):
+    """Synthetic dataset at one scale, shared by every benchmark in the module."""
+    from app.db.session import Base
+    import app.db.models  # noqa: F401
+
+    scale = request.param
+    sqlite_path = tmp_path_factory.mktemp(scale) / "bench.db"
+    url = os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{sqlite_path}"
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with Session() as db:
+        counts = SyntheticDataGenerator(db).populate(SCALES[scale])
+        DemandForecastService(db).refresh()
+    yield scale, counts, Session
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("report", sorted(REPORTS))
+def test_report(benchmark, dataset, report):
+    scale, counts, Session = dataset
+    benchmark.group = f"reports-{scale}"
+    benchmark.extra_info.update(counts)
+    with Session() as db:
+        service = ReportsService(db)
+
+        def run():
+            db.expunge_all()  # measure row loading, not the identity map
+            return REPORTS[report](service)
+
+        benchmark.pedantic(run, rounds=ROUNDS, warmup_rounds=1)
+
+
+@pytest.mark.slow
+def test_bulk_sales_ingest(benchmark, dataset):
+    """Re-ingest a tenth of the dataset's sales (COPY on PostgreSQL), rolled back each round."""
+    scale, counts, Session = dataset
+    benchmark.group = f"bulk-{scale}"
+    with Session() as db:
+        columns = [getattr(Sale, c) for c in SALE_COLUMNS]
+        sample = select(*columns).limit(counts["sales"] // 10)
+        rows = [dict(row._mapping) for row in db.execute(sample)]
+
+        def run():
+            result = SalesIngestionService(db).ingest(rows)
+            db.rollback()
+            return result
+
+        result = benchmark.pedantic(run, rounds=ROUNDS, warmup_rounds=1)
+    assert result["inserted"] == len(rows)
+
+
+@pytest.mark.slow
+def test_bulk_cycle_counts(benchmark, dataset):
+    """Count every inventory row in one upsert, rolled back each round."""
+    scale, _, Session = dataset
+    benchmark.group = f"bulk-{scale}"
+    with Session() as db:
+        counts = [
+            {"garment_id": garment_id, "size": size, "good_stock": good_stock + 1}
+            for garment_id, size, good_stock in db.execute(
+                select(Inventory.garment_id, Inventory.size, Inventory.good_stock)
+            )
+        ]
+
+        def run():
+            result = StockService(db).apply_counts(counts)
+            db.rollback()
+            return result
+
+        result = benchmark.pedantic(run, rounds=ROUNDS, warmup_rounds=1)
+    assert result["updated"] == len(counts)
+
+
+@pytest.mark.slow
+def test_rollup_rebuild(benchmark, dataset):
+    scale, counts, Session = dataset
+    benchmark.group = f"bulk-{scale}"
+    with Session() as db:
+        written = benchmark.pedantic(SalesRollupService(db).rebuild, rounds=ROUNDS, warmup_rounds=1)
+    assert written == counts["sales_daily_rollup"]
+
+
+@pytest.mark.slow
+def test_forecast_refresh(benchmark, dataset):
+    scale, _, Session = dataset
+    benchmark.group = f"bulk-{scale}"
+    with Session() as db:
+        refresh = DemandForecastService(db).refresh
+        fitted = benchmark.pedantic(refresh, rounds=ROUNDS, warmup_rounds=1)
+    assert fitted > 0
@@ -0,0 +1,173 @@
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.api.deps import user_cache
+from app.core import security
+from app.core.cache import report_cache
+from app.core.security import (
+    create_access_token, create_refresh_token, login_throttle, password_hasher, pwd_context, revocation_list,
+    token_cache
+)
+from app.db.models import User
+
+
+@pytest.fixture
+def auth_client(api_client, monkeypatch):
+    """API client with empty auth caches and a fresh in-process auth store."""
+    monkeypatch.setattr(security, "_auth_store", None)
+    token_cache.clear()
+    user_cache.clear()
+    yield api_client
+    token_cache.clear()
+    user_cache.clear()
+
+
+def login(client, username="asha"):
+    client.post("/api/v1/auth/register", json={
+        "email": f"{username}@example.com", "username": username, "password": "s3cret-pass",
+        "full_name": "Asha Rao", "role": "manager"
+    })
+    token = client.post("/api/v1/auth/login", json={"username": username, "password": "s3cret-pass"})
+    return {"Authorization": f"Bearer {token.json()['access_token']}"}
+
+
+def test_me_is_served_from_cache_after_first_request(auth_client, count_statements):
+    headers = login(auth_client)
+
+    assert auth_client.get("/api/v1/auth/me", headers=headers).json()["username"] == "asha"
+    with count_statements() as counter:
+        response = auth_client.get("/api/v1/auth/me", headers=headers)
+
+    assert response.status_code == 200
+    assert counter.count == 0
+
+
+def test_rejects_missing_expired_and_refresh_tokens(auth_client):
+    login(auth_client)
+    expired = create_access_token({"sub": "1"}, expires_delta=timedelta(seconds=-1))
+    refresh = create_refresh_token({"sub": "1"})
+
+    assert auth_client.get("/api/v1/auth/me").status_code == 401
+    for token in (expired, refresh, "not-a-jwt"):
+        response = auth_client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 401
+
+
+def test_logout_revokes_a_cached_token_immediately(auth_client):
+    headers = login(auth_client)
+    assert auth_client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    assert auth_client.post("/api/v1/auth/logout", headers=headers).status_code == 204
+
+    assert auth_client.get("/api/v1/auth/me", headers=headers).status_code == 401
+    assert auth_client.get("/api/v1/auth/me", headers=login(auth_client, "ravi")).status_code == 200
+
+
+def test_deactivating_a_user_revokes_their_tokens(auth_client, db, monkeypatch):
+    headers = login(auth_client)
+    # the deactivation happens in a later second than the token's iat
+    monkeypatch.setattr(security, "time", SimpleNamespace(
+        time=lambda: time.time() + 1, perf_counter=time.perf_counter
+    ))
+    assert auth_client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    user = db.query(User).filter(User.username == "asha").one()
+    user.full_name = "Asha R."
+    db.commit()
+    assert auth_client.get("/api/v1/auth/me", headers=headers).json()["full_name"] == "Asha R."
+
+    user.is_active = False
+    db.commit()
+    assert auth_client.get("/api/v1/auth/me", headers=headers).status_code == 401
+
+
+def test_repeated_failures_are_throttled_per_username(auth_client):
+    login(auth_client)
+    wrong = {"username": "asha", "password": "wrong-pass"}
+
+    for _ in range(5):
+        assert auth_client.post("/api/v1/auth/login", json=wrong).status_code == 401
+    response = auth_client.post("/api/v1/auth/login", json={"username": "asha", "password": "s3cret-pass"})
+
+    assert response.status_code == 429
+    assert 0 < int(response.headers["retry-after"]) <= 300
+    assert auth_client.get("/api/v1/auth/me", headers=login(auth_client, "ravi")).status_code == 200
+
+
+def test_login_rehashes_when_the_cost_factor_changes(auth_client, db):
+    headers = login(auth_client)
+    pwd_context.update(bcrypt__rounds=5)
+    try:
+        response = auth_client.post("/api/v1/auth/login", json={"username": "asha", "password": "s3cret-pass"})
+    finally:
+        pwd_context.update(bcrypt__rounds=4)
+
+    assert response.status_code == 200
+    assert db.query(User.hashed_password).filter(User.username == "asha").scalar().startswith("$2b$05$")
+    # the upgraded hash is not a password change, so existing tokens stay valid
+    assert auth_client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+
+def test_full_hashing_queue_answers_503(auth_client, monkeypatch):
+    login(auth_client)
+    monkeypatch.setattr(password_hasher, "max_pending", 0)
+
+    response = auth_client.post("/api/v1/auth/login", json={"username": "asha", "password": "s3cret-pass"})
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_revocations_survive_report_cache_churn(auth_client, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "REPORT_CACHE_BACKEND", "memory")
+    monkeypatch.setattr(report_cache, "_backend", None)
+    headers = login(auth_client)
+    assert auth_client.post("/api/v1/auth/logout", headers=headers).status_code == 204
+
+    for i in range(1100):
+        report_cache.backend.set(f"anthrilo:report:churn:{i}", "{}", ex=60)
+
+    assert auth_client.get("/api/v1/auth/me", headers=headers).status_code == 401
+
+
+def test_unreachable_auth_store_fails_closed(auth_client, monkeypatch):
+    from app.core.config import settings
+
+    headers = login(auth_client)
+    monkeypatch.setattr(settings, "AUTH_STORE_BACKEND", "redis")
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://127.0.0.1:1/0")
+    monkeypatch.setattr(security, "_auth_store", None)
+
+    assert auth_client.get("/api/v1/auth/me", headers=headers).status_code == 503
+
+
+def test_user_cutoff_is_whole_seconds_like_iat(auth_client):
+    revocation_list.revoke_user(42)
+    cutoff = int(security.auth_store().get(f"{revocation_list.key_prefix}:revoked-before:42"))
+
+    assert not revocation_list.is_revoked("digest", {"sub": 42, "iat": cutoff})
+    assert revocation_list.is_revoked("digest", {"sub": 42, "iat": cutoff - 1})
+
+
+def test_counter_without_ttl_is_rearmed_not_locked_forever(auth_client):
+    store = security.auth_store()
+    key = login_throttle._keys("asha", "")[0][0]
+    store.set(key, "5")  # e.g. left behind by a lost EXPIRE
+
+    assert login_throttle.retry_after("asha", "testclient") == 300
+    assert 0 < store.ttl(key) <= 300
+
+
+def test_failures_create_counters_with_their_window(auth_client):
+    login_throttle.record_failure("asha", "10.0.0.1")
+    login_throttle.record_failure("asha", "10.0.0.1")
+    store = security.auth_store()
+
+    for key, _ in login_throttle._keys("asha", "10.0.0.1"):
+        assert store.get(key) == "2"
+        assert 0 < store.ttl(key) <= 300
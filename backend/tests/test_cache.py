@@ -0,0 +1,73 @@
+from datetime import date
+
+from app.core.cache import MemoryBackend, ReportCache
+from app.services.cached_reports import CachedReportsService
+from app.services.reports import ReportsService
+from app.services.synthetic_data import SyntheticDataGenerator
+from tests.benchmarks.test_reports_at_scale import REPORTS
+
+
+class FakeReportsService:
+    use_rollup = False
+
+    def __init__(self):
+        self.calls = 0
+
+    def daily_sales_report(self, report_date: date):
+        self.calls += 1
+        return {"report_date": report_date.isoformat(), "calls": self.calls}
+
+
+def test_results_are_cached_per_parameters():
+    cache = ReportCache(MemoryBackend())
+    service = FakeReportsService()
+    cached = CachedReportsService(service, cache)
+
+    first = cached.daily_sales_report(date(2026, 1, 1))
+    assert cached.daily_sales_report(report_date=date(2026, 1, 1)) == first
+    assert service.calls == 1
+
+    cached.daily_sales_report(date(2026, 1, 2))
+    assert service.calls == 2
+
+
+def test_invalidating_a_tag_expires_dependent_reports():
+    cache = ReportCache(MemoryBackend())
+    service = FakeReportsService()
+    cached = CachedReportsService(service, cache)
+
+    cached.daily_sales_report(date(2026, 1, 1))
+    cache.invalidate("fabrics")
+    cached.daily_sales_report(date(2026, 1, 1))
+    assert service.calls == 1
+
+    cache.invalidate("sales")
+    assert cached.daily_sales_report(date(2026, 1, 1))["calls"] == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: clock[0])
+    cache = ReportCache(MemoryBackend())
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"ok": True}
+
+    cache.get_or_compute("report", {}, compute, ttl=60)
+    clock[0] += 30
+    cache.get_or_compute("report", {}, compute, ttl=60)
+    clock[0] += 31
+    cache.get_or_compute("report", {}, compute, ttl=60)
+    assert len(calls) == 2
+
+
+def test_cache_hits_return_the_same_result_as_misses(db):
+    SyntheticDataGenerator(db, history_days=60).populate(1000)
+    cache = ReportCache(MemoryBackend())
+    cached = CachedReportsService(ReportsService(db), cache)
+
+    for report, run in REPORTS.items():
+        miss = run(cached)
+        assert run(cached) == miss, report
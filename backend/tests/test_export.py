@@ -0,0 +1,39 @@
+import csv
+import io
+import json
+
+
+def test_list_export_streams_every_row_as_csv(api_client, seed_sales):
+    seed_sales(7)
+    response = api_client.get("/api/v1/sales/?format=csv&limit=2")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "X-Next-Cursor" not in response.headers
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 7
+    assert rows[0]["size"] == "M"
+
+
+def test_report_export_streams_ndjson_lines(api_client, seed_sales):
+    seed_sales(4)
+    response = api_client.get("/api/v1/reports/discounts/general?format=ndjson")
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 4
+    assert lines[0]["sku"] == "TEE-01"
+    assert lines[0]["discount_amount"] == 100.0
+
+
+def test_unknown_export_format_is_rejected(api_client):
+    assert api_client.get("/api/v1/garments/?format=xml").status_code == 422
+
+
+def test_daily_sales_report_exports_transactions(api_client, seed_sales):
+    seed_sales(6)
+    response = api_client.get("/api/v1/reports/sales/daily/2026-03-01?format=csv")
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 2
+    assert {row["invoice_number"] for row in rows} == {""}
@@ -0,0 +1,115 @@
+import os
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Fabric
+from app.services.fabric_summary import refresh_fabric_summary
+from app.services.reports import ReportsService
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "")
+
+FABRICS = [
+    ("JERSEY", 180, "Black", "100", "250"),
+    ("JERSEY", 180, "Black", "50", "260"),
+    ("JERSEY", 220, None, "20", None),
+    ("FLEECE", 320, "Grey", "10", "400"),
+]
+
+
+def seed_fabrics(db):
+    db.add_all(
+        Fabric(fabric_type=fabric_type, subtype="Plain", gsm=gsm, composition="Cotton", color=color,
+               stock_quantity=Decimal(quantity), cost_per_unit=cost and Decimal(cost))
+        for fabric_type, gsm, color, quantity, cost in FABRICS
+    )
+    db.commit()
+
+
+def test_stock_sheet_breaks_totals_down_without_loading_fabrics(db, count_statements):
+    seed_fabrics(db)
+    service = ReportsService(db)
+
+    with count_statements() as counter:
+        report = service.fabric_stock_sheet_total(include_items=False)
+
+    assert counter.count == 1
+    assert "fabrics" not in report
+    assert report["summary"] == {
+        "total_fabric_types": 4, "total_stock_quantity": 180.0, "total_stock_value": 42000.0, "unit": "kg"
+    }
+    assert report["by_type"] == [
+        {"fabric_type": "FLEECE", "fabric_count": 1, "stock_quantity": 10.0, "stock_value": 4000.0},
+        {"fabric_type": "JERSEY", "fabric_count": 3, "stock_quantity": 170.0, "stock_value": 38000.0},
+    ]
+    assert [(line["color"], line["fabric_count"]) for line in report["by_color"]] == [
+        ("Black", 2), ("Grey", 1), (None, 1)
+    ]
+    assert service.fabric_stock_summary() == report["summary"]
+    assert len(service.fabric_stock_sheet_total()["fabrics"]) == 4
+
+
+def test_by_type_and_cost_sheets_read_the_same_totals(db):
+    seed_fabrics(db)
+    service = ReportsService(db)
+
+    jersey = service.fabric_stock_sheet_by_type("JERSEY")
+    costs = service.fabric_cost_sheet()
+
+    assert jersey["summary"]["total_subtypes"] == 3
+    assert [line["gsm"] for line in jersey["by_gsm"]] == [180, 220]
+    assert len(jersey["fabrics"]) == 3
+    assert costs["summary_by_type"]["JERSEY"] == {"total_quantity": 170.0, "total_value": 38000.0, "count": 3}
+    assert costs["total_stock_value"] == sum(line["total_value"] for line in costs["detailed_costs"])
+    assert "detailed_costs" not in service.fabric_cost_sheet(include_items=False)
+
+
+def test_fabric_writes_show_up_in_the_report(api_client, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "REPORT_CACHE_ENABLED", False)
+    created = api_client.post("/api/v1/fabrics/", json={
+        "fabric_type": "TERRY", "subtype": "Loop", "gsm": 280, "composition": "Cotton",
+        "stock_quantity": "40", "cost_per_unit": "300"
+    }).json()
+    api_client.put(f"/api/v1/fabrics/{created['id']}", json={"stock_quantity": "30"})
+
+    body = api_client.get("/api/v1/reports/fabric/stock-sheet/total?include_items=false").json()
+    assert body["summary"]["total_stock_value"] == 9000.0
+    assert "fabrics" not in body
+
+    api_client.delete(f"/api/v1/fabrics/{created['id']}")
+    assert api_client.get("/api/v1/reports/fabric/cost-sheet").json()["summary_by_type"] == {}
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(
+    not TEST_DATABASE_URL.startswith("postgresql"),
+    reason="the materialized view needs TEST_DATABASE_URL pointing at PostgreSQL"
+)
+def test_materialized_view_refreshes_concurrently():
+    from app.db.session import Base
+    import app.db.models  # noqa: F401
+
+    engine = create_engine(TEST_DATABASE_URL)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    try:
+        with Session() as db:
+            seed_fabrics(db)
+            assert ReportsService(db).fabric_stock_summary()["total_fabric_types"] == 0  # not refreshed yet
+
+            refresh_fabric_summary(engine)
+            db.query(Fabric).filter(Fabric.color.is_(None)).delete()
+            db.commit()
+            refresh_fabric_summary(engine)
+
+            report = ReportsService(db).fabric_stock_sheet_total(include_items=False)
+        assert report["summary"]["total_fabric_types"] == 3
+        assert [line["color"] for line in report["by_color"]] == ["Black", "Grey"]
+    finally:
+        Base.metadata.drop_all(engine)
+        engine.dispose()
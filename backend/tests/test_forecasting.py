@@ -0,0 +1,91 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from app.db.models import DemandForecast, Garment, Panel, ProductionPlan, Sale, Yarn
+from app.services.forecasting import DemandForecastService, fit_exponential_smoothing
+
+TODAY = date.today()
+
+
+def test_batched_fit_matches_fitting_each_series_alone():
+    rng = np.random.default_rng(7)
+    history = np.vstack([
+        np.full(60, 5.0),
+        np.r_[np.full(30, 2.0), np.full(30, 8.0)],
+        rng.poisson(3, 60).astype(float),
+    ])
+
+    levels, alphas = fit_exponential_smoothing(history)
+
+    assert levels[0] == pytest.approx(5.0)
+    assert 7.5 < levels[1] <= 8.0
+    for row, level, alpha in zip(history, levels, alphas):
+        single_level, single_alpha = fit_exponential_smoothing(row[None, :])
+        assert (single_level[0], single_alpha[0]) == (pytest.approx(level), alpha)
+
+
+def seed_yarn_demand(db):
+    """A garment selling 4/day that uses 0.5 kg of yarn per unit, with one open plan."""
+    panel = Panel(panel_name="Marketplace", panel_type="e-commerce")
+    garment = Garment(style_sku="TEE-01", name="Basic Tee", category="T-Shirt",
+                      sizes=["M"], mrp=Decimal("499.00"))
+    yarn = Yarn(yarn_type="Cotton", yarn_count="30s", composition="100% Cotton",
+                unit_price=Decimal("250.00"), stock_quantity=Decimal("50.00"))
+    db.add_all([panel, garment, yarn])
+    db.flush()
+    for days_ago in range(1, 61):
+        db.add(Sale(transaction_date=TODAY - timedelta(days=days_ago), garment_id=garment.id,
+                    panel_id=panel.id, size="M", quantity=4, unit_price=Decimal("400.00"),
+                    total_amount=Decimal("1600.00")))
+    db.add_all([
+        ProductionPlan(plan_name="Past run", garment_id=garment.id, planned_quantity=100,
+                       target_date=TODAY - timedelta(days=30), status="COMPLETED",
+                       yarn_requirement=Decimal("50.00"), yarn_id=yarn.id),
+        ProductionPlan(plan_name="Next run", garment_id=garment.id, planned_quantity=40,
+                       target_date=TODAY + timedelta(days=10), status="PLANNED",
+                       yarn_requirement=Decimal("20.00"), yarn_id=yarn.id),
+    ])
+    db.commit()
+    return garment, yarn
+
+
+def test_yarn_demand_combines_open_plans_and_forecast(db):
+    garment, yarn = seed_yarn_demand(db)
+    service = DemandForecastService(db)
+
+    assert service.refresh(history_days=60) == 1
+    forecast = db.query(DemandForecast).one()
+    assert (forecast.garment_id, float(forecast.daily_units)) == (garment.id, 4.0)
+
+    demand = service.yarn_demand(30)[yarn.id]
+    # 20 kg committed by the open plan; 120 forecast units - 40 planned = 80
+    # uncovered units at 0.5 kg per unit (70 kg over 140 planned units)
+    assert demand["committed"] == pytest.approx(20.0)
+    assert demand["forecast"] == pytest.approx(40.0)
+    assert demand["avg_daily"] == pytest.approx(demand["total"] / 30)
+
+
+def test_purchase_report_reads_stored_forecasts(api_client, db, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "REPORT_CACHE_ENABLED", False)
+    _, yarn = seed_yarn_demand(db)
+
+    before = api_client.get("/api/v1/reports/yarn/purchase-raise?days_forecast=30").json()
+    assert before["forecasts_fitted_at"] is None
+    assert before["purchase_recommendations"][0]["forecasted_requirement"] == 20.0
+
+    DemandForecastService(db).refresh(history_days=60)
+    report = api_client.get("/api/v1/reports/yarn/purchase-raise?days_forecast=30").json()
+
+    item = report["purchase_recommendations"][0]
+    assert report["forecasts_fitted_at"] is not None
+    assert item["forecasted_requirement"] == 60.0
+    assert item["unit_cost"] == 250.0
+    assert item["estimated_order_value"] == item["recommended_order_quantity"] * 250.0
+
+    forecast = api_client.get("/api/v1/reports/yarn/forecast?forecast_days=30").json()
+    assert forecast["items"][0]["days_until_stockout"] == 25.0
@@ -0,0 +1,90 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.db.models import Garment, Inventory, Panel, Sale
+from app.services.inventory_analytics import InventoryAnalytics
+from app.services.sales_rollup import SalesRollupService
+
+TODAY = date.today()
+
+
+def add_sale(db, garment, panel, days_ago, quantity, is_return=False):
+    amount = Decimal("100.00") * quantity
+    row = {
+        "transaction_date": TODAY - timedelta(days=days_ago),
+        "garment_id": garment.id,
+        "panel_id": panel.id,
+        "size": "M",
+        "quantity": quantity,
+        "unit_price": Decimal("100.00"),
+        "discount_percentage": Decimal("0"),
+        "total_amount": amount,
+        "is_return": is_return,
+    }
+    db.add(Sale(**row))
+    SalesRollupService(db).apply([row])
+
+
+def seed_classes(db):
+    """A steady best seller, a one-off bulk order and an item that never sells."""
+    panel = Panel(panel_name="Marketplace", panel_type="e-commerce")
+    garments = [
+        Garment(style_sku=f"SKU-{i}", name=f"Garment {i}", category="T-Shirt",
+                sizes=["M"], mrp=Decimal("499.00"))
+        for i in range(3)
+    ]
+    db.add_all([panel] + garments)
+    db.flush()
+    for garment in garments:
+        db.add(Inventory(garment_id=garment.id, size="M", good_stock=56, virtual_stock=0))
+
+    steady, lumpy, _ = garments
+    for days_ago in range(28):
+        add_sale(db, steady, panel, days_ago, 2)
+    add_sale(db, steady, panel, 3, 2, is_return=True)
+    add_sale(db, lumpy, panel, 10, 10)
+    db.commit()
+    return garments
+
+
+def test_classification_covers_every_sku_size(db):
+    steady, lumpy, idle = seed_classes(db)
+
+    frame = InventoryAnalytics(db).classify(days_period=28, bucket_days=7).set_index("garment_id")
+
+    assert frame.loc[steady.id, ["abc_class", "xyz_class"]].tolist() == ["A", "X"]
+    assert frame.loc[lumpy.id, ["abc_class", "xyz_class"]].tolist() == ["B", "Z"]
+    assert frame.loc[idle.id, ["abc_class", "xyz_class"]].tolist() == ["C", "Z"]
+    assert frame.loc[steady.id, "units_sold"] == 56
+    assert frame.loc[steady.id, "revenue"] == 5400.0  # returns are netted off
+    assert frame.loc[steady.id, "velocity_per_day"] == 2.0
+    assert frame.loc[steady.id, "days_of_cover"] == 28.0
+    assert frame.loc[lumpy.id, "demand_cv"] > 1.0
+
+
+def test_rollup_source_matches_raw_sales(db):
+    seed_classes(db)
+
+    raw = InventoryAnalytics(db).classify(days_period=28)
+    rollup = InventoryAnalytics(db, use_rollup=True).classify(days_period=28)
+
+    assert raw.equals(rollup)
+
+
+def test_classification_endpoint(api_client, db, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "REPORT_CACHE_ENABLED", False)
+    steady, _, idle = seed_classes(db)
+
+    response = api_client.get("/api/v1/reports/inventory/classification?days_period=28")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["item_count"] == 3
+    assert body["class_matrix"]["AX"] == 1
+    assert sum(body["class_matrix"].values()) == 3
+    items = {item["garment_id"]: item for item in body["items"]}
+    assert items[steady.id]["days_of_cover"] == 28.0
+    assert items[idle.id]["days_of_cover"] is None
+    assert items[idle.id]["demand_cv"] is None
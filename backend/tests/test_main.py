@@ -1,5 +1,6 @@
 import pytest
 from fastapi.testclient import TestClient
+from app import main
 from app.main import app
 
 client = TestClient(app)
@@ -15,3 +16,25 @@ def test_health_check():
     response = client.get("/health")
     assert response.status_code == 200
     assert response.json()["status"] == "healthy"
+
+
+def test_startup_premakes_partitions(monkeypatch):
+    calls = []
+    monkeypatch.setattr(main, "premake_partitions", lambda bind: calls.append(bind) or {})
+
+    with TestClient(app) as started:
+        assert started.get("/health").status_code == 200
+
+    assert calls == [main.engine]
+
+
+def test_shutdown_stops_report_workers(monkeypatch):
+    stopped = []
+    monkeypatch.setattr(main, "premake_partitions", lambda bind: {})
+    monkeypatch.setattr(main.report_job_queue, "shutdown", lambda: stopped.append("jobs"))
+    monkeypatch.setattr(main.reports_router, "shutdown", lambda: stopped.append("reports"))
+
+    with TestClient(app):
+        assert stopped == []
+
+    assert stopped == ["jobs", "reports"]
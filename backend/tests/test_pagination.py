@@ -0,0 +1,28 @@
+def test_cursor_pages_cover_offset_order(api_client, seed_sales):
+    seed_sales(8)
+    expected = [s["id"] for s in api_client.get("/api/v1/sales/?limit=100").json()]
+
+    seen, cursor = [], None
+    while True:
+        url = "/api/v1/sales/?limit=3" + (f"&cursor={cursor}" if cursor else "")
+        response = api_client.get(url)
+        seen += [s["id"] for s in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert seen == expected
+    assert len(seen) == 8
+
+
+def test_limit_is_capped_at_max_page_size(api_client, seed_sales):
+    from app.core.config import settings
+
+    seed_sales(settings.MAX_PAGE_SIZE + 5)
+    response = api_client.get("/api/v1/sales/?limit=100000")
+    assert len(response.json()) == settings.MAX_PAGE_SIZE
+    assert "X-Next-Cursor" in response.headers
+
+
+def test_invalid_cursor_is_rejected(api_client):
+    assert api_client.get("/api/v1/garments/?cursor=not-a-cursor").status_code == 400
@@ -0,0 +1,71 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from app.db.models import Garment, PaidAd, Panel, PanelActivity, Sale
+from app.services.panel_activity import PanelActivityService
+from app.services.reports import ReportsService
+from app.services.sales_ingest import SalesIngestionService
+
+TODAY = date.today()
+
+
+def seed_panels(db):
+    panels = [Panel(panel_name=name, panel_type="e-commerce") for name in ("Busy", "Quiet", "New")]
+    garment = Garment(style_sku="TEE-01", name="Basic Tee", category="T-Shirt",
+                      sizes=["M"], mrp=Decimal("500.00"))
+    db.add_all(panels + [garment])
+    db.commit()
+    return panels, garment
+
+
+def sale(garment, panel, days_ago):
+    return {
+        "transaction_date": TODAY - timedelta(days=days_ago), "garment_id": garment.id,
+        "panel_id": panel.id, "size": "M", "quantity": 1, "unit_price": Decimal("400.00"),
+        "discount_percentage": Decimal("0"), "total_amount": Decimal("400.00"),
+    }
+
+
+def test_writes_keep_the_latest_dates(db):
+    (busy, quiet, _), garment = seed_panels(db)
+    SalesIngestionService(db).ingest([sale(garment, busy, 2), sale(garment, quiet, 60)])
+    SalesIngestionService(db).ingest([sale(garment, busy, 10)])  # back-dated
+    ad = {"ad_date": TODAY - timedelta(days=3), "panel_id": quiet.id}
+    PanelActivityService(db).record_ads([ad])
+    db.commit()
+
+    activity = {row.panel_id: row for row in db.query(PanelActivity)}
+    assert activity[busy.id].last_sale_date == TODAY - timedelta(days=2)
+    assert (activity[quiet.id].last_sale_date, activity[quiet.id].last_ad_date) == (
+        TODAY - timedelta(days=60), TODAY - timedelta(days=3)
+    )
+
+
+def test_rebuild_matches_write_maintenance(db):
+    (busy, quiet, _), garment = seed_panels(db)
+    SalesIngestionService(db).ingest([sale(garment, busy, 2), sale(garment, quiet, 60)])
+    db.commit()
+    maintained = {tuple(row) for row in db.query(PanelActivity.panel_id, PanelActivity.last_sale_date)}
+
+    assert PanelActivityService(db).rebuild() == 2
+    assert {tuple(row) for row in db.query(PanelActivity.panel_id, PanelActivity.last_sale_date)} == maintained
+
+
+def test_inactive_panel_report_reads_the_summary_in_one_statement(db, count_statements):
+    (busy, quiet, new), garment = seed_panels(db)
+    SalesIngestionService(db).ingest([sale(garment, busy, 2), sale(garment, quiet, 60)])
+    db.add(PaidAd(ad_date=TODAY - timedelta(days=5), panel_id=quiet.id, platform="Meta",
+                  campaign_name="Relaunch", daily_spend=Decimal("100")))
+    db.add(Sale(**sale(garment, busy, 1)))  # bypasses the write hooks
+    db.commit()
+    PanelActivityService(db).rebuild()
+
+    with count_statements() as counter:
+        report = ReportsService(db).inactive_panel_report(30)
+
+    assert counter.count == 1
+    lines = {line["panel_name"]: line for line in report["inactive_panels"]}
+    assert set(lines) == {"Quiet", "New"}
+    assert lines["Quiet"]["days_since_last_sale"] == 60
+    assert (lines["Quiet"]["days_since_last_ad"], lines["Quiet"]["ads_in_period"]) == (5, 1)
+    assert lines["New"]["last_sale_date"] is None
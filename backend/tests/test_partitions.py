@@ -0,0 +1,232 @@
+# Monthly partitioning of sales / paid_ads against a real PostgreSQL database.
+# Opt-in:
+#   TEST_DATABASE_URL=postgresql://... pytest -m integration tests/test_partitions.py
+import importlib.util
+import json
+import os
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.services.partitions import (
+    PREMAKE_LOCK_KEY, PartitionManager, add_months, month_start, partition_name, premake_partitions
+)
+from app.services.reports import ReportsService
+from app.services.sales_rollup import ArchivedPeriodError, SalesRollupService
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "")
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(
+        not TEST_DATABASE_URL.startswith("postgresql"),
+        reason="partitioning needs TEST_DATABASE_URL pointing at PostgreSQL"
+    ),
+]
+
+MIGRATION = Path(__file__).parents[1] / "alembic" / "versions" / "004_partition_sales_paid_ads.py"
+TODAY = date.today()
+THIS_MONTH = month_start(TODAY)
+
+SEED_SQL = """
+INSERT INTO panels (panel_name, panel_type, is_active) VALUES ('Panel 1', 'e-commerce', true);
+INSERT INTO garments (style_sku, name, category, sizes, mrp, is_active)
+VALUES ('SKU-1', 'Garment 1', 'T-Shirt', ARRAY['M'], 499, true);
+
+INSERT INTO sales (transaction_date, garment_id, panel_id, size, quantity, unit_price,
+                   discount_percentage, total_amount, is_return)
+SELECT CURRENT_DATE - i, 1, 1, 'M', 1, 399, 10, 359.10, false
+FROM generate_series(0, 400) AS i;
+
+INSERT INTO paid_ads (ad_date, panel_id, platform, campaign_name, daily_spend)
+SELECT CURRENT_DATE - i, 1, 'Meta', 'Campaign', 100 FROM generate_series(0, 400) AS i;
+"""
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location("partition_migration", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def partitioned_engine():
+    from app.db.session import Base
+    import app.db.models  # noqa: F401
+
+    engine = create_engine(TEST_DATABASE_URL)
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS sales, paid_ads CASCADE"))
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text(SEED_SQL))
+    migration = load_migration()
+    with engine.begin() as conn:
+        migration.convert(conn, "sales")
+        migration.convert(conn, "paid_ads", backfill=False)
+    yield engine
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE IF EXISTS sales, paid_ads, paid_ads_unpartitioned CASCADE"))
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def scanned_relations(plan):
+    found = set()
+    if "Relation Name" in plan:
+        found.add(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found |= scanned_relations(child)
+    return found
+
+
+def test_convert_moves_rows_into_monthly_partitions(partitioned_engine):
+    with partitioned_engine.connect() as conn:
+        manager = PartitionManager(conn)
+        assert manager.is_partitioned("sales")
+        assert conn.execute(text("SELECT count(*) FROM sales")).scalar() == 401
+        assert conn.execute(text("SELECT count(*) FROM sales_default")).scalar() == 0
+        assert conn.execute(text("SELECT to_regclass('sales_unpartitioned')")).scalar() is None
+
+        names = [partition.name for partition in manager.partitions("sales")]
+        assert partition_name("sales", month_start(TODAY - timedelta(days=400))) == names[0]
+        assert partition_name("sales", add_months(THIS_MONTH, 3)) == names[-1]
+
+        # New rows keep using the existing id sequence
+        conn.execute(text(
+            "INSERT INTO sales (transaction_date, garment_id, panel_id, size, quantity, unit_price, "
+            "discount_percentage, total_amount, is_return) VALUES (CURRENT_DATE, 1, 1, 'M', 1, 399, 0, 399, false)"
+        ))
+        assert conn.execute(text("SELECT max(id) FROM sales")).scalar() == 402
+
+
+def test_date_filtered_reports_prune_partitions(partitioned_engine):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    start = TODAY - timedelta(days=3)
+    session = sessionmaker(bind=partitioned_engine)()
+    event.listen(partitioned_engine, "before_cursor_execute", capture)
+    try:
+        service = ReportsService(session)
+        service.daily_sales_report(TODAY)
+        service.discount_report_general(start, TODAY)
+        service.panel_wise_sales_report(start, TODAY)
+    finally:
+        event.remove(partitioned_engine, "before_cursor_execute", capture)
+        session.close()
+
+    allowed = {partition_name("sales", month_start(start)), partition_name("sales", THIS_MONTH),
+               "sales_default"}
+    with partitioned_engine.connect() as conn:
+        for statement, parameters in {(s, json.dumps(p, default=str)): (s, p) for s, p in statements}.values():
+            plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+            sales_relations = {
+                name for name in scanned_relations(plan[0]["Plan"]) if name.startswith("sales_")
+                and name != "sales_daily_rollup"
+            }
+            assert sales_relations <= allowed, statement
+
+
+def test_ensure_partitions_moves_rows_out_of_default(partitioned_engine):
+    far = add_months(THIS_MONTH, 12)
+    with partitioned_engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO sales (transaction_date, garment_id, panel_id, size, quantity, unit_price, "
+            "discount_percentage, total_amount, is_return) VALUES (:day, 1, 1, 'M', 1, 399, 0, 399, false)"
+        ), {"day": far + timedelta(days=4)})
+        assert conn.execute(text("SELECT count(*) FROM sales_default")).scalar() == 1
+
+        created = PartitionManager(conn).ensure_partitions("sales", far, far)
+
+        assert created == [partition_name("sales", far)]
+        assert conn.execute(text("SELECT count(*) FROM sales_default")).scalar() == 0
+        assert conn.execute(text(f"SELECT count(*) FROM {created[0]}")).scalar() == 1
+
+
+def test_archive_writes_parquet_and_drops_partitions(partitioned_engine, tmp_path):
+    import pyarrow.parquet as pq
+
+    cutoff = add_months(THIS_MONTH, -6)
+    with sessionmaker(bind=partitioned_engine)() as session:
+        expected = session.execute(
+            text("SELECT count(*) FROM sales WHERE transaction_date < :cutoff"), {"cutoff": cutoff}
+        ).scalar()
+        archived = PartitionManager(session).archive("sales", cutoff, tmp_path)
+
+        assert sum(entry["rows"] for entry in archived) == expected
+        assert session.execute(
+            text("SELECT count(*) FROM sales WHERE transaction_date < :cutoff"), {"cutoff": cutoff}
+        ).scalar() == 0
+        assert all(
+            session.execute(text("SELECT to_regclass(:name)"), {"name": entry["partition"]}).scalar() is None
+            for entry in archived
+        )
+
+    table = pq.read_table(archived[0]["path"])
+    assert table.num_rows == archived[0]["rows"]
+    assert table.column("transaction_date").to_pylist()[0] < cutoff
+
+
+def test_archive_records_watermark_and_rollup_keeps_archived_totals(partitioned_engine, tmp_path):
+    cutoff = add_months(THIS_MONTH, -6)
+    with sessionmaker(bind=partitioned_engine)() as session:
+        rollup = SalesRollupService(session)
+        rollup.rebuild()
+        PartitionManager(session).archive("sales", cutoff, tmp_path)
+        assert session.execute(
+            text("SELECT archived_before FROM partition_archives WHERE table_name = 'sales'")
+        ).scalar() == cutoff
+
+        # Unbounded maintenance covers only the months still in the database
+        rollup.rebuild()
+        result = rollup.check_consistency()
+        assert result["consistent"]
+        assert result["period"]["start_date"] == cutoff.isoformat()
+        assert session.execute(
+            text("SELECT count(*) FROM sales_daily_rollup WHERE transaction_date < :cutoff"),
+            {"cutoff": cutoff}
+        ).scalar() > 0
+        with pytest.raises(ArchivedPeriodError):
+            rollup.rebuild(add_months(cutoff, -1), cutoff)
+
+
+def test_backfill_moves_deferred_rows_in_batches(partitioned_engine):
+    with sessionmaker(bind=partitioned_engine)() as session:
+        moved = PartitionManager(session).backfill("paid_ads", batch_size=100)
+
+        assert moved == 401
+        assert session.execute(text("SELECT count(*) FROM paid_ads")).scalar() == 401
+        assert session.execute(text("SELECT to_regclass('paid_ads_unpartitioned')")).scalar() is None
+
+
+def test_migration_reverts_to_plain_tables(partitioned_engine):
+    with partitioned_engine.begin() as conn:
+        load_migration().revert(conn, "paid_ads")
+
+        assert not PartitionManager(conn).is_partitioned("paid_ads")
+        assert conn.execute(text("SELECT count(*) FROM paid_ads")).scalar() == 401
+        indexes = conn.execute(text("SELECT indexname FROM pg_indexes WHERE tablename = 'paid_ads'")).scalars()
+        assert set(indexes) == {"paid_ads_pkey", "ix_paid_ads_ad_date", "ix_paid_ads_panel_date"}
+
+
+def test_premake_creates_missing_months_once(partitioned_engine):
+    ahead = add_months(THIS_MONTH, 3)
+    with partitioned_engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE {partition_name('sales', ahead)}"))
+
+    with partitioned_engine.connect() as holder:
+        holder.execute(text("SELECT pg_advisory_lock(:key)"), {"key": PREMAKE_LOCK_KEY})
+        assert premake_partitions(partitioned_engine) == {}
+        holder.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": PREMAKE_LOCK_KEY})
+
+    assert premake_partitions(partitioned_engine)["sales"] == [partition_name("sales", ahead)]
+    assert premake_partitions(partitioned_engine) == {"sales": [], "paid_ads": []}
@@ -0,0 +1,70 @@
+import logging
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import generate_latest
+from sqlalchemy import text
+
+from app.core.profiling import ProfilingMiddleware, registry, remove_sql_hooks, statement_shape
+
+
+@pytest.fixture
+def profiled(monkeypatch, tmp_path):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "PROFILING_N_PLUS_ONE_THRESHOLD", 10)
+    monkeypatch.setattr(settings, "PROFILING_DUMP_DIR", str(tmp_path))
+    yield settings
+    remove_sql_hooks()
+
+
+def server_timing(response):
+    return dict(
+        (part.split(";")[0].strip(), part) for part in response.headers["server-timing"].split(",")
+    )
+
+
+def test_statement_shape_ignores_in_list_length():
+    assert statement_shape("SELECT * FROM sales WHERE id IN (?, ?, ?)") == \
+        statement_shape("SELECT *  FROM sales\n WHERE id IN (?)")
+
+
+def test_counts_sql_of_sync_endpoints_and_flags_n_plus_one(profiled, sqlite_engine, caplog):
+    app = FastAPI()
+
+    @app.get("/loop/{n}")
+    def loop(n: int):
+        with sqlite_engine.connect() as conn:
+            for i in range(n):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return {"ok": True}
+
+    client = TestClient(ProfilingMiddleware(app))
+    with caplog.at_level(logging.WARNING, logger="app.core.profiling"):
+        few = client.get("/loop/3")
+        many = client.get("/loop/12")
+
+    assert 'desc="3 statements"' in server_timing(few)["db"]
+    assert 'desc="12 statements"' in server_timing(many)["db"]
+    assert [r.getMessage() for r in caplog.records if "N+1" in r.getMessage()] == [
+        "Possible N+1 on GET /loop/{n}: statement run 12 times: SELECT ?"
+    ]
+    exposition = generate_latest(registry).decode()
+    assert 'http_request_n_plus_one_total{method="GET",route="/loop/{n}"} 1.0' in exposition
+    assert 'http_requests_total{method="GET",route="/loop/{n}",status="200"} 2.0' in exposition
+
+
+def test_async_report_timing_and_sampled_profile(api_client, profiled, monkeypatch, tmp_path):
+    from app.main import app
+
+    monkeypatch.setattr(profiled, "REPORT_CACHE_ENABLED", False)
+    monkeypatch.setattr(profiled, "PROFILING_SAMPLE_RATE", 1.0)
+    monkeypatch.setattr(profiled, "PROFILING_SLOW_REQUEST_MS", 0)
+    client = TestClient(ProfilingMiddleware(app))
+
+    response = client.get("/api/v1/reports/fabric/stock-sheet/total")
+
+    assert response.status_code == 200
+    assert 'desc="0 statements"' not in server_timing(response)["db"]
+    assert (tmp_path / response.headers["x-profile"]).exists()
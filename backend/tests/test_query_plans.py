@@ -0,0 +1,149 @@
+# EXPLAIN every query the reports issue against a seeded PostgreSQL database
+# and fail on sequential scans of the large tables. Opt-in:
+#   TEST_DATABASE_URL=postgresql://... pytest -m integration tests/test_query_plans.py
+import json
+import os
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.services.panel_activity import PanelActivityService
+from app.services.reports import ReportsService
+from app.services.sales_rollup import SalesRollupService
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "")
+
+pytestmark = [
+    pytest.mark.integration,
+    pytest.mark.skipif(
+        not TEST_DATABASE_URL.startswith("postgresql"),
+        reason="query plan checks need TEST_DATABASE_URL pointing at PostgreSQL"
+    ),
+]
+
+# Tables that grow with trading volume; small dimension tables may be scanned
+LARGE_TABLES = {"sales", "sales_daily_rollup", "paid_ads", "production_activities"}
+TODAY = date.today()
+WEEK_AGO = TODAY - timedelta(days=7)
+MONTH_AGO = TODAY - timedelta(days=30)
+
+REPORTS = {
+    "fabric_stock_sheet_total": lambda s: s.fabric_stock_sheet_total(),
+    "fabric_stock_sheet_by_type": lambda s: s.fabric_stock_sheet_by_type("JERSEY"),
+    "fabric_stock_sheet_by_period": lambda s: s.fabric_stock_sheet_by_period(MONTH_AGO, TODAY),
+    "fabric_cost_sheet": lambda s: s.fabric_cost_sheet(),
+    "fabric_stock_summary": lambda s: s.fabric_stock_summary(),
+    "daily_sales_report": lambda s: s.daily_sales_report(WEEK_AGO),
+    "daily_sales_summary": lambda s: s.daily_sales_summary(WEEK_AGO),
+    "daily_sales_report_single_sku": lambda s: s.daily_sales_report_single_sku(WEEK_AGO, 1),
+    "panel_wise_sales_report": lambda s: s.panel_wise_sales_report(WEEK_AGO, TODAY),
+    "inactive_panel_report": lambda s: s.inactive_panel_report(30),
+    "slow_moving_inventory_report": lambda s: s.slow_moving_inventory_report(90),
+    "fast_moving_inventory_report": lambda s: s.fast_moving_inventory_report(90),
+    "slow_moving_count": lambda s: s.slow_moving_count(90),
+    "fast_moving_count": lambda s: s.fast_moving_count(90),
+    "inventory_classification_report": lambda s: s.inventory_classification_report(90),
+    "production_plan_report": lambda s: s.production_plan_report(MONTH_AGO, TODAY),
+    "production_plan_summary": lambda s: s.production_plan_summary(MONTH_AGO, TODAY),
+    "daily_production_variance_report": lambda s: s.daily_production_variance_report(WEEK_AGO),
+    "purchase_raise_for_yarn_report": lambda s: s.purchase_raise_for_yarn_report(),
+    "yarn_forecast_report": lambda s: s.yarn_forecast_report(30),
+    "bundle_sku_sales_report": lambda s: s.bundle_sku_sales_report(WEEK_AGO, TODAY),
+    "discount_report_general": lambda s: s.discount_report_general(WEEK_AGO, TODAY),
+    "discount_report_by_panel": lambda s: s.discount_report_by_panel(WEEK_AGO, TODAY),
+    "settlement_report": lambda s: s.settlement_report(1, MONTH_AGO, TODAY),
+}
+
+SEED_SQL = """
+INSERT INTO panels (panel_name, panel_type, is_active)
+SELECT 'Panel ' || i, 'e-commerce', true FROM generate_series(1, 20) AS i;
+
+INSERT INTO garments (style_sku, name, category, sizes, mrp, is_active)
+SELECT 'SKU-' || i, 'Garment ' || i, 'T-Shirt', ARRAY['S', 'M', 'L', 'XL'], 499, true
+FROM generate_series(1, 200) AS i;
+
+INSERT INTO inventory (garment_id, size, good_stock, virtual_stock)
+SELECT g.id, s.size, 50, 0
+FROM garments g CROSS JOIN (VALUES ('S'), ('M'), ('L'), ('XL')) AS s(size);
+
+INSERT INTO sales (transaction_date, garment_id, panel_id, size, quantity, unit_price,
+                   discount_percentage, total_amount, is_return)
+SELECT CURRENT_DATE - (i % 730), 1 + i % 200, 1 + i % 20, (ARRAY['S', 'M', 'L', 'XL'])[1 + i % 4],
+       1 + i % 3, 399, 10, 359.10 * (1 + i % 3), i % 17 = 0
+FROM generate_series(1, 300000) AS i;
+
+INSERT INTO production_plans (plan_name, garment_id, planned_quantity, target_date, status)
+SELECT 'Plan ' || i, 1 + i % 200, 500, CURRENT_DATE - (i % 730),
+       (ARRAY['PLANNED', 'IN_PROGRESS', 'COMPLETED'])[1 + i % 3]
+FROM generate_series(1, 5000) AS i;
+
+INSERT INTO production_activities (production_plan_id, activity_type, activity_date, quantity,
+                                   gross_weight_calculated, gross_weight_actual)
+SELECT 1 + i % 5000, 'CUTTING', CURRENT_DATE - (i % 730), 10, 100, 101
+FROM generate_series(1, 100000) AS i;
+
+INSERT INTO paid_ads (ad_date, panel_id, platform, campaign_name, daily_spend)
+SELECT CURRENT_DATE - (i % 730), 1 + i % 20, 'Meta', 'Campaign ' || i % 50, 500
+FROM generate_series(1, 50000) AS i;
+"""
+
+
+@pytest.fixture(scope="module")
+def plan_engine():
+    from app.db.session import Base
+    import app.db.models  # noqa: F401
+
+    engine = create_engine(TEST_DATABASE_URL)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(text(SEED_SQL))
+    with sessionmaker(bind=engine)() as session:
+        SalesRollupService(session).rebuild(TODAY - timedelta(days=730), TODAY)
+        PanelActivityService(session).rebuild()
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE"))
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def seq_scanned_tables(plan):
+    """Large tables read with a Seq Scan anywhere in an EXPLAIN JSON plan."""
+    found = set()
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in LARGE_TABLES:
+        found.add(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found |= seq_scanned_tables(child)
+    return found
+
+
+@pytest.mark.parametrize("use_rollup", [False, True], ids=["sales", "rollup"])
+@pytest.mark.parametrize("report", sorted(REPORTS))
+def test_report_queries_avoid_sequential_scans(plan_engine, report, use_rollup):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    session = sessionmaker(bind=plan_engine)()
+    event.listen(plan_engine, "before_cursor_execute", capture)
+    try:
+        REPORTS[report](ReportsService(session, use_rollup=use_rollup))
+    finally:
+        event.remove(plan_engine, "before_cursor_execute", capture)
+        session.close()
+
+    assert statements
+    distinct = {(s, json.dumps(p, default=str)): (s, p) for s, p in statements}
+    offenders = []
+    with plan_engine.connect() as conn:
+        for statement, parameters in distinct.values():
+            plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+            tables = seq_scanned_tables(plan[0]["Plan"])
+            if tables:
+                offenders.append(f"{sorted(tables)}: {statement}")
+    assert not offenders, "\n\n".join(offenders)
@@ -0,0 +1,124 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.db.models import Garment
+from app.db.replica import ReplicaMonitor, SessionRouter, ThreadedSessionRouter
+from app.db.session import Base
+
+
+def make_database(path, garment_name):
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Garment(style_sku="SKU-1", name=garment_name, category="T-Shirt",
+                            sizes=["M"], mrp=Decimal("499.00")))
+        session.commit()
+    engine.dispose()
+    return create_async_engine(f"sqlite+aiosqlite:///{path}")
+
+
+@pytest.fixture
+def databases(tmp_path):
+    primary = make_database(tmp_path / "primary.db", "from primary")
+    replica = make_database(tmp_path / "replica.db", "from replica")
+    return primary, replica
+
+
+def read_garment_name(router):
+    async def read():
+        async with router.session() as db:
+            return (await db.scalars(select(Garment.name))).one()
+
+    return asyncio.run(read())
+
+
+def test_reads_use_replica_when_fresh(databases):
+    primary, replica = databases
+    monitor = ReplicaMonitor(replica, max_lag_seconds=30)
+    router = SessionRouter(async_sessionmaker(primary), async_sessionmaker(replica), monitor)
+
+    assert read_garment_name(router) == "from replica"
+    assert read_garment_name(SessionRouter(async_sessionmaker(primary))) == "from primary"
+
+
+def test_lagging_replica_falls_back_to_primary(databases, monkeypatch):
+    primary, replica = databases
+    monitor = ReplicaMonitor(replica, max_lag_seconds=30, check_interval_seconds=0)
+    router = SessionRouter(async_sessionmaker(primary), async_sessionmaker(replica), monitor)
+
+    async def lagging():
+        return 45.0
+
+    monkeypatch.setattr(monitor, "lag_seconds", lagging)
+    assert read_garment_name(router) == "from primary"
+
+
+def test_unreachable_replica_falls_back_and_is_rechecked_after_interval(databases, tmp_path):
+    primary, _ = databases
+    missing = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    monitor = ReplicaMonitor(missing, max_lag_seconds=30, check_interval_seconds=60)
+    router = SessionRouter(async_sessionmaker(primary), async_sessionmaker(missing), monitor)
+
+    assert read_garment_name(router) == "from primary"
+    checked_at = monitor._checked_at
+    assert read_garment_name(router) == "from primary"
+    assert monitor._checked_at == checked_at
+
+
+def test_threaded_reads_retry_on_primary_when_replica_fails_mid_request(databases, tmp_path):
+    _, replica = databases
+    monitor = ReplicaMonitor(replica, max_lag_seconds=30, check_interval_seconds=60)
+    primary_db = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica_db = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    router = ThreadedSessionRouter(sessionmaker(primary_db), sessionmaker(replica_db), monitor)
+    calls = []
+
+    def read_name(db):
+        calls.append(db.get_bind().url.database)
+        if db.get_bind() is replica_db:
+            raise OperationalError("SELECT", {}, Exception("server closed the connection"))
+        return db.scalars(select(Garment.name)).one()
+
+    try:
+        assert asyncio.run(router.run(read_name)) == "from primary"
+    finally:
+        router.shutdown()
+        primary_db.dispose()
+        replica_db.dispose()
+    assert [path.rsplit("/", 1)[-1] for path in calls] == ["replica.db", "primary.db"]
+    assert not monitor._usable
+
+
+def test_replica_failing_mid_request_answers_503_and_reads_move_to_primary(databases, tmp_path):
+    from fastapi.testclient import TestClient
+    from app.db.session import get_read_db
+    from app.main import app
+
+    # Reachable, so the health check passes, but without tables: reads fail
+    broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'empty.db'}", poolclass=NullPool)
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}", poolclass=NullPool)
+    monitor = ReplicaMonitor(broken, max_lag_seconds=30, check_interval_seconds=60)
+    router = SessionRouter(async_sessionmaker(primary), async_sessionmaker(broken), monitor)
+
+    async def read_db():
+        async with router.session() as db:
+            yield db
+
+    app.dependency_overrides[get_read_db] = read_db
+    try:
+        client = TestClient(app)
+        failed = client.get("/api/v1/fabrics/")
+        retried = client.get("/api/v1/fabrics/")
+    finally:
+        app.dependency_overrides.clear()
+
+    assert failed.status_code == 503
+    assert failed.headers["retry-after"] == "1"
+    assert retried.status_code == 200
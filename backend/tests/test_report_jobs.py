@@ -0,0 +1,98 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Garment, Panel, ReportJob, Sale
+from app.services.report_jobs import ReportJobQueue, ReportJobService, get_report_job_queue
+
+
+@pytest.fixture
+def job_queue(api_client, sqlite_engine, monkeypatch):
+    """A single worker thread running jobs against the test database."""
+    from app.core.config import settings
+    from app.main import app
+
+    monkeypatch.setattr(settings, "REPORT_CACHE_ENABLED", False)
+    queue = ReportJobQueue(ThreadPoolExecutor(1), sessionmaker(bind=sqlite_engine, autoflush=False))
+    app.dependency_overrides[get_report_job_queue] = lambda: queue
+    yield queue
+    queue.shutdown()
+
+
+def seed_sales(db):
+    panel = Panel(panel_name="Marketplace", panel_type="e-commerce")
+    garment = Garment(style_sku="TEE-01", name="Basic Tee", category="T-Shirt",
+                      sizes=["M"], mrp=Decimal("499.00"))
+    db.add_all([panel, garment])
+    db.flush()
+    for quantity in (2, 3):
+        db.add(Sale(transaction_date=date(2026, 3, 1), garment_id=garment.id, panel_id=panel.id,
+                    size="M", quantity=quantity, unit_price=Decimal("400.00"),
+                    discount_percentage=Decimal("0"), total_amount=Decimal("400.00") * quantity))
+    db.commit()
+
+
+def drain(queue):
+    queue.executor.shutdown(wait=True)
+    queue._executor = None
+
+
+def test_identical_requests_share_one_job(api_client, db, job_queue):
+    seed_sales(db)
+    enqueued = []
+    enqueue = job_queue.enqueue
+    job_queue.enqueue = lambda job_id: (enqueued.append(job_id), enqueue(job_id))
+
+    request = {"report": "daily_sales_summary", "params": {"report_date": "2026-03-01"}}
+    first = api_client.post("/api/v1/reports/jobs", json=request)
+    second = api_client.post("/api/v1/reports/jobs", json=request)
+    assert first.status_code == 202
+    assert second.json()["id"] == first.json()["id"]
+    drain(job_queue)
+
+    job = api_client.get(f"/api/v1/reports/jobs/{first.json()['id']}").json()
+    assert (job["status"], job["progress"]) == ("SUCCEEDED", 100)
+    assert job["result"]["total_units_sold"] == 5
+    assert job["params"] == {"report_date": "2026-03-01"}
+
+    # A finished, unexpired result is reused without recomputing
+    third = api_client.post("/api/v1/reports/jobs", json=request).json()
+    assert third["id"] == job["id"]
+    assert enqueued == [job["id"]]
+
+
+def test_rejects_unknown_reports_and_bad_params(api_client, job_queue):
+    unknown = api_client.post("/api/v1/reports/jobs", json={"report": "summary_sections"})
+    bad_date = api_client.post("/api/v1/reports/jobs", json={
+        "report": "daily_sales_summary", "params": {"report_date": "yesterday"}
+    })
+    missing = api_client.post("/api/v1/reports/jobs", json={"report": "daily_sales_summary"})
+
+    assert [r.status_code for r in (unknown, bad_date, missing)] == [422, 422, 422]
+    assert api_client.get("/api/v1/reports/jobs/999").status_code == 404
+
+
+def test_stale_and_failed_jobs_are_not_reused(db, sqlite_engine):
+    service = ReportJobService(db)
+    stale, created = service.submit("inactive_panel_report", {"days_threshold": 30})
+    assert created
+    stale.created_at = datetime.utcnow() - timedelta(days=1)
+    db.commit()
+
+    fresh, created = service.submit("inactive_panel_report", {})
+    assert created and fresh.id != stale.id
+    db.refresh(stale)
+    assert stale.status == "FAILED"
+
+    ReportJobService(sessionmaker(bind=sqlite_engine)()).run(fresh.id)
+    db.refresh(fresh)
+    assert fresh.status == "SUCCEEDED"
+    assert fresh.expires_at > fresh.finished_at
+
+    fresh.expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    assert service.purge() == 2
+    assert db.query(ReportJob).count() == 0
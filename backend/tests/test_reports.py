@@ -0,0 +1,222 @@
+import asyncio
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+
+import httpx
+
+from app.db.models import Garment, Inventory, Panel, ProductionActivity, ProductionPlan, Sale
+from app.services.cached_reports import REPORT_CACHE_POLICIES
+from app.services.reports import ReportsService
+from tests.benchmarks.test_reports_at_scale import REPORTS
+from tests.test_query_plans import REPORTS as PLAN_CHECKED_REPORTS
+
+
+def seed_catalogue(db, garment_count, sizes=("S", "M", "L"), start=0):
+    """Create garments with inventory and a mix of slow and fast sellers."""
+    panel = Panel(panel_name="Marketplace", panel_type="e-commerce")
+    db.add(panel)
+    db.flush()
+
+    today = date.today()
+    for i in range(start, start + garment_count):
+        garment = Garment(
+            style_sku=f"SKU-{i:05d}",
+            name=f"Garment {i}",
+            category="T-Shirt",
+            sizes=list(sizes),
+            mrp=Decimal("499.00"),
+        )
+        db.add(garment)
+        db.flush()
+        for size in sizes:
+            db.add(Inventory(garment_id=garment.id, size=size, good_stock=50, virtual_stock=0))
+        # Even garments sell 2 units/day of size M over 90 days
+        if i % 2 == 0:
+            db.add(Sale(
+                transaction_date=today - timedelta(days=5),
+                garment_id=garment.id,
+                panel_id=panel.id,
+                size="M",
+                quantity=180,
+                unit_price=Decimal("399.00"),
+                total_amount=Decimal("71820.00"),
+            ))
+    db.commit()
+
+
+def test_velocity_reports_classify_items(db):
+    seed_catalogue(db, 4)
+    service = ReportsService(db)
+
+    slow = service.slow_moving_inventory_report(90)
+    fast = service.fast_moving_inventory_report(90)
+
+    assert slow["slow_moving_items_count"] == 10
+    assert fast["fast_moving_items_count"] == 2
+    item = fast["fast_moving_items"][0]
+    assert item["size"] == "M"
+    assert item["sales_in_period"] == 180
+    assert item["turnover_rate_per_day"] == 2.0
+    assert item["style_sku"].startswith("SKU-")
+
+
+def test_velocity_reports_query_count_is_constant(db, count_statements):
+    """Regression guard against per-row N+1 lookups in the velocity reports."""
+    service = ReportsService(db)
+
+    seed_catalogue(db, 5)
+    with count_statements() as small:
+        service.slow_moving_inventory_report(90)
+        service.fast_moving_inventory_report(90)
+
+    seed_catalogue(db, 100, start=5)
+    with count_statements() as large:
+        service.slow_moving_inventory_report(90)
+        service.fast_moving_inventory_report(90)
+
+    assert small.count == large.count == 2
+
+
+def test_panel_wise_report_aggregates_in_sql_and_lists_idle_panels(db, count_statements):
+    seed_catalogue(db, 4)
+    garment = db.query(Garment).first()
+    panel = db.query(Panel).one()
+    db.add(Sale(
+        transaction_date=date.today() - timedelta(days=2), garment_id=garment.id, panel_id=panel.id,
+        size="M", quantity=3, unit_price=Decimal("399.00"), total_amount=Decimal("1197.00"), is_return=True
+    ))
+    idle = Panel(panel_name="Retail", panel_type="offline")
+    db.add(idle)
+    db.commit()
+    service = ReportsService(db, use_rollup=False)
+
+    with count_statements() as counter:
+        report = service.panel_wise_sales_report(date.today() - timedelta(days=30), date.today())
+
+    assert counter.count == 2
+    line = report["panels"][str(panel.id)]
+    assert (line["sales_transactions"], line["return_transactions"]) == (2, 1)
+    assert (line["total_units_sold"], line["total_units_returned"]) == (360, 3)
+    assert line["net_sales_value"] == 71820.0 * 2 - 1197.0
+    assert report["panels"][str(idle.id)]["total_transactions"] == 0
+    assert report["panels"][str(idle.id)]["gross_sales_value"] == 0
+
+
+def seed_production(db, plan_count, statuses=("PLANNED", "IN_PROGRESS", "COMPLETED")):
+    garment = Garment(style_sku=f"PRD-{plan_count}", name="Polo", category="T-Shirt", sizes=["M"],
+                      mrp=Decimal("499.00"))
+    db.add(garment)
+    db.flush()
+    today = date.today()
+    for i in range(plan_count):
+        plan = ProductionPlan(
+            plan_name=f"Plan {i}", garment_id=garment.id, planned_quantity=100,
+            target_date=today, status=statuses[i % len(statuses)]
+        )
+        db.add(plan)
+        db.flush()
+        db.add_all([
+            ProductionActivity(production_plan_id=plan.id, activity_type="CUTTING", activity_date=today,
+                               quantity=Decimal("40"), gross_weight_calculated=Decimal("10"),
+                               gross_weight_actual=Decimal("10.5")),
+            ProductionActivity(production_plan_id=plan.id, activity_type="STITCHING", activity_date=today,
+                               quantity=Decimal("25")),
+        ])
+    db.commit()
+
+
+def test_production_reports_query_count_is_constant(db, count_statements):
+    service = ReportsService(db)
+
+    seed_production(db, 3)
+    with count_statements() as small:
+        service.production_plan_report()
+        service.daily_production_variance_report(date.today())
+
+    seed_production(db, 40)
+    with count_statements() as large:
+        report = service.production_plan_report()
+        variance = service.daily_production_variance_report(date.today())
+
+    assert small.count == large.count == 2
+    plan = report["plans_by_status"]["PLANNED"][0]
+    assert (plan["actual_quantity"], plan["completion_percentage"], plan["activities_count"]) == (40.0, 40.0, 2)
+    assert plan["garment_name"] == "Polo"
+    assert variance["summary"]["total_activities"] == 86
+    assert variance["summary"]["activities_with_variance_data"] == 43
+    assert variance["variance_details"][0]["production_plan"] == "Plan 0"
+
+
+def test_production_plan_report_keeps_unknown_statuses(db):
+    seed_production(db, 4, statuses=("PLANNED", "ON_HOLD"))
+
+    report = ReportsService(db).production_plan_report()
+
+    assert report["summary"] == {"total_plans": 4, "planned": 2, "in_progress": 0, "completed": 0}
+    assert [p["plan_name"] for p in report["plans_by_status"]["ON_HOLD"]] == ["Plan 1", "Plan 3"]
+
+
+def test_report_endpoint_runs_on_async_session(api_client, db, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "REPORT_CACHE_ENABLED", False)
+    seed_catalogue(db, 4)
+
+    response = api_client.get("/api/v1/reports/inventory/fast-moving?days_period=90")
+
+    assert response.status_code == 200
+    assert response.json()["fast_moving_items_count"] == 2
+
+
+def test_summary_sections_match_full_reports(api_client, db, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "REPORT_CACHE_ENABLED", False)
+    seed_catalogue(db, 6)
+    service = ReportsService(db)
+
+    body = api_client.get("/api/v1/reports/summary/all").json()
+
+    assert body["fabric_stock"] == service.fabric_stock_sheet_total()["summary"]
+    assert body["daily_sales"] == service.daily_sales_report(date.today())["summary"]
+    assert body["slow_moving_count"] == service.slow_moving_inventory_report(90)["slow_moving_items_count"]
+    assert body["fast_moving_count"] == service.fast_moving_inventory_report(90)["fast_moving_items_count"]
+    assert body["production_plans"] == service.production_plan_report()["summary"]
+    assert set(body["timings_ms"]) == set(ReportsService.summary_sections(date.today()))
+
+
+def test_other_requests_are_served_while_a_report_computes(api_client, monkeypatch):
+    from app.core.config import settings
+    from app.main import app
+
+    monkeypatch.setattr(settings, "REPORT_CACHE_ENABLED", False)
+    started, release = threading.Event(), threading.Event()
+
+    def blocking_report(self, include_items=True):
+        started.set()
+        release.wait(5)  # stands in for CPU-bound aggregation holding its thread
+        return {"summary": {}}
+
+    monkeypatch.setattr(ReportsService, "fabric_cost_sheet", blocking_report)
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            report = asyncio.create_task(client.get("/api/v1/reports/fabric/cost-sheet"))
+            assert await asyncio.to_thread(started.wait, 5)
+            health = await asyncio.wait_for(client.get("/health"), 1)
+            release.set()
+            return health, await report
+
+    health, report = asyncio.run(scenario())
+
+    assert health.status_code == 200
+    assert report.json() == {"summary": {}}
+
+
+def test_every_report_is_benchmarked():
+    assert set(REPORTS) == set(REPORT_CACHE_POLICIES)
+
+
+def test_every_report_is_plan_checked():
+    assert set(PLAN_CHECKED_REPORTS) == set(REPORT_CACHE_POLICIES)
@@ -0,0 +1,77 @@
+from decimal import Decimal
+
+from app.db.models import Garment, Panel, Sale
+from app.services.sales_rollup import SalesRollupService
+
+
+def seed_master_data(db):
+    garment = Garment(style_sku="TEE-01", name="Basic Tee", category="T-Shirt",
+                      sizes=["M", "L"], mrp=Decimal("500.00"))
+    panel = Panel(panel_name="Marketplace", panel_type="e-commerce")
+    db.add_all([garment, panel])
+    db.commit()
+    return garment, panel
+
+
+def sale_row(garment, panel, **overrides):
+    row = {
+        "transaction_date": "2026-03-01",
+        "garment_id": garment.id,
+        "panel_id": panel.id,
+        "size": "M",
+        "quantity": 2,
+        "unit_price": "400.00",
+        "total_amount": "800.00",
+    }
+    row.update(overrides)
+    return row
+
+
+def test_bulk_json_reports_row_errors(api_client, db):
+    garment, panel = seed_master_data(db)
+    rows = [
+        sale_row(garment, panel),
+        sale_row(garment, panel, quantity="two"),
+        sale_row(garment, panel, garment_id=9999),
+        sale_row(garment, panel, is_return=True, quantity=1, total_amount="400.00"),
+    ]
+
+    response = api_client.post("/api/v1/sales/bulk", json=rows)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["received"], body["inserted"], body["rejected"]) == (4, 2, 2)
+    assert [e["row"] for e in body["errors"]] == [2, 3]
+    assert body["errors"][1]["errors"] == ["garment_id: Garment 9999 not found"]
+    assert db.query(Sale).count() == 2
+    assert SalesRollupService(db).check_consistency()["consistent"]
+
+
+def test_bulk_atomic_rejects_whole_batch(api_client, db):
+    garment, panel = seed_master_data(db)
+    rows = [sale_row(garment, panel), sale_row(garment, panel, panel_id=9999)]
+
+    body = api_client.post("/api/v1/sales/bulk?atomic=true", json=rows).json()
+
+    assert body["inserted"] == 0
+    assert body["rejected"] == 2
+    assert db.query(Sale).count() == 0
+
+
+def test_bulk_csv_upload(api_client, db):
+    garment, panel = seed_master_data(db)
+    csv_body = (
+        "transaction_date,garment_id,panel_id,size,quantity,unit_price,total_amount,is_return,invoice_number\n"
+        f"2026-03-01,{garment.id},{panel.id},M,2,400.00,800.00,false,INV-1\n"
+        f"2026-03-01,{garment.id},{panel.id},L,1,400.00,400.00,true,\n"
+    )
+
+    response = api_client.post(
+        "/api/v1/sales/bulk/csv",
+        files={"file": ("eod.csv", csv_body, "text/csv")},
+    )
+
+    assert response.json()["inserted"] == 2
+    returned = db.query(Sale).filter(Sale.size == "L").one()
+    assert returned.is_return is True
+    assert returned.invoice_number is None
@@ -0,0 +1,27 @@
+from app.db.session import engine_options, split_pool, to_async_url
+
+
+def test_postgres_engines_get_pool_and_statement_timeout():
+    options = engine_options("postgresql://u:p@db/anthrilo", 7, 3, 5000)
+
+    assert options["pool_size"] == 7
+    assert options["max_overflow"] == 3
+    assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+
+def test_asyncpg_timeout_is_passed_as_server_setting():
+    options = engine_options(to_async_url("postgresql://u:p@db/anthrilo"), 5, 5, 120000)
+
+    assert options["connect_args"] == {"server_settings": {"statement_timeout": "120000"}}
+
+
+def test_sqlite_and_disabled_timeouts_skip_connect_args():
+    assert "pool_size" not in engine_options("sqlite:///local.db", 5, 5, 5000)
+    assert "connect_args" not in engine_options("postgresql://u:p@db/anthrilo", 5, 5, 0)
+
+
+def test_api_pool_budget_is_split_between_sync_and_async_engines():
+    assert split_pool(8, 4) == ((4, 2), (4, 2))
+    assert split_pool(5, 3) == ((2, 1), (3, 2))
+    # neither side may end up with pool_size=0, which means unlimited
+    assert split_pool(1, 0) == ((1, 0), (1, 0))
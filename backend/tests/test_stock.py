@@ -0,0 +1,188 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.models import Garment, Inventory, Panel, StockMovement
+from app.services.stock import InsufficientStockError, StockService
+
+THREADS = 8
+MOVES_PER_THREAD = 25
+
+
+def seed_inventory(db, good_stock=100):
+    garment = Garment(style_sku="TEE-01", name="Basic Tee", category="T-Shirt",
+                      sizes=["M", "L"], mrp=Decimal("500.00"))
+    panel = Panel(panel_name="Marketplace", panel_type="e-commerce")
+    db.add_all([garment, panel])
+    db.flush()
+    inventory = Inventory(garment_id=garment.id, size="M", good_stock=good_stock, virtual_stock=0)
+    db.add(inventory)
+    db.flush()
+    StockService(db).open_balance(inventory)
+    db.commit()
+    return garment, panel, inventory
+
+
+def sale_payload(garment, panel, **overrides):
+    payload = {
+        "transaction_date": "2026-03-01",
+        "garment_id": garment.id,
+        "panel_id": panel.id,
+        "size": "M",
+        "quantity": 3,
+        "unit_price": "400.00",
+        "total_amount": "1200.00",
+    }
+    payload.update(overrides)
+    return payload
+
+
+def levels(db, inventory_id):
+    db.expire_all()
+    row = db.get(Inventory, inventory_id)
+    return row.good_stock, row.virtual_stock
+
+
+def test_sales_and_returns_post_movements(api_client, db):
+    garment, panel, inventory = seed_inventory(db)
+
+    sale = api_client.post("/api/v1/sales/", json=sale_payload(garment, panel)).json()
+    api_client.post("/api/v1/sales/", json=sale_payload(garment, panel, quantity=1, is_return=True,
+                                                        total_amount="400.00"))
+
+    assert levels(db, inventory.id) == (98, 0)
+    movements = db.scalars(select(StockMovement).order_by(StockMovement.id)).all()
+    assert [(m.movement_type, m.good_stock_delta) for m in movements] == [
+        ("OPENING", 100), ("SALE", -3), ("RETURN", 1)
+    ]
+    assert movements[1].sale_id == sale["id"]
+
+
+def test_bulk_ingest_posts_movements_and_creates_missing_rows(api_client, db):
+    garment, panel, inventory = seed_inventory(db)
+    rows = [sale_payload(garment, panel), sale_payload(garment, panel, size="L", quantity=2)]
+
+    assert api_client.post("/api/v1/sales/bulk", json=rows).json()["inserted"] == 2
+
+    assert levels(db, inventory.id) == (97, 0)
+    oversold = db.scalars(select(Inventory).where(Inventory.size == "L")).one()
+    assert oversold.good_stock == -2
+    assert StockService(db).check_consistency()["consistent"]
+
+
+def test_movement_endpoint_reserves_and_rejects_oversell(api_client, db):
+    _, _, inventory = seed_inventory(db, good_stock=5)
+
+    response = api_client.post(
+        f"/api/v1/inventory/{inventory.id}/movements",
+        json={"movement_type": "RESERVE", "quantity": 4, "reference": "ORDER-1"}
+    )
+    assert response.status_code == 200
+    assert (response.json()["good_stock"], response.json()["virtual_stock"]) == (1, 4)
+
+    response = api_client.post(
+        f"/api/v1/inventory/{inventory.id}/movements", json={"movement_type": "ISSUE", "quantity": 2}
+    )
+    assert response.status_code == 409
+    assert levels(db, inventory.id) == (1, 4)
+
+    ledger = api_client.get(f"/api/v1/inventory/{inventory.id}/movements").json()
+    assert [m["movement_type"] for m in ledger] == ["RESERVE", "OPENING"]
+
+
+def test_stocktake_is_posted_as_adjustment_and_rebuild_repairs_drift(api_client, db):
+    _, _, inventory = seed_inventory(db)
+
+    response = api_client.put(f"/api/v1/inventory/{inventory.id}", json={"good_stock": 90})
+    assert response.json()["good_stock"] == 90
+    service = StockService(db)
+    assert service.check_consistency()["consistent"]
+
+    db.get(Inventory, inventory.id).good_stock = 500  # written around the ledger
+    db.commit()
+    drift = service.check_consistency()
+    assert not drift["consistent"]
+    assert drift["mismatched"][0]["ledger"] == {"good_stock": 90, "virtual_stock": 0}
+
+    assert service.rebuild() == 1
+    assert levels(db, inventory.id) == (90, 0)
+
+
+@pytest.fixture
+def concurrent_engine(tmp_path):
+    """TEST_DATABASE_URL (PostgreSQL) when set, else a SQLite file."""
+    from app.db.session import Base
+
+    url = os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{tmp_path / 'stock.db'}"
+    engine = create_engine(url, pool_size=THREADS) if url.startswith("postgresql") else create_engine(url)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@pytest.mark.slow
+def test_concurrent_movements_on_one_sku_lose_no_updates(concurrent_engine):
+    Session = sessionmaker(bind=concurrent_engine)
+    with Session() as db:
+        _, _, inventory = seed_inventory(db, good_stock=THREADS * MOVES_PER_THREAD // 2)
+        inventory_id = inventory.id
+
+    def hammer(worker):
+        applied = rejected = 0
+        with Session() as db:
+            service = StockService(db)
+            for move in range(MOVES_PER_THREAD):
+                movement_type = "RECEIPT" if (worker + move) % 4 == 0 else "ISSUE"
+                try:
+                    service.apply_movement(inventory_id, movement_type, 1)
+                    db.commit()
+                    applied += 1 if movement_type == "RECEIPT" else -1
+                except InsufficientStockError:
+                    db.rollback()
+                    rejected += 1
+        return applied, rejected
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        results = list(pool.map(hammer, range(THREADS)))
+
+    with Session() as db:
+        good_stock, _ = levels(db, inventory_id)
+        assert good_stock == THREADS * MOVES_PER_THREAD // 2 + sum(net for net, _ in results)
+        assert good_stock >= 0
+        assert db.scalar(select(func.sum(StockMovement.good_stock_delta))) == good_stock
+        assert StockService(db).check_consistency()["consistent"]
+
+
+def test_bulk_counts_upsert_and_report_diffs(api_client, db):
+    garment, _, inventory = seed_inventory(db)
+    counts = [
+        {"garment_id": garment.id, "size": "M", "good_stock": 95},
+        {"garment_id": garment.id, "size": "L", "good_stock": 12, "warehouse_location": "A-01"},
+        {"garment_id": 9999, "size": "M", "good_stock": 1},
+        {"garment_id": garment.id, "size": "M", "good_stock": 90},
+    ]
+
+    body = api_client.post("/api/v1/inventory/bulk", json=counts).json()
+
+    assert (body["received"], body["created"], body["updated"], body["rejected"]) == (4, 1, 1, 2)
+    assert [e["row"] for e in body["errors"]] == [3, 4]
+    assert body["diffs"] == [
+        {"row": 1, "garment_id": garment.id, "size": "M",
+         "previous": {"good_stock": 100, "virtual_stock": 0},
+         "current": {"good_stock": 95, "virtual_stock": 0},
+         "good_stock_delta": -5, "virtual_stock_delta": 0},
+        {"row": 2, "garment_id": garment.id, "size": "L", "previous": None,
+         "current": {"good_stock": 12, "virtual_stock": 0},
+         "good_stock_delta": 12, "virtual_stock_delta": 0},
+    ]
+    assert levels(db, inventory.id) == (95, 0)
+    assert StockService(db).check_consistency()["consistent"]
+
+    repeat = api_client.post("/api/v1/inventory/bulk", json=counts[:2]).json()
+    assert (repeat["updated"], repeat["unchanged"], repeat["diffs"]) == (0, 2, [])